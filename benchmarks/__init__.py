@@ -0,0 +1,4 @@
+"""Бенчмарки производительности парсера.
+
+Каждый бенчмарк запускается как модуль, например: `python -m benchmarks.applicants`.
+"""
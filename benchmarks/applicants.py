@@ -0,0 +1,104 @@
+"""Сравнение построчной (pydantic) и векторной (polars) валидации конкурсных списков.
+
+Запуск: python -m benchmarks.applicants --rows 100000
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+
+import polars as pl
+
+from src.gosuslugi.constants import NO_POINTS, NO_VALUE, WITHOUT_ENTRANCE_EXAMS
+from src.gosuslugi.helpers import extract_direction_code
+from src.gosuslugi.validators import (
+    ADMISSION_LIST_COLUMNS,
+    ApplicantValidator,
+    read_admission_list,
+    validate_admission_list,
+)
+
+UNIVERSITY_ID = 43
+DIRECTION_URL = "https://www.gosuslugi.ru/vuznavigator/specialties/2.20.03.01/2/43"
+RECEPTION = "Основные места 120"
+SUBMITS: tuple[str, ...] = ("Бумажное", "Электронное", NO_VALUE, "Да")
+
+
+def generate_admission_list(rows: int, seed: int = 0) -> bytes:
+    """Генерирует синтетический CSV файл конкурсного списка.
+
+    :param rows: Количество абитуриентов.
+    :param seed: Зерно генератора случайных чисел.
+    :return: Содержимое CSV файла.
+    """
+    rnd = random.Random(seed)
+    lines = [";".join(f'"{column}"' for column in ADMISSION_LIST_COLUMNS)]
+    for place in range(1, rows + 1):
+        without_entrance_exams = rnd.random() < 0.02  # noqa: PLR2004
+        exams = (
+            NO_POINTS
+            if without_entrance_exams
+            else " ".join(str(rnd.randint(40, 100)) for _ in range(3))
+        )
+        row = (
+            rnd.randint(1_000_000, 9_999_999),
+            place,
+            rnd.randint(1, 5),
+            rnd.choice(SUBMITS),
+            NO_VALUE if rnd.random() < 0.05 else rnd.randint(120, 310),  # noqa: PLR2004
+            exams,
+            rnd.randint(0, 10),
+            WITHOUT_ENTRANCE_EXAMS if without_entrance_exams else "Нет",
+            rnd.choice((NO_VALUE, "Имеется")),
+        )
+        lines.append(";".join(f'"{value}"' for value in row))
+    return "\n".join(lines).encode()
+
+
+def parse_rowwise(content: bytes) -> list[ApplicantValidator]:
+    df = read_admission_list(content)
+    return [
+        ApplicantValidator.from_csv_row(
+            row, university_id=UNIVERSITY_ID, direction_code=DIRECTION_URL, reception=RECEPTION
+        )
+        for row in df.to_dicts()
+    ]
+
+
+def parse_columnar(content: bytes) -> pl.DataFrame:
+    df = read_admission_list(content)
+    return validate_admission_list(
+        df, UNIVERSITY_ID, extract_direction_code(DIRECTION_URL), RECEPTION
+    )
+
+
+def measure[T](func: Callable[[bytes], T], content: bytes, repeat: int) -> tuple[float, T]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content = generate_admission_list(args.rows)
+    rowwise_time, applicants = measure(parse_rowwise, content, args.repeat)
+    columnar_time, frame = measure(parse_columnar, content, args.repeat)
+    # Оба способа должны давать одинаковый результат
+    assert [applicant.model_dump(mode="json") for applicant in applicants] == frame.to_dicts()
+
+    print(f"rows: {args.rows}, csv size: {len(content) / 1024 / 1024:.1f} MiB")
+    for name, elapsed in (("pydantic rowwise", rowwise_time), ("polars columnar", columnar_time)):
+        print(f"{name:<18} {elapsed:8.3f} s {args.rows / elapsed:12,.0f} rows/s")
+    print(f"speedup: x{rowwise_time / columnar_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Время загрузки страниц и память браузера без профиля и с профилем парсинга.
+
+Страницы раздаются локальным HTTP сервером: либо сохранённые HTML страницы из
+директории `--fixtures`, либо синтетическая страница с картинками, шрифтами, видео
+и счётчиками аналитики. Все домены, включая домены счётчиков, направляются
+на локальный сервер, каждый ответ которого задерживается на `--latency` миллисекунд.
+
+С `--live` загружаются настоящие страницы университетов на Госуслугах, а после каждой
+загрузки проверяется, что название университета парсится и с профилем парсинга.
+
+С `--executable-path` запускается установленный Chrome или Chromium, если браузер
+Playwright не скачать, например, когда его CDN недоступен.
+
+Запуск: python -m benchmarks.page_load --loads 20
+Запуск на Госуслугах: python -m benchmarks.page_load --loads 20 --live \
+    https://www.gosuslugi.ru/vuznavigator/universities/43
+"""
+
+import argparse
+import asyncio
+import functools
+import statistics
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import psutil
+from playwright.async_api import Browser, async_playwright
+
+from src.browser.pool import PagePool
+from src.browser.profile import ScrapeProfile
+from src.gosuslugi.selectors import ORGANIZATION_TITLE_SELECTOR
+
+# Локальный сервер не умеет TLS, поэтому счётчик подключается по http
+TRACKER_URL = "http://mc.yandex.ru/metrika/tag.js"
+IMAGES_COUNT = 40
+FONTS_COUNT = 4
+VIDEOS_COUNT = 2
+# Время ожидания названия университета на странице Госуслуг в мс
+TITLE_TIMEOUT = 30_000
+# Минимальный GIF 1x1, который повторяется, чтобы картинка весила как настоящая
+GIF = bytes.fromhex(
+    "47494638396101000100800000000000ffffff21f90401000000002c000000000100010000020144003b"
+)
+
+
+def generate_fixtures(directory: Path) -> None:
+    """Создаёт синтетическую страницу, похожую по составу ресурсов на страницу вуза."""
+    (directory / "assets").mkdir()
+    for i in range(IMAGES_COUNT):
+        (directory / "assets" / f"image_{i}.gif").write_bytes(GIF * 2000)
+    for i in range(FONTS_COUNT):
+        (directory / "assets" / f"font_{i}.woff2").write_bytes(b"\0" * 100_000)
+    for i in range(VIDEOS_COUNT):
+        (directory / "assets" / f"video_{i}.mp4").write_bytes(b"\0" * 500_000)
+    (directory / "metrika").mkdir()
+    (directory / "metrika" / "tag.js").write_text(
+        "let x = 0; for (let i = 0; i < 5e6; i++) { x += i; }"
+    )
+    fonts = "".join(
+        f"@font-face {{ font-family: f{i}; src: url(/assets/font_{i}.woff2); }}"
+        f" .f{i} {{ font-family: f{i}; }}"
+        for i in range(FONTS_COUNT)
+    )
+    body = "".join(
+        f'<div class="card f{i % FONTS_COUNT}"><img src="/assets/image_{i}.gif">'
+        f"<p>Направление подготовки {i}</p></div>"
+        for i in range(IMAGES_COUNT)
+    )
+    videos = "".join(
+        f'<video src="/assets/video_{i}.mp4" autoplay muted></video>' for i in range(VIDEOS_COUNT)
+    )
+    (directory / "university.html").write_text(
+        f"<html><head><meta charset='utf-8'><style>{fonts}"
+        ".card { animation: spin 1s infinite; } @keyframes spin { to { rotate: 1turn; } }"
+        f"</style><script async src='{TRACKER_URL}'></script></head>"
+        f"<body>{body}{videos}</body></html>"
+    )
+
+
+class DelayedHandler(SimpleHTTPRequestHandler):
+    latency: float = 0
+
+    def do_GET(self) -> None:  # noqa: N802
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def serve(directory: Path, latency: float) -> ThreadingHTTPServer:
+    handler = type("Handler", (DelayedHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(handler, directory=str(directory))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def browser_rss() -> int:
+    """Суммарная память всех процессов браузера, запущенных бенчмарком."""
+    total = 0
+    for process in psutil.Process().children(recursive=True):
+        try:
+            total += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+    return total
+
+
+async def measure(
+    browser: Browser, profile: ScrapeProfile | None, urls: list[str], loads: int, parse: bool
+) -> tuple[list[float], int, int]:
+    timings: list[float] = []
+    peak_rss = 0
+    parsed = 0
+    async with PagePool(browser, max_size=1, warm_size=1, profile=profile) as pool:
+        for i in range(loads):
+            async with pool.lease() as page:
+                start = time.perf_counter()
+                await page.goto(urls[i % len(urls)], wait_until="load")
+                timings.append(time.perf_counter() - start)
+                peak_rss = max(peak_rss, browser_rss())
+                if parse:
+                    # Профиль не должен ломать отрисовку данных, которые парсятся
+                    title = await page.locator(ORGANIZATION_TITLE_SELECTOR).text_content(
+                        timeout=TITLE_TIMEOUT
+                    )
+                    parsed += bool(title and title.strip())
+    return timings, peak_rss, parsed
+
+
+async def run(  # noqa: PLR0913, PLR0917
+    name: str,
+    profile: ScrapeProfile | None,
+    port: int | None,
+    urls: list[str],
+    loads: int,
+    executable_path: Path | None = None,
+) -> None:
+    launch_options = profile.launch_options if profile else {"headless": True, "args": []}
+    if executable_path is not None:
+        launch_options["executable_path"] = executable_path
+    if port is not None:
+        # Все домены, включая домены счётчиков, направляются на локальный сервер
+        launch_options["args"] = [
+            *launch_options["args"],
+            f"--host-resolver-rules=MAP * 127.0.0.1:{port}",
+        ]
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(**launch_options)
+        timings, peak_rss, parsed = await measure(
+            browser, profile, urls, loads, parse=port is None
+        )
+        await browser.close()
+    print(
+        f"{name:<10} median {statistics.median(timings) * 1000:8.1f} ms"
+        f" | p95 {statistics.quantiles(timings, n=20)[-1] * 1000:8.1f} ms"
+        f" | peak rss {peak_rss / 1024 / 1024:8.1f} MiB"
+        + (f" | parsed {parsed}/{loads}" if port is None else "")
+    )
+
+
+async def amain(args: argparse.Namespace) -> None:
+    if args.live:
+        await run("baseline", None, None, args.live, args.loads, args.executable_path)
+        await run("profile", ScrapeProfile(), None, args.live, args.loads, args.executable_path)
+        return
+    with TemporaryDirectory() as tmp:
+        directory = args.fixtures or Path(tmp)
+        if args.fixtures is None:
+            generate_fixtures(directory)
+        server = serve(directory, args.latency / 1000)
+        port = server.server_address[1]
+        urls = [f"http://gosuslugi.test:{port}/{path.name}" for path in directory.glob("*.html")]
+        try:
+            await run("baseline", None, port, urls, args.loads, args.executable_path)
+            await run("profile", ScrapeProfile(), port, urls, args.loads, args.executable_path)
+        finally:
+            server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", type=Path, default=None)
+    parser.add_argument("--loads", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20, help="задержка ответа в мс")
+    parser.add_argument(
+        "--live", nargs="+", default=None, help="URL адреса университетов на Госуслугах"
+    )
+    parser.add_argument(
+        "--executable-path", type=Path, default=None, help="путь до Chrome или Chromium"
+    )
+    asyncio.run(amain(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""Сквозной прогон графа парсинга университета на записанных страницах Госуслуг.
+
+Страницы раздаются локальным HTTP сервером из директории `--fixtures`, повторяющей
+пути Госуслуг: страница `/vuznavigator/universities/43` лежит в файле
+`vuznavigator/universities/43.html`, а любой файл без `.html`, например
+`api/lists/1000/csv`, отдаётся как скачиваемый CSV файл. Без `--fixtures` генерируются
+синтетические страницы с той же вёрсткой: вуз с фильтрами и кнопкой `Посмотреть ещё`,
+направления подготовки с раскрывающейся программой обучения, страницы конкурсных
+списков с кнопкой скачивания и сами CSV файлы.
+
+Граф `build_university_graph` публикует результаты в брокер, который только считает
+сообщения, поэтому замеряется только парсинг. Выводится время прогона, время узлов
+графа из метрик, пиковая память браузера и парсера и скорость в абитуриентах в секунду.
+
+С `--executable-path` запускается установленный Chrome или Chromium, если браузер
+Playwright не скачать.
+
+Запуск: python -m benchmarks.replay --directions 20 --runs 3
+Запуск на записанных страницах: python -m benchmarks.replay --fixtures fixtures/gosuslugi
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from urllib.parse import urlparse
+
+import psutil
+from playwright.async_api import async_playwright
+from prometheus_client import REGISTRY
+
+from benchmarks.applicants import generate_admission_list
+from benchmarks.page_load import browser_rss
+from src.app import EDUCATION_LEVELS
+from src.browser.pool import PagePool, page_config
+from src.browser.profile import ScrapeProfile
+from src.core.enums import EducationForm
+from src.gosuslugi.fetchers import AdmissionListFetcher
+from src.gosuslugi.graphs import build_university_graph
+from src.gosuslugi.limiter import gosuslugi_limiter
+from src.metrics import NODE_DURATION
+from src.settings import settings
+
+UNIVERSITY_ID = 43
+UNIVERSITY_PATH = f"vuznavigator/universities/{UNIVERSITY_ID}"
+# Количество карточек направлений подготовки, которое показывается за одно нажатие
+CARDS_PAGE_SIZE = 10
+# Задержка отрисовки после действий пользователя, как у Angular приложения Госуслуг, в мс
+RENDER_DELAY = 50
+RECEPTIONS: tuple[str, ...] = (
+    "Основные места",
+    "Целевая квота",
+    "Особая квота",
+    "Отдельная квота",
+)
+# Интервал замера памяти в секундах
+RSS_INTERVAL = 0.05
+
+UNIVERSITY_PAGE = """<!doctype html><html><head><meta charset="utf-8"></head><body>
+<span class="title-h3 flex-1">Тестовый университет</span>
+<button class="filter-button" onclick="filters.hidden = false">Фильтры</button>
+<div id="filters" hidden>
+<form formgroupname="educationForms">{education_forms}</form>
+<form formgroupname="educationLevels">{education_levels}</form>
+<button onclick="filters.hidden = true; render()">Применить</button>
+</div>
+<div id="cards"></div>
+<script>
+const urls = {urls};
+let shown = 0;
+function render() {{
+    setTimeout(() => {{
+        for (const url of urls.slice(shown, shown + {page_size})) {{
+            const card = document.createElement('app-education-program-card');
+            card.innerHTML = `<a class="education-program-card" href="${{url}}">${{url}}</a>`;
+            cards.append(card);
+        }}
+        shown += {page_size};
+        document.getElementById('more')?.remove();
+        if (shown < urls.length) {{
+            cards.insertAdjacentHTML(
+                'afterend',
+                '<button id="more" class="white button" onclick="render()">Посмотреть ещё</button>'
+            );
+        }}
+    }}, {delay});
+}}
+</script>
+</body></html>"""
+
+DIRECTION_DETAILS = """
+<div class="header-places"><div class="small-text">{total_places} мест</div></div>
+<div class="small-text gray">Форма обучения</div><div class="text-plain">Очная</div>
+<div class="text-plain mb-24 ng-star-inserted">Институт {index}</div>
+<ul><li><div class="gray">Основные места</div><div class="bold">{budget_places}</div></li></ul>
+<div class="title-h3 mb-8">{price} ₽</div>
+<a onclick="receptions.hidden = false">Конкурсные списки</a>
+<ul id="receptions" class="shadow-block" hidden>{receptions}</ul>"""
+
+DIRECTION_PAGE = """<!doctype html><html><head><meta charset="utf-8"></head><body>
+<lib-expansion-panel><h4 class="title-h4">Программа обучения {index}</h4></lib-expansion-panel>
+<div id="details"></div>
+<script>
+document.querySelector('h4.title-h4').addEventListener('click', () => setTimeout(() => {{
+    details.innerHTML = {details};
+}}, {delay}));
+</script>
+</body></html>"""
+
+RECEPTION_PAGE = """<!doctype html><html><head><meta charset="utf-8"></head><body>
+<button onclick="location.href = '{download_path}'">Скачать в виде таблицы</button>
+</body></html>"""
+
+
+def write(path: Path, content: str | bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, str):
+        content = content.encode()
+    path.write_bytes(content)
+
+
+def generate_fixtures(directory: Path, directions: int, receptions: int, rows: int) -> None:
+    """Создаёт синтетические страницы вуза, его направлений подготовки и конкурсных списков.
+
+    :param directory: Директория, в которую сохраняются страницы.
+    :param directions: Количество направлений подготовки у вуза.
+    :param receptions: Количество конкурсных списков у направления подготовки.
+    :param rows: Количество абитуриентов в конкурсном списке.
+    """
+    direction_paths = [
+        f"/vuznavigator/specialties/2.09.03.{i:02d}/2/{UNIVERSITY_ID}" for i in range(directions)
+    ]
+    write(
+        directory / f"{UNIVERSITY_PATH}.html",
+        UNIVERSITY_PAGE.format(
+            education_forms="".join(
+                f'<div class="text-plain">{form}</div>' for form in EducationForm
+            ),
+            education_levels="".join(
+                f'<div class="text-plain">{level}</div>' for level in EDUCATION_LEVELS
+            ),
+            urls=json.dumps(direction_paths),
+            page_size=CARDS_PAGE_SIZE,
+            delay=RENDER_DELAY,
+        ),
+    )
+    for i, direction_path in enumerate(direction_paths):
+        items = []
+        for j in range(receptions):
+            list_id = 1000 + i * receptions + j
+            download_path = f"/api/lists/{list_id}/csv"
+            items.append(
+                f'<li class="list-divider"><span>{RECEPTIONS[j % len(RECEPTIONS)]} {10 + j}'
+                f'</span> <a class="link-plain" href="/vuznavigator/lists/{list_id}">'
+                "Список</a></li>"
+            )
+            write(
+                directory / f"vuznavigator/lists/{list_id}.html",
+                RECEPTION_PAGE.format(download_path=download_path),
+            )
+            write(directory / download_path.strip("/"), generate_admission_list(rows, list_id))
+        details = DIRECTION_DETAILS.format(
+            total_places=100 + i,
+            index=i,
+            budget_places=10 + i,
+            price=f"{250_000 + i * 1000:,}".replace(",", " "),
+            receptions="".join(items),
+        )
+        write(
+            directory / f"{direction_path.strip('/')}.html",
+            DIRECTION_PAGE.format(index=i, details=json.dumps(details), delay=RENDER_DELAY),
+        )
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    directory: Path
+    latency: float = 0
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        path = self.directory / urlparse(self.path).path.strip("/")
+        page = path.parent / f"{path.name}.html"
+        if page.is_file():
+            self._send(page.read_bytes(), "text/html; charset=utf-8")
+        elif path.is_file():
+            self._send(
+                path.read_bytes(),
+                "text/csv; charset=utf-8",
+                {"Content-Disposition": f'attachment; filename="{path.parent.name}.csv"'},
+            )
+        else:
+            self.send_error(404)
+
+    def _send(self, body: bytes, content_type: str, headers: dict[str, str] | None = None) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def serve(directory: Path, latency: float) -> ThreadingHTTPServer:
+    handler = type("Handler", (FixtureHandler,), {"directory": directory, "latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class MemoryBroker:
+    """Брокер, который только считает опубликованные сообщения по очередям."""
+
+    def __init__(self) -> None:
+        self.published: Counter[str] = Counter()
+
+    async def publish(self, messages: object, **kwargs: object) -> None:
+        count = len(messages) if isinstance(messages, list) else 1
+        self.published[str(kwargs.get("queue"))] += count
+
+
+async def track_peak_rss(peak: list[int]) -> None:
+    """Замеряет суммарную память парсера и браузера, пока задачу не отменят."""
+    process = psutil.Process()
+    while True:
+        peak[0] = max(peak[0], process.memory_info().rss + browser_rss())
+        await asyncio.sleep(RSS_INTERVAL)
+
+
+def applicants_parsed() -> float:
+    return REGISTRY.get_sample_value("parser_applicants_parsed_total") or 0
+
+
+def node_timings() -> dict[str, tuple[float, float]]:
+    """Суммарное время и количество вызовов каждого узла графа из метрик."""
+    totals: dict[str, list[float]] = {}
+    for metric in NODE_DURATION.collect():
+        for sample in metric.samples:
+            if sample.name.endswith(("_sum", "_count")):
+                node_totals = totals.setdefault(sample.labels["node"], [0, 0])
+                node_totals[sample.name.endswith("_count")] = sample.value
+    return {node: (total, count) for node, (total, count) in totals.items()}
+
+
+async def replay(args: argparse.Namespace, university_url: str) -> None:
+    async with async_playwright() as playwright:
+        profile = ScrapeProfile.from_settings(settings.browser_settings)
+        launch_options = profile.launch_options
+        if args.executable_path is not None:
+            launch_options["executable_path"] = args.executable_path
+        browser = await playwright.chromium.launch(**launch_options)
+        pool_size = settings.parser_settings.direction_concurrency + 1
+        async with PagePool(
+            browser, max_size=pool_size, warm_size=pool_size, profile=profile
+        ) as pool:
+            peak_rss = [0]
+            tracker = asyncio.create_task(track_peak_rss(peak_rss))
+            timings: list[float] = []
+            applicants_counts: list[float] = []
+            for run in range(1, args.runs + 1):
+                broker = MemoryBroker()
+                # Каждый прогон заново узнаёт адрес CSV файлов, как новый запуск парсера
+                async with AdmissionListFetcher() as fetcher:
+                    graph = build_university_graph(
+                        broker, pool, None if args.browser_only else fetcher
+                    )
+                    applicants_before = applicants_parsed()
+                    start = time.perf_counter()
+                    async with pool.lease() as page:
+                        await graph.ainvoke(
+                            {
+                                "university_url": university_url,
+                                "education_forms": [EducationForm.FULL_TIME],
+                                "education_levels": EDUCATION_LEVELS,
+                            },
+                            config=page_config(page),
+                        )
+                    timings.append(time.perf_counter() - start)
+                applicants_counts.append(applicants_parsed() - applicants_before)
+                print(
+                    f"run {run}: {timings[-1]:8.2f} s"
+                    f" | {applicants_counts[-1]:8,.0f} applicants"
+                    f" | {applicants_counts[-1] / timings[-1]:10,.0f} applicants/s"
+                    f" | published {dict(broker.published)}"
+                )
+            tracker.cancel()
+        await browser.close()
+    print(
+        f"end-to-end median {statistics.median(timings):8.2f} s"
+        f" | {sum(applicants_counts) / sum(timings):10,.0f} applicants/s"
+        f" | peak rss {peak_rss[0] / 1024 / 1024:8.1f} MiB"
+    )
+    print(f"{'node':<22} {'calls':>6} {'mean ms':>10} {'total s':>10}")
+    for node, (total, count) in node_timings().items():
+        print(f"{node:<22} {count:6.0f} {total / count * 1000:10.1f} {total:10.2f}")
+
+
+async def amain(args: argparse.Namespace) -> None:
+    # Ограничитель частоты не должен замедлять парсинг локальных страниц
+    gosuslugi_limiter.rate = gosuslugi_limiter.max_rate = args.rate
+    gosuslugi_limiter.burst = max(1, int(args.rate))
+    with TemporaryDirectory() as tmp:
+        directory = args.fixtures or Path(tmp)
+        if args.fixtures is None:
+            generate_fixtures(directory, args.directions, args.receptions, args.rows)
+        server = serve(directory, args.latency / 1000)
+        port = server.server_address[1]
+        try:
+            await replay(args, f"http://127.0.0.1:{port}/{UNIVERSITY_PATH}")
+        finally:
+            server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", type=Path, default=None)
+    parser.add_argument("--directions", type=int, default=20)
+    parser.add_argument("--receptions", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=20, help="задержка ответа в мс")
+    parser.add_argument(
+        "--rate", type=float, default=1000, help="частота запросов ограничителя в секунду"
+    )
+    parser.add_argument(
+        "--browser-only", action="store_true", help="скачивать все списки через браузер"
+    )
+    parser.add_argument(
+        "--executable-path", type=Path, default=None, help="путь до Chrome или Chromium"
+    )
+    asyncio.run(amain(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Сравнение построчного и многострочного upsert абитуриентов в Postgres.
+
+Нужен запущенный Postgres из настроек, например:
+docker run --rm -p 5432:5432 -e POSTGRES_USER=user -e POSTGRES_PASSWORD=blabla \
+    -e POSTGRES_DB=user_db postgres:16
+
+Запуск: python -m benchmarks.upsert --rows 100000 --chunk-size 1000
+
+Результаты на локальном Postgres 16.2 с настройками по умолчанию, клиент и сервер на одном
+хосте с одним ядром (--rows 20000 --chunk-size 1000 --repeat 1, 19973 уникальных
+абитуриента):
+
+rowwise      insert   49.866 s        401 rows/s | update   57.685 s        347 rows/s
+bulk x1000   insert   15.231 s      1,313 rows/s | update   10.239 s      1,953 rows/s
+
+Многострочный upsert быстрее построчного в 3.3 раза на вставке и в 5.6 раза на обновлении.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as upsert
+
+from src.core import ApplicantSchema
+from src.database.models import ApplicantsModel
+from src.database.session import add_all_applicants, engine, get_session
+from src.gosuslugi.helpers import extract_direction_code
+from src.gosuslugi.validators import read_admission_list, validate_admission_list
+
+from .applicants import DIRECTION_URL, RECEPTION, UNIVERSITY_ID, generate_admission_list
+
+
+def generate_applicants(rows: int) -> list[ApplicantSchema]:
+    df = read_admission_list(generate_admission_list(rows))
+    frame = validate_admission_list(
+        df, UNIVERSITY_ID, extract_direction_code(DIRECTION_URL), RECEPTION
+    )
+    return [ApplicantSchema.model_validate(row) for row in frame.to_dicts()]
+
+
+async def add_all_applicants_rowwise(applicants: list[ApplicantSchema]) -> None:
+    """Прежняя реализация: отдельный upsert запрос на каждого абитуриента."""
+    async with get_session() as session:
+        for applicant in applicants:
+            stmt = (
+                upsert(ApplicantsModel)
+                .values(**applicant.model_dump())
+                .on_conflict_do_update(constraint="applicant_pk", set_=applicant.model_dump())
+            )
+            await session.execute(stmt)
+        await session.commit()
+
+
+async def measure(
+    func_: Callable[[list[ApplicantSchema]], Awaitable[None]],
+    applicants: list[ApplicantSchema],
+    repeat: int,
+) -> tuple[float, float]:
+    """Возвращает лучшее время вставки в пустую таблицу и обновления существующих строк."""
+    best_insert, best_update = float("inf"), float("inf")
+    for _ in range(repeat):
+        async with get_session() as session:
+            await session.execute(delete(ApplicantsModel))
+            await session.commit()
+        start = time.perf_counter()
+        await func_(applicants)
+        best_insert = min(best_insert, time.perf_counter() - start)
+        start = time.perf_counter()
+        await func_(applicants)
+        best_update = min(best_update, time.perf_counter() - start)
+    return best_insert, best_update
+
+
+async def amain(rows: int, chunk_size: int, repeat: int) -> None:
+    engine.echo = False
+    async with engine.begin() as connection:
+        await connection.run_sync(ApplicantsModel.__table__.create, checkfirst=True)
+
+    applicants = generate_applicants(rows)
+    results = {
+        "rowwise": await measure(add_all_applicants_rowwise, applicants, repeat),
+        f"bulk x{chunk_size}": await measure(
+            lambda data: add_all_applicants(data, chunk_size=chunk_size), applicants, repeat
+        ),
+    }
+    async with get_session() as session:
+        count = await session.scalar(select(func.count()).select_from(ApplicantsModel))
+    # Оба способа должны сохранить одинаковое количество уникальных абитуриентов
+    assert count == len({(a.university_id, a.id, a.direction_code) for a in applicants})
+
+    print(f"rows: {rows}, unique: {count}")
+    for name, (insert_time, update_time) in results.items():
+        print(
+            f"{name:<12} insert {insert_time:8.3f} s {rows / insert_time:10,.0f} rows/s"
+            f" | update {update_time:8.3f} s {rows / update_time:10,.0f} rows/s"
+        )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(amain(args.rows, args.chunk_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Сравнение JSON и Arrow IPC со сжатием zstd для сообщений с абитуриентами.
+
+Для каждого размера сообщения меряется объём на одного абитуриента, время кодирования
+на стороне парсера и время декодирования в строки для upsert на стороне подписчика.
+
+Запуск: python -m benchmarks.wire --rows 100 1000 10000
+
+Пример вывода (polars 1.31, одно ядро Xeon):
+
+       rows | format | bytes/applicant |    encode |    decode | decode rows/s
+        100 | json   |           284.9 |    0.54ms |    0.53ms |       189,582
+        100 | arrow  |            55.3 |    0.99ms |    0.63ms |       157,829
+       1000 | json   |           286.6 |    7.79ms |    6.05ms |       165,360
+       1000 | arrow  |            18.5 |    2.42ms |    4.84ms |       206,585
+      10000 | json   |           288.0 |   84.78ms |   92.70ms |       107,869
+      10000 | arrow  |            13.9 |    6.60ms |   36.32ms |       275,313
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+import polars as pl
+from faststream.broker.message import encode_message
+
+from src.wire import ARROW_CONTENT_TYPE, decode_applicants, encode_applicants
+
+from .applicants import generate_admission_list, parse_columnar
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def encode_json(applicants: pl.DataFrame) -> bytes:
+    # Так сообщение кодирует брокер при публикации списка словарей
+    body, _ = encode_message(applicants.to_dicts())
+    return body
+
+
+def decode_json(body: bytes) -> list[dict]:
+    return [applicant.model_dump() for applicant in decode_applicants(body, JSON_CONTENT_TYPE)]
+
+
+def decode_arrow(body: bytes) -> list[dict]:
+    return decode_applicants(body, ARROW_CONTENT_TYPE)
+
+
+def measure[T, R](func: Callable[[T], R], arg: T, repeat: int) -> tuple[float, R]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>7} | {'format':<6} | {'bytes/applicant':>15} | {'encode':>9}"
+        f" | {'decode':>9} | {'decode rows/s':>13}"
+    )
+    for rows in args.rows:
+        frame = parse_columnar(generate_admission_list(rows))
+        results = {}
+        for name, encode, decode in (
+            ("json", encode_json, decode_json),
+            ("arrow", encode_applicants, decode_arrow),
+        ):
+            encode_time, body = measure(encode, frame, args.repeat)
+            decode_time, decoded = measure(decode, body, args.repeat)
+            results[name] = decoded
+            print(
+                f"{rows:>7} | {name:<6} | {len(body) / rows:15.1f} | {encode_time * 1000:7.2f}ms"
+                f" | {decode_time * 1000:7.2f}ms | {rows / decode_time:13,.0f}"
+            )
+        # Оба формата должны давать одинаковые строки для upsert
+        assert results["json"] == results["arrow"]
+
+
+if __name__ == "__main__":
+    main()
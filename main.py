@@ -1,16 +1,43 @@
+import argparse
 import asyncio
 import logging
 
-from src.app import execute_gosuslugi_parser, start_broker
+from src.app import execute_gosuslugi_parser, run_refresh_loop, start_broker
 from src.constants import TIMEOUT
+from src.crawl import produce_crawl_tasks, replay_dead_letters, run_crawl_worker
+from src.discovery import discover_universities
 
 
-async def main() -> None:
+async def main(mode: str) -> None:
+    if mode == "worker":
+        await run_crawl_worker()
+        return
+    if mode == "discover":
+        await discover_universities()
+        return
     async with start_broker():
-        await execute_gosuslugi_parser()
+        if mode == "producer":
+            await produce_crawl_tasks()
+        elif mode == "replay":
+            await replay_dead_letters()
+        elif mode == "refresh":
+            await run_refresh_loop()
+        else:
+            await execute_gosuslugi_parser()
         await asyncio.sleep(TIMEOUT)
 
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Парсер конкурсных списков с Госуслуг")
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=["local", "producer", "worker", "replay", "discover", "refresh"],
+        default="local",
+        help="local - обход в одном процессе, producer - публикация задач в очередь "
+        "crawl.tasks, worker - выполнение задач из очереди, replay - возврат в обход "
+        "задач из очереди crawl.dead_letters, discover - поиск существующих университетов "
+        "для индекса, refresh - ежечасные повторные обходы по бюджету загрузок страниц",
+    )
+    asyncio.run(main(parser.parse_args().mode))
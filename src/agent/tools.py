@@ -13,7 +13,6 @@ from ..browser.helpers import clean_html
 from ..browser.tool import BaseBrowserTool
 from ..browser.utils import (
     ATTRIBUTE,
-    aget_current_page,
     aget_elements,
     get_current_page,
     get_elements,
@@ -71,10 +70,8 @@ class ClickTool(BaseBrowserTool):
 
         from playwright.async_api import TimeoutError as PlaywrightTimeoutError  # noqa: PLC0415
 
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
-        css_selector_effective = self._selector_effective(css_selector)
+        page = await self._aget_page()
+        css_selector_effective = self._css_selector_effective(css_selector)
         try:
             await page.click(css_selector_effective, strict=self.strict_mode, timeout=self.timeout)
         except PlaywrightTimeoutError:
@@ -101,9 +98,7 @@ class CurrentURLTool(BaseBrowserTool):
         run_manager: AsyncCallbackManagerForToolRun | None = None,  # noqa: ARG002
     ) -> str:
         logger.info("---GET CURRENT PAGE URL---")
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
+        page = await self._aget_page()
         return page.url
 
 
@@ -140,9 +135,7 @@ class ExtractTextTool(BaseBrowserTool):
 
         from bs4 import BeautifulSoup  # noqa: PLC0415
 
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
+        page = await self._aget_page()
         html_content = await page.content()
         soup = BeautifulSoup(html_content, "lxml")
         return " ".join(text for text in soup.stripped_strings)
@@ -150,7 +143,7 @@ class ExtractTextTool(BaseBrowserTool):
 
 class ExtractHTMLTool(BaseBrowserTool):
     name: str = "extract_html"
-    description = "Извлекает HTML код страницы."
+    description: str = "Извлекает HTML код страницы."
 
     def _run(self, run_manager: CallbackManagerForToolRun | None = None) -> str:  # noqa: ARG002
         logger.info("---EXTRACT HTML---")
@@ -162,9 +155,7 @@ class ExtractHTMLTool(BaseBrowserTool):
 
     async def _arun(self, run_manager: AsyncCallbackManagerForToolRun | None = None) -> str:  # noqa: ARG002
         logger.info("---EXTRACT HTML---")
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
+        page = await self._aget_page()
         html_content = await page.content()
         return clean_html(html_content)
 
@@ -209,9 +200,7 @@ class RetrieveElementsTool(BaseBrowserTool):
         run_manager: AsyncCallbackManagerForToolRun | None = None,
     ) -> str:
         logger.info("---RETRIEVE ELEMENTS---")
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
+        page = await self._aget_page()
         results = await aget_elements(page, css_selector, attributes)
         return json.dumps(results, ensure_ascii=False)
 
@@ -246,9 +235,7 @@ class NavigationTool(BaseBrowserTool):
         self, url: str, run_manager: AsyncCallbackManagerForToolRun | None = None  # noqa: ARG002
     ) -> str:
         logger.info("---NAVIGATE TO %s---", url)
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
+        page = await self._aget_page()
         response = await page.goto(url)
         status = response.status if response else "unknown"
         return f"Переход по {url}, status code: {status}"
@@ -273,9 +260,7 @@ class NavigateBackTool(BaseBrowserTool):
 
     async def _arun(self, run_manager: AsyncCallbackManagerForToolRun | None = None) -> str:  # noqa: ARG002
         logger.info("---NAVIGATE BACK---")
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
+        page = await self._aget_page()
         response = await page.go_back()
         if response:
             return (
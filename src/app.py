@@ -1,54 +1,243 @@
+from typing import TypedDict
+
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
 from dishka.integrations.faststream import setup_dishka
 from faststream import FastStream
-from faststream.rabbit import RabbitBroker
+from faststream.rabbit import RabbitBroker, RabbitRouter
+from langgraph.graph.state import CompiledStateGraph
 from playwright.async_api import async_playwright
 
-from .broker import router
-from .core.enums import EducationForm
+from .broker import close_writers, declare_crawl_queues, router
+from .browser.pool import PagePool, page_config
+from .browser.profile import ScrapeProfile
+from .constants import CRAWL_DEAD_LETTERS_QUEUE
+from .core import DeadLetterSchema
+from .core.enums import CrawlKind, EducationForm
+from .core.exceptions import IncompleteUniversityError, PageNotFoundError
+from .database import CrawlFrontier, FingerprintStore, RefreshScheduler, UniversityIndex
 from .dependencies import container
+from .gosuslugi.api import GosuslugiApi
+from .gosuslugi.fetchers import AdmissionListFetcher
 from .gosuslugi.graphs import build_university_graph
 from .gosuslugi.helpers import generate_university_urls
+from .gosuslugi.states import UniversityState
+from .metrics import expose_metrics
+from .settings import settings
 
 EDUCATION_LEVELS: list[str] = ["Бакалавриат", "Специалитет"]
+# Интервал между повторными обходами в секундах, бюджет планировщика задан на час
+REFRESH_INTERVAL = 60 * 60
 
 logger = logging.getLogger(__name__)
 
 
-async def create_faststream_app() -> FastStream:
+async def create_faststream_app(*routers: RabbitRouter) -> FastStream:
     broker = await container.get(RabbitBroker)
-    broker.include_router(router)
+    broker.include_routers(router, *routers)
     app = FastStream(broker)
     setup_dishka(container=container, app=app, auto_inject=True)
     return app
 
 
 @asynccontextmanager
-async def start_broker() -> None:
-    faststream_app = await create_faststream_app()
+async def start_broker(*routers: RabbitRouter) -> None:
+    faststream_app = await create_faststream_app(*routers)
     await faststream_app.broker.start()
+    await declare_crawl_queues(faststream_app.broker)
     logger.info("Broker started")
-    yield
+    async with expose_metrics(faststream_app.broker):
+        yield
+        await close_writers()
     await faststream_app.broker.stop()
     logger.info("Broker closed")
 
 
-async def execute_gosuslugi_parser() -> None:
-    broker = await container.get(RabbitBroker)
-    async with async_playwright() as playwright:
-        browser = await playwright.chromium.launch(headless=False)
-        graph = build_university_graph(broker, browser)
-        for university_url in generate_university_urls(start=63, end=100):
-            try:
-                response = await graph.ainvoke({
+class UniversityReport(TypedDict):
+    """Результат парсинга одного университета.
+
+    :param university_url: URL адрес университета.
+    :param response: Итоговое состояние графа, если парсинг завершился успешно.
+    :param error: Исключение, если парсинг завершился ошибкой.
+    """
+
+    university_url: str
+    response: UniversityState | None
+    error: Exception | None
+
+
+async def parse_university(
+    graph: CompiledStateGraph[UniversityState],
+    pool: PagePool,
+    university_url: str,
+) -> UniversityReport:
+    """Парсит один университет на арендованной из пула странице.
+
+    :param graph: Граф для парсинга университета.
+    :param pool: Пул страниц браузера.
+    :param university_url: URL адрес университета на Госуслугах.
+    :return: Отчёт о парсинге университета.
+    """
+    async with pool.lease() as page:
+        try:
+            response = await graph.ainvoke(
+                {
                     "university_url": university_url,
                     "education_forms": [EducationForm.FULL_TIME],
                     "education_levels": EDUCATION_LEVELS,
-                })
-                logger.info(
-                    "Received response from graph for %s, response: %s", university_url, response
+                },
+                config=page_config(page),
+            )
+        except Exception as e:
+            logger.exception("Error while parse %s, error: %s", university_url, e)
+            return {"university_url": university_url, "response": None, "error": e}
+        else:
+            logger.info(
+                "Received response from graph for %s, response: %s", university_url, response
+            )
+            error = (
+                IncompleteUniversityError(university_url)
+                if response.get("message") == "ERROR"
+                else None
+            )
+            return {"university_url": university_url, "response": response, "error": error}
+
+
+async def select_university_urls(
+    scheduler: RefreshScheduler,
+    start: int = settings.parser_settings.university_start,
+    end: int = settings.parser_settings.university_end,
+) -> list[str]:
+    """Выбирает университеты для нового обхода.
+
+    Из заполненного индекса планировщик берёт только живые университеты
+    по убыванию ожидаемых изменений их конкурсных списков в пределах бюджета
+    загрузок страниц, а пока индекс пуст, обходятся все ID подряд.
+
+    :param scheduler: Планировщик повторных обходов.
+    :param start: Начало диапазона ID включительно.
+    :param end: Конец диапазона ID включительно.
+    :return: URL адреса университетов.
+    """
+    if settings.parser_settings.use_index and (
+        university_urls := await scheduler.plan(start, end)
+    ):
+        logger.info("Scheduled %s universities from index", len(university_urls))
+        return university_urls
+    return list(generate_university_urls(start=start, end=end))
+
+
+async def crawl_universities(
+    broker: RabbitBroker,
+    graph: CompiledStateGraph[UniversityState],
+    pool: PagePool,
+    frontier: CrawlFrontier,
+    index: UniversityIndex | None = None,
+) -> list[UniversityReport]:
+    """Берёт университеты из очереди обхода, пока они не закончатся.
+
+    Университеты, у которых закончились попытки, отправляются в очередь
+    недоставленных задач, а несуществующие университеты отмечаются в индексе
+    и больше не обходятся.
+
+    :param broker: Брокер сообщений.
+    :param graph: Граф для парсинга университета.
+    :param pool: Пул страниц браузера.
+    :param frontier: Очередь задач обхода.
+    :param index: Индекс университетов, в котором отмечаются распарсенные
+    и несуществующие университеты.
+    :return: Отчёты о парсинге взятых университетов.
+    """
+    reports: list[UniversityReport] = []
+    while university_urls := await frontier.claim(CrawlKind.UNIVERSITY):
+        report = await parse_university(graph, pool, university_urls[0])
+        if report["error"] is None:
+            await frontier.complete(CrawlKind.UNIVERSITY, report["university_url"])
+            if index is not None:
+                await index.record(
+                    report["university_url"], len(report["response"].get("direction_urls", []))
                 )
-            except Exception as e:
-                logger.exception("Error while parse %s, error: %s", university_url, e)
+        elif isinstance(report["error"], PageNotFoundError):
+            # Госуслуги прямо ответили, что университета нет, повторять обход бесполезно
+            await frontier.complete(CrawlKind.UNIVERSITY, report["university_url"])
+            if index is not None:
+                await index.mark_dead(report["university_url"])
+        elif await frontier.fail(
+            CrawlKind.UNIVERSITY, report["university_url"], report["error"]
+        ):
+            await broker.publish(
+                DeadLetterSchema(
+                    kind=CrawlKind.UNIVERSITY,
+                    url=report["university_url"],
+                    error=repr(report["error"]),
+                ),
+                queue=CRAWL_DEAD_LETTERS_QUEUE,
+                persist=True,
+            )
+        reports.append(report)
+    return reports
+
+
+async def execute_gosuslugi_parser(
+    concurrency: int = settings.parser_settings.concurrency,
+) -> list[UniversityReport]:
+    """Запускает парсинг университетов с Госуслуг.
+
+    Обход хранится в Postgres, поэтому после перезапуска продолжается
+    с необработанных университетов и направлений подготовки.
+
+    :param concurrency: Максимальное количество одновременно парсящихся университетов.
+    :return: Отчёты о парсинге каждого университета.
+    """
+    broker = await container.get(RabbitBroker)
+    frontier = CrawlFrontier()
+    index = UniversityIndex()
+    is_resumed = await frontier.start(await select_university_urls(RefreshScheduler()))
+    logger.info("%s crawl", "Resume" if is_resumed else "Start new")
+    async with async_playwright() as playwright:
+        profile = ScrapeProfile.from_settings(settings.browser_settings)
+        browser = await playwright.chromium.launch(**profile.launch_options)
+        # Каждый университет держит свою страницу и арендует ещё по одной на направление
+        pool_size = concurrency * (settings.parser_settings.direction_concurrency + 1)
+        async with (
+            PagePool(browser, max_size=pool_size, warm_size=pool_size, profile=profile) as pool,
+            AdmissionListFetcher() as fetcher,
+            GosuslugiApi() as api,
+        ):
+            fingerprints = FingerprintStore() if settings.parser_settings.incremental else None
+            graph = build_university_graph(
+                broker,
+                pool,
+                fetcher,
+                fingerprints,
+                frontier,
+                api if settings.parser_settings.json_api else None,
+            )
+            reports = [
+                report
+                for worker_reports in await asyncio.gather(*(
+                    crawl_universities(broker, graph, pool, frontier, index)
+                    for _ in range(concurrency)
+                ))
+                for report in worker_reports
+            ]
+    failed = sum(report["error"] is not None for report in reports)
+    logger.info("Parsed %s universities, failed %s", len(reports) - failed, failed)
+    return reports
+
+
+async def run_refresh_loop(interval: float = REFRESH_INTERVAL) -> None:
+    """Повторяет обход раз в интервал, пока процесс не будет остановлен.
+
+    Каждый обход тратит часовой бюджет загрузок страниц на университеты
+    и направления подготовки, конкурсные списки которых вероятнее всего изменились.
+
+    :param interval: Интервал между началами обходов в секундах.
+    """
+    while True:
+        started_at = time.monotonic()
+        await execute_gosuslugi_parser()
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started_at)))
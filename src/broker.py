@@ -1,21 +1,151 @@
-from faststream.rabbit import RabbitRouter
+from typing import Any
 
-from .core import ApplicantSchema, DirectionSchema, UniversitySchema
-from .database import add_all_applicants, add_directions, add_universities
+import functools
+from itertools import chain
+
+from faststream.rabbit import Channel, RabbitBroker, RabbitQueue, RabbitRouter
+from faststream.rabbit.annotations import RabbitMessage
+
+from .constants import CRAWL_DEAD_LETTERS_QUEUE, CRAWL_DELAYED_TASKS_QUEUE, CRAWL_TASKS_QUEUE
+from .core import (
+    ApplicantKeySchema,
+    ApplicantSchema,
+    ApplicantsChunkSchema,
+    DirectionSchema,
+    PublishPartSchema,
+    UniversitySchema,
+)
+from .database import (
+    BatchWriter,
+    FingerprintStore,
+    add_all_applicants,
+    add_directions,
+    add_universities,
+    delete_applicants,
+)
+from .settings import settings
+from .wire import ARROW_CONTENT_TYPE, decode_applicants
 
 router = RabbitRouter()
 
+# Брокер отдаёт не больше сообщений, чем помещается в одну пачку
+batch_channel = Channel(prefetch_count=settings.batch_settings.max_size)
+
+# Очереди задач обхода переживают перезапуск RabbitMQ и объявляются при подключении,
+# чтобы задачи не терялись, пока к очереди не подключился ни один воркер
+crawl_tasks_queue = RabbitQueue(CRAWL_TASKS_QUEUE, durable=True)
+crawl_dead_letters_queue = RabbitQueue(CRAWL_DEAD_LETTERS_QUEUE, durable=True)
+# Отложенные задачи лежат в очереди без подписчиков, пока не истечёт срок жизни сообщения,
+# после чего RabbitMQ возвращает их в очередь задач обхода
+crawl_delayed_tasks_queue = RabbitQueue(
+    CRAWL_DELAYED_TASKS_QUEUE,
+    durable=True,
+    arguments={"x-dead-letter-exchange": "", "x-dead-letter-routing-key": CRAWL_TASKS_QUEUE},
+)
+
+
+# Строки сообщения с изменениями и его номер в публикации направления подготовки
+ApplicantsBatch = tuple[list[ApplicantSchema] | list[dict[str, Any]], PublishPartSchema | None]
+DeletedApplicantsBatch = tuple[list[ApplicantKeySchema], PublishPartSchema | None]
+
+
+def _publish_part(message: RabbitMessage) -> PublishPartSchema | None:
+    """Номер сообщения в публикации из заголовков, если парсер ждёт подтверждения записи."""
+    if "publish_id" not in message.headers:
+        return None
+    return PublishPartSchema.model_validate(message.headers)
+
+
+def _confirm(batches: list[ApplicantsBatch] | list[DeletedApplicantsBatch]) -> functools.partial:
+    """Подтверждение записи сообщений пачки в транзакции их записи."""
+    parts = [part for _, part in batches if part is not None]
+    return functools.partial(FingerprintStore.confirm, parts=parts)
+
+
+async def _add_applicants_batches(batches: list[ApplicantsBatch]) -> None:
+    await add_all_applicants(
+        list(chain.from_iterable(rows for rows, _ in batches)), before_commit=_confirm(batches)
+    )
+
 
-@router.subscriber("universities")
+async def _delete_applicants_batches(batches: list[DeletedApplicantsBatch]) -> None:
+    await delete_applicants(
+        list(chain.from_iterable(keys for keys, _ in batches)), before_commit=_confirm(batches)
+    )
+
+
+universities_writer = BatchWriter(
+    add_universities,
+    max_size=settings.batch_settings.max_size,
+    max_delay=settings.batch_settings.max_delay,
+    name="universities",
+)
+directions_writer = BatchWriter(
+    add_directions,
+    max_size=settings.batch_settings.max_size,
+    max_delay=settings.batch_settings.max_delay,
+    name="directions",
+)
+applicants_writer = BatchWriter(
+    _add_applicants_batches,
+    max_size=settings.batch_settings.max_size,
+    max_delay=settings.batch_settings.max_delay,
+    name="applicants",
+)
+deleted_applicants_writer = BatchWriter(
+    _delete_applicants_batches,
+    max_size=settings.batch_settings.max_size,
+    max_delay=settings.batch_settings.max_delay,
+    name="deleted applicants",
+)
+
+
+async def declare_crawl_queues(broker: RabbitBroker) -> None:
+    """Объявляет очереди задач обхода."""
+    for queue in (crawl_tasks_queue, crawl_delayed_tasks_queue, crawl_dead_letters_queue):
+        await broker.declare_queue(queue)
+
+
+async def close_writers() -> None:
+    """Записывает в базу данных все накопленные пачки."""
+    for writer in (
+        universities_writer,
+        directions_writer,
+        applicants_writer,
+        deleted_applicants_writer,
+    ):
+        await writer.close()
+
+
+@router.subscriber("universities", channel=batch_channel)
 async def save_universities(schema: UniversitySchema) -> None:
-    await add_universities(schema)
+    await universities_writer.put(schema)
 
 
-@router.subscriber("directions")
+@router.subscriber("directions", channel=batch_channel)
 async def save_directions(schema: DirectionSchema) -> None:
-    await add_directions(schema)
+    await directions_writer.put(schema)
+
+
+@router.subscriber("applicants", channel=batch_channel)
+async def save_applicants(message: RabbitMessage) -> None:
+    await applicants_writer.put(
+        (decode_applicants(message.body, message.content_type), _publish_part(message))
+    )
+
+
+@router.subscriber("applicants.chunks", channel=batch_channel)
+async def save_applicants_chunk(message: RabbitMessage) -> None:
+    if message.content_type == ARROW_CONTENT_TYPE:
+        # Ключ списка и номер части бинарного сообщения лежат в заголовках
+        applicants = decode_applicants(message.body, message.content_type)
+    else:
+        applicants = ApplicantsChunkSchema.model_validate_json(message.body).applicants
+    await applicants_writer.put((applicants, _publish_part(message)))
 
 
-@router.subscriber("applicants")
-async def save_applicants(data: list[ApplicantSchema]) -> None:
-    await add_all_applicants(data)
+@router.subscriber("applicants.deleted", channel=batch_channel)
+async def delete_deleted_applicants(
+    keys: list[ApplicantKeySchema], message: RabbitMessage
+) -> None:
+    await deleted_applicants_writer.put((keys, _publish_part(message)))
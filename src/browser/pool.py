@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+    from playwright.async_api import Browser as AsyncBrowser
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
+    from playwright.async_api import Frame as AsyncFrame
+    from playwright.async_api import Page as AsyncPage
+
+    from .profile import ScrapeProfile
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# Максимальное количество одновременно арендованных страниц
+MAX_SIZE = 4
+# Количество страниц, создаваемых заранее при запуске пула
+WARM_SIZE = 1
+# Количество переходов, после которого страница пересоздаётся (ограничивает рост памяти Chromium)
+MAX_NAVIGATIONS = 50
+# Время на проверку работоспособности страницы в секундах
+HEALTH_CHECK_TIMEOUT = 5
+# Ключ конфигурации графа, через который передаётся арендованная страница
+PAGE_CONFIG_KEY = "page"
+
+BLANK_URL = "about:blank"
+
+
+class PooledPage:
+    """Страница пула вместе с её изолированным контекстом браузера.
+
+    :param context: Контекст браузера, которому принадлежит страница.
+    :param page: Асинхронная Playwright страница.
+    """
+
+    __slots__ = ("context", "navigations", "page")
+
+    def __init__(self, context: AsyncBrowserContext, page: AsyncPage) -> None:
+        self.context = context
+        self.page = page
+        self.navigations = 0
+        page.on("framenavigated", self._on_frame_navigated)
+
+    def _on_frame_navigated(self, frame: AsyncFrame) -> None:
+        if frame == self.page.main_frame and frame.url != BLANK_URL:
+            self.navigations += 1
+
+
+class PagePool:
+    """Пул страниц браузера с арендой и возвратом.
+
+    Каждая страница живёт в собственном контексте браузера, поэтому параллельные задачи
+    не делят между собой ни вкладку, ни cookies.
+
+    :param browser: Асинхронный Playwright браузер.
+    :param max_size: Максимальное количество одновременно арендованных страниц.
+    :param warm_size: Количество страниц, создаваемых заранее.
+    :param max_navigations: Количество переходов, после которого страница пересоздаётся.
+    :param profile: Профиль, который применяется к каждому создаваемому контексту.
+    :param context_options: Параметры для создания контекстов браузера.
+    """
+
+    def __init__(
+        self,
+        browser: AsyncBrowser,
+        max_size: int = MAX_SIZE,
+        warm_size: int = WARM_SIZE,
+        max_navigations: int = MAX_NAVIGATIONS,
+        profile: ScrapeProfile | None = None,
+        **context_options: Any,
+    ) -> None:
+        self.browser = browser
+        self.max_size = max_size
+        self.warm_size = min(warm_size, max_size)
+        self.max_navigations = max_navigations
+        self.profile = profile
+        self.context_options = (
+            {**profile.context_options, **context_options} if profile else context_options
+        )
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._idle: asyncio.LifoQueue[PooledPage] = asyncio.LifoQueue()
+        self._pages: set[PooledPage] = set()
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Заранее создаёт `warm_size` страниц."""
+        pages = await asyncio.gather(
+            *(self._create() for _ in range(self.warm_size - len(self._pages)))
+        )
+        for pooled in pages:
+            self._idle.put_nowait(pooled)
+        logger.info("---PAGE POOL STARTED WITH %s WARM PAGES---", len(pages))
+
+    async def close(self) -> None:
+        """Закрывает все страницы и контексты пула."""
+        await asyncio.gather(*(self._discard(pooled) for pooled in list(self._pages)))
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        logger.info("---PAGE POOL CLOSED---")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[AsyncPage]:
+        """Арендует страницу из пула на время работы контекстного менеджера.
+
+        :return: Асинхронная Playwright страница, принадлежащая только арендатору.
+        """
+        async with self._semaphore:
+            pooled = await self._acquire()
+            try:
+                yield pooled.page
+            finally:
+                await self._release(pooled)
+
+    async def _acquire(self) -> PooledPage:
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            if await self._is_healthy(pooled):
+                return pooled
+            logger.warning("---DISCARD UNHEALTHY PAGE---")
+            await self._discard(pooled)
+        return await self._create()
+
+    async def _release(self, pooled: PooledPage) -> None:
+        if pooled.navigations < self.max_navigations and not pooled.page.is_closed():
+            try:
+                # Страница освобождает ресурсы SPA, пока лежит в пуле
+                await pooled.page.goto(BLANK_URL)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("---FAILED TO RESET PAGE %s---", e)
+            else:
+                self._idle.put_nowait(pooled)
+                return
+        logger.info("---RECYCLE PAGE AFTER %s NAVIGATIONS---", pooled.navigations)
+        await self._discard(pooled)
+        if len(self._pages) < self.warm_size:
+            self._idle.put_nowait(await self._create())
+
+    async def _create(self) -> PooledPage:
+        context = await self.browser.new_context(**self.context_options)
+        if self.profile is not None:
+            await self.profile.apply(context)
+        page = await context.new_page()
+        pooled = PooledPage(context, page)
+        self._pages.add(pooled)
+        return pooled
+
+    async def _discard(self, pooled: PooledPage) -> None:
+        self._pages.discard(pooled)
+        try:
+            await pooled.context.close()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("---FAILED TO CLOSE CONTEXT %s---", e)
+
+    @staticmethod
+    async def _is_healthy(pooled: PooledPage) -> bool:
+        if pooled.page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(pooled.page.evaluate("1"), HEALTH_CHECK_TIMEOUT)
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+
+
+def page_config(page: AsyncPage) -> RunnableConfig:
+    """Формирует конфигурацию графа с арендованной страницей.
+
+    :param page: Арендованная из пула страница.
+    :return: Конфигурация для вызова графа.
+    """
+    return {"configurable": {PAGE_CONFIG_KEY: page}}
+
+
+def get_leased_page(config: RunnableConfig) -> AsyncPage:
+    """Получает арендованную страницу из конфигурации графа.
+
+    :param config: Конфигурация, с которой был вызван граф.
+    :return: Арендованная страница.
+    """
+    page = config.get("configurable", {}).get(PAGE_CONFIG_KEY)
+    if page is None:
+        raise ValueError("Page must be leased from PagePool and passed to graph config!")
+    return page
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
+    from playwright.async_api import Route as AsyncRoute
+
+    from ..settings import BrowserSettings
+
+import logging
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Типы ресурсов, которые не нужны для парсинга
+BLOCK_RESOURCE_TYPES: tuple[str, ...] = ("image", "media", "font")
+# Домены счётчиков и систем аналитики
+TRACKER_DOMAINS: tuple[str, ...] = (
+    "mc.yandex.ru",
+    "mc.yandex.com",
+    "top-fwz1.mail.ru",
+    "counter.yadro.ru",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "sentry.io",
+    "vk.com",
+)
+# Аргументы Chromium, отключающие GPU и фоновую работу
+LAUNCH_ARGS: tuple[str, ...] = (
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-renderer-backgrounding",
+    "--mute-audio",
+)
+# Стили, отключающие анимации и плавную прокрутку
+DISABLE_ANIMATIONS_SCRIPT = """
+document.addEventListener("DOMContentLoaded", () => {
+    const style = document.createElement("style");
+    style.textContent = `*, *::before, *::after {
+        animation: none !important;
+        transition: none !important;
+        scroll-behavior: auto !important;
+    }`;
+    document.head.appendChild(style);
+});
+"""
+
+
+class ScrapeProfile:
+    """Облегчённый профиль браузера для парсинга.
+
+    Блокирует картинки, медиа, шрифты и счётчики аналитики, запускает браузер
+    в headless режиме без GPU и отключает анимации на страницах.
+
+    :param headless: Запускать ли браузер в headless режиме.
+    :param block_resource_types: Типы ресурсов Playwright, запросы которых отменяются.
+    :param block_domains: Домены (вместе с поддоменами), запросы к которым отменяются.
+    :param disable_gpu: Отключать ли GPU и фоновые службы Chromium.
+    :param disable_animations: Отключать ли анимации и переходы на страницах.
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        block_resource_types: tuple[str, ...] | list[str] = BLOCK_RESOURCE_TYPES,
+        block_domains: tuple[str, ...] | list[str] = TRACKER_DOMAINS,
+        disable_gpu: bool = True,
+        disable_animations: bool = True,
+    ) -> None:
+        self.headless = headless
+        self.block_resource_types = frozenset(block_resource_types)
+        self.block_domains = tuple(block_domains)
+        self.disable_gpu = disable_gpu
+        self.disable_animations = disable_animations
+
+    @classmethod
+    def from_settings(cls, browser_settings: BrowserSettings) -> Self:
+        """Создаёт профиль из настроек браузера.
+
+        :param browser_settings: Настройки браузера.
+        :return: Профиль браузера.
+        """
+        return cls(
+            headless=browser_settings.headless,
+            block_resource_types=browser_settings.block_resource_types,
+            block_domains=browser_settings.block_domains,
+            disable_gpu=browser_settings.disable_gpu,
+            disable_animations=browser_settings.disable_animations,
+        )
+
+    @property
+    def launch_options(self) -> dict[str, Any]:
+        """Параметры для `chromium.launch`."""
+        return {"headless": self.headless, "args": list(LAUNCH_ARGS) if self.disable_gpu else []}
+
+    @property
+    def context_options(self) -> dict[str, Any]:
+        """Параметры для `browser.new_context`."""
+        return {"reduced_motion": "reduce"} if self.disable_animations else {}
+
+    @property
+    def is_blocking(self) -> bool:
+        """True если профиль отменяет хотя бы часть запросов."""
+        return bool(self.block_resource_types or self.block_domains)
+
+    def is_blocked(self, url: str, resource_type: str) -> bool:
+        """Проверяет, нужно ли отменить запрос.
+
+        :param url: URL адрес запроса.
+        :param resource_type: Тип ресурса Playwright, например: image, font, script.
+        :return: True если запрос не нужен для парсинга.
+        """
+        if resource_type in self.block_resource_types:
+            return True
+        host = urlparse(url).hostname or ""
+        return any(host == domain or host.endswith(f".{domain}") for domain in self.block_domains)
+
+    async def apply(self, context: AsyncBrowserContext) -> None:
+        """Применяет профиль к контексту браузера.
+
+        :param context: Контекст браузера, созданный с `context_options`.
+        """
+        if self.is_blocking:
+            await context.route("**/*", self._handle_route)
+        if self.disable_animations:
+            await context.add_init_script(DISABLE_ANIMATIONS_SCRIPT)
+
+    async def _handle_route(self, route: AsyncRoute) -> None:
+        request = route.request
+        if self.is_blocked(request.url, request.resource_type):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
@@ -1,26 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
-
-if TYPE_CHECKING:
-    from playwright.async_api import Browser as AsyncBrowser
-    from playwright.sync_api import Browser as SyncBrowser
+from typing import Any, Self
 
 from langchain_core.tools import BaseTool
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Browser as SyncBrowser
 from pydantic import model_validator
 
+from .utils import aget_current_page
+
 
 class BaseBrowserTool(BaseTool):
-    """Базовый класс для инструментов автоматизации браузера"""
+    """Базовый класс для инструментов автоматизации браузера.
+
+    Типы браузеров импортируются не только для аннотаций: pydantic проверяет их
+    при создании инструмента.
+    """
 
     sync_browser: SyncBrowser | None = None
     async_browser: AsyncBrowser | None = None
+    async_page: AsyncPage | None = None  # Арендованная из пула страница
 
-    @model_validator(mode="before")
-    def validate_browser_provided(self) -> BaseBrowserTool:
+    @model_validator(mode="after")
+    def validate_browser_provided(self) -> Self:
         """Проверка инициализации разных типов браузеров"""
-        if self.sync_browser is None and self.async_browser is None:
-            raise ValueError("Either browsers instances must be provided!")
+        if self.sync_browser is None and self.async_browser is None and self.async_page is None:
+            raise ValueError("Either browsers or page instances must be provided!")
         return self
 
     @classmethod
@@ -30,6 +36,19 @@ class BaseBrowserTool(BaseTool):
         """Инициализация инструмента через уже готовый браузер."""
         return cls(sync_browser=sync_browser, async_browser=async_browser)
 
+    @classmethod
+    def from_page(cls, async_page: AsyncPage) -> BaseBrowserTool:
+        """Инициализация инструмента через арендованную из пула страницу."""
+        return cls(async_page=async_page)
+
+    async def _aget_page(self) -> AsyncPage:
+        """Получает арендованную страницу, либо текущую страницу асинхронного браузера."""
+        if self.async_page is not None:
+            return self.async_page
+        if self.async_browser is None:
+            raise ValueError(f"Asynchronous browser not provided to {self.name}")
+        return await aget_current_page(self.async_browser)
+
     def _run(self, *args: Any, **kwargs: Any) -> Any:
         """Синхронный вызов инструмента."""
         raise NotImplementedError
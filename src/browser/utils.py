@@ -6,6 +6,7 @@ from collections.abc import Sequence
 
 if TYPE_CHECKING:
     from playwright.async_api import Browser as AsyncBrowser
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
     from playwright.async_api import Page as AsyncPage
     from playwright.sync_api import Browser as SyncBrowser
     from playwright.sync_api import Page as SyncPage
@@ -14,15 +15,35 @@ from ..utils import run_async
 
 ATTRIBUTE = "innerText"
 TIMEOUT = 2000  # Время в мс
-
-
-async def aget_current_page(browser: AsyncBrowser) -> AsyncPage:
+# JS скрипт, извлекающий атрибуты всех найденных элементов, пустые значения пропускаются
+EXTRACT_ELEMENTS_SCRIPT = """(elements, [attributes, innerText]) => elements
+    .map(element => {
+        const result = {};
+        for (const attribute of attributes) {
+            const value = attribute === innerText
+                ? element.innerText
+                : element.getAttribute(attribute);
+            if (value !== null && value !== undefined && value.trim() !== "") {
+                result[attribute] = value;
+            }
+        }
+        return result;
+    })
+    .filter(result => Object.keys(result).length > 0)"""
+
+
+async def aget_current_page(browser: AsyncBrowser | AsyncBrowserContext) -> AsyncPage:
     """
     Асинхронно получает текущую страницу браузера.
 
-    :param browser:
+    :param browser: Асинхронный Playwright браузер или его изолированный контекст.
     :return: Текущая страница браузера.
     """
+    if not hasattr(browser, "contexts"):
+        # Передан контекст браузера, страницы берутся только из него
+        if not browser.pages:
+            return await browser.new_page()
+        return browser.pages[-1]
     if not browser.contexts:
         context = await browser.new_context()
         return await context.new_page()
@@ -85,26 +106,16 @@ async def aget_elements(
 ) -> list[dict[str, str]]:
     """
     Асинхронно получает элементы на странице по заданному CSS селектору.
+    Все атрибуты всех элементов извлекаются за один вызов в браузере.
 
     :param page: Текущая страница.
     :param css_selector: CSS селектор для поиска.
     :param attributes: Набора атрибутов, которые нужно получить.
     :return: Список найденных элементов.
     """
-    elements = await page.query_selector_all(css_selector)
-    results: list[dict[str, str]] = []
-    for element in elements:
-        result: dict[str, str] = {}
-        for attribute in attributes:
-            if attribute == ATTRIBUTE:
-                value = await element.inner_text()
-            else:
-                value = await element.get_attribute(attribute)
-            if value is not None and value.strip() != "":
-                result[attribute] = value
-        if result:
-            results.append(result)
-    return results
+    return await page.eval_on_selector_all(
+        css_selector, EXTRACT_ELEMENTS_SCRIPT, [list(attributes), ATTRIBUTE]
+    )
 
 
 def get_elements(
@@ -112,26 +123,16 @@ def get_elements(
 ) -> list[dict[str, str]]:
     """
     Синхронно получает элементы на странице по заданному CSS селектору.
+    Все атрибуты всех элементов извлекаются за один вызов в браузере.
 
     :param page: Текущая страница.
     :param css_selector: CSS селектор для поиска.
     :param attributes: Набора атрибутов, которые нужно получить.
     :return: Список найденных элементов.
     """
-    elements = page.query_selector_all(css_selector)
-    results: list[dict[str, str]] = []
-    for element in elements:
-        result: dict[str, str] = {}
-        for attribute in attributes:
-            if attribute == ATTRIBUTE:
-                value = element.inner_text()
-            else:
-                value = element.get_attribute(attribute)
-            if value is not None and value.strip() != "":  # noqa: PLC1901
-                result[attribute] = value
-        if result:
-            results.append(result)
-    return results
+    return page.eval_on_selector_all(
+        css_selector, EXTRACT_ELEMENTS_SCRIPT, [list(attributes), ATTRIBUTE]
+    )
 
 
 async def ascroll_to_click(page: AsyncPage, css_selector: str) -> bool:
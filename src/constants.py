@@ -13,4 +13,11 @@ MAX_RECURSION_LIMIT = 50
 # Количество университетов.
 UNIVERSITIES_COUNT = 1737
 
+# Очередь задач распределённого обхода.
+CRAWL_TASKS_QUEUE = "crawl.tasks"
+# Очередь задач обхода, которые ещё в работе у другого воркера, без подписчиков.
+CRAWL_DELAYED_TASKS_QUEUE = "crawl.tasks.delayed"
+# Очередь задач обхода, провалившихся после всех попыток.
+CRAWL_DEAD_LETTERS_QUEUE = "crawl.dead_letters"
+
 TIMEOUT = 5
@@ -1,11 +1,29 @@
 __all__ = [
+    "ApplicantKeySchema",
     "ApplicantSchema",
+    "ApplicantsChunkSchema",
+    "CrawlKind",
+    "CrawlState",
+    "CrawlTaskSchema",
+    "DeadLetterSchema",
     "DirectionSchema",
     "EducationForm",
+    "FingerprintSchema",
+    "PublishPartSchema",
     "Source",
     "Submit",
     "UniversitySchema",
 ]
 
-from .enums import EducationForm, Source, Submit
-from .schemas import ApplicantSchema, DirectionSchema, UniversitySchema
+from .enums import CrawlKind, CrawlState, EducationForm, Source, Submit
+from .schemas import (
+    ApplicantKeySchema,
+    ApplicantSchema,
+    ApplicantsChunkSchema,
+    CrawlTaskSchema,
+    DeadLetterSchema,
+    DirectionSchema,
+    FingerprintSchema,
+    PublishPartSchema,
+    UniversitySchema,
+)
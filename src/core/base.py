@@ -7,7 +7,7 @@ class Broker(Protocol):
     """Абстрактный класс брокера сообщений"""
     async def publish(
             self,
-            messages: str | dict | list[dict] | BaseModel | list[BaseModel],
+            messages: str | bytes | dict | list[dict] | BaseModel | list[BaseModel],
             **kwargs
     ) -> None:
         pass
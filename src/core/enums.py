@@ -27,3 +27,17 @@ class Status(StrEnum):
     CANCELED = "Конкурсная группа исключена"
     AWAITED_RESULTS = "Ожидаются результаты испытаний"
     IN_COMPETITION = "Участвуете в конкурсе"
+
+
+class CrawlKind(StrEnum):
+    """Виды задач обхода"""
+    UNIVERSITY = "university"
+    DIRECTION = "direction"
+
+
+class CrawlState(StrEnum):
+    """Состояния задачи обхода"""
+    PENDING = "pending"
+    IN_FLIGHT = "in_flight"
+    DONE = "done"
+    FAILED = "failed"
@@ -0,0 +1,14 @@
+class IncompleteUniversityError(Exception):
+    """Часть направлений подготовки университета не удалось распарсить"""
+
+
+class TechnicalError(Exception):
+    """Госуслуги вернули страницу `Техническая ошибка`"""
+
+
+class PageNotFoundError(Exception):
+    """Госуслуги ответили 404 или показали страницу `Страница не найдена`"""
+
+
+class TooManyRequestsError(Exception):
+    """Госуслуги ответили 429 Too Many Requests"""
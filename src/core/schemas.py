@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import uuid
+
 from pydantic import BaseModel, ConfigDict
 
-from .enums import EducationForm, Source, Submit
+from .enums import CrawlKind, EducationForm, Source, Submit
 
 
 class UniversitySchema(BaseModel):
@@ -45,3 +47,53 @@ class ApplicantSchema(BaseModel):
     advantage: str | None = None     # Преимущество
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ApplicantsChunkSchema(BaseModel):
+    """Часть новых и изменившихся абитуриентов одного конкурсного списка"""
+    university_id: int                 # ID университета
+    direction_code: str                # Код направления подготовки
+    reception: str                     # Вид приёма и число мест
+    sequence: int                      # Порядковый номер части в конкурсном списке с нуля
+    is_last: bool                      # True если часть последняя в конкурсном списке
+    applicants: list[ApplicantSchema]  # Абитуриенты части
+
+
+class ApplicantKeySchema(BaseModel):
+    """Первичный ключ абитуриента, удалённого из конкурсных списков"""
+    university_id: int   # ID университета
+    direction_code: str  # Код направления подготовки
+    id: int              # ID абитуриента с Госуслуг
+
+
+class FingerprintSchema(BaseModel):
+    """Отпечаток скачанного конкурсного списка"""
+    university_id: int          # ID университета
+    direction_code: str         # Код направления подготовки
+    reception: str              # Вид приёма и число мест
+    content_hash: str           # Хэш CSV файла
+    row_count: int              # Количество абитуриентов в списке
+    row_hashes: dict[int, str]  # Хэши строк списка по ID абитуриентов
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PublishPartSchema(BaseModel):
+    """Сообщение с изменениями конкурсных списков в публикации направления подготовки"""
+    publish_id: uuid.UUID  # ID публикации изменений направления подготовки
+    part: int              # Номер сообщения в публикации с нуля
+
+
+class CrawlTaskSchema(BaseModel):
+    """Задача распределённого обхода"""
+    kind: CrawlKind                # Вид задачи
+    url: str                       # URL университета или направления подготовки
+    parent_url: str | None = None  # URL университета направления подготовки
+
+
+class DeadLetterSchema(BaseModel):
+    """Задача обхода, провалившаяся после всех попыток"""
+    kind: CrawlKind                # Вид задачи
+    url: str                       # URL университета или направления подготовки
+    parent_url: str | None = None  # URL университета направления подготовки
+    error: str                     # Последняя ошибка
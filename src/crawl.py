@@ -0,0 +1,227 @@
+import asyncio
+import logging
+
+from faststream.rabbit import Channel, RabbitBroker, RabbitRouter
+from playwright.async_api import async_playwright
+
+from .app import EDUCATION_LEVELS, select_university_urls, start_broker
+from .broker import crawl_dead_letters_queue, crawl_tasks_queue
+from .browser.pool import PagePool, page_config
+from .browser.profile import ScrapeProfile
+from .constants import CRAWL_DEAD_LETTERS_QUEUE, CRAWL_DELAYED_TASKS_QUEUE, CRAWL_TASKS_QUEUE
+from .core import CrawlKind, CrawlState, CrawlTaskSchema, DeadLetterSchema
+from .core.enums import EducationForm
+from .core.exceptions import PageNotFoundError
+from .database import CrawlFrontier, FingerprintStore, RefreshScheduler, UniversityIndex
+from .dependencies import container
+from .gosuslugi.api import GosuslugiApi
+from .gosuslugi.fetchers import AdmissionListFetcher
+from .gosuslugi.graphs import build_direction_graph, build_discovery_graph
+from .gosuslugi.helpers import extract_university_id
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlWorker:
+    """Воркер распределённого обхода, выполняющий задачи из очереди `crawl.tasks`.
+
+    Задача университета публикует университет и ставит в очередь его направления
+    подготовки, задача направления подготовки парсит и публикует его конкурсные списки.
+    Воркер берёт задачу в очереди обхода перед выполнением, поэтому повторно
+    опубликованная задача, которая уже выполнена, только подтверждается, а задача,
+    которая ещё в работе, откладывается до истечения её аренды.
+    Результат задачи отмечается в очереди обхода, упавшая задача пробрасывает исключение,
+    чтобы брокер не подтверждал сообщение, а после всех попыток отправляется в очередь
+    недоставленных задач.
+
+    :param broker: Брокер сообщений.
+    :param pool: Пул страниц браузера воркера.
+    :param frontier: Очередь задач обхода.
+    :param fetcher: Загрузчик конкурсных списков по HTTP.
+    :param fingerprints: Хранилище отпечатков конкурсных списков.
+    :param api: JSON API Госуслуг для парсинга без браузера.
+    :param index: Индекс университетов, в котором отмечаются распарсенные
+    и несуществующие университеты.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        broker: RabbitBroker,
+        pool: PagePool,
+        frontier: CrawlFrontier,
+        fetcher: AdmissionListFetcher | None = None,
+        fingerprints: FingerprintStore | None = None,
+        api: GosuslugiApi | None = None,
+        index: UniversityIndex | None = None,
+    ) -> None:
+        self.broker = broker
+        self.pool = pool
+        self.frontier = frontier
+        self.index = index
+        self.discovery_graph = build_discovery_graph(broker, pool, frontier, api, fingerprints)
+        self.direction_graph = build_direction_graph(broker, pool, fetcher, fingerprints, api)
+
+    async def handle(self, task: CrawlTaskSchema) -> None:
+        """Выполняет задачу обхода на арендованной из пула странице.
+
+        :param task: Задача обхода.
+        """
+        if not await self.frontier.claim(task.kind, limit=1, url=task.url):
+            await self._skip(task)
+            return
+        logger.info("Start %s task %s", task.kind, task.url)
+        if task.kind == CrawlKind.UNIVERSITY:
+            graph, state = self.discovery_graph, {
+                "university_url": task.url,
+                "education_forms": [EducationForm.FULL_TIME],
+                "education_levels": EDUCATION_LEVELS,
+            }
+        else:
+            graph, state = self.direction_graph, {
+                "university_id": extract_university_id(task.url),
+                "direction_url": task.url,
+            }
+        async with self.pool.lease() as page:
+            try:
+                response = await graph.ainvoke(state, config=page_config(page))
+            except Exception as e:
+                if isinstance(e, PageNotFoundError) and task.kind == CrawlKind.UNIVERSITY:
+                    # Госуслуги прямо ответили, что университета нет, повторять задачу бесполезно
+                    logger.warning("University %s not found", task.url)
+                    await self.frontier.complete(task.kind, task.url)
+                    if self.index is not None:
+                        await self.index.mark_dead(task.url)
+                    return
+                logger.exception("Error while crawl %s, error: %s", task.url, e)  # noqa: TRY401
+                if await self.frontier.fail(task.kind, task.url, e):
+                    await self.broker.publish(
+                        DeadLetterSchema(
+                            kind=task.kind,
+                            url=task.url,
+                            parent_url=task.parent_url,
+                            error=repr(e),
+                        ),
+                        queue=CRAWL_DEAD_LETTERS_QUEUE,
+                        persist=True,
+                    )
+                raise
+        await self.frontier.complete(task.kind, task.url)
+        if self.index is not None and task.kind == CrawlKind.UNIVERSITY:
+            await self.index.record(task.url, len(response.get("direction_urls", [])))
+
+    async def _skip(self, task: CrawlTaskSchema) -> None:
+        """Подтверждает задачу, которую не удалось взять в работу, или откладывает её.
+
+        Задача, аренда которой ещё не истекла, могла достаться этому воркеру после
+        падения воркера, который её выполнял, поэтому она возвращается в очередь
+        после истечения аренды, а не теряется до следующего запуска продюсера.
+        """
+        state = await self.frontier.state(task.kind, task.url)
+        if state in {CrawlState.PENDING, CrawlState.IN_FLIGHT}:
+            logger.info("Delay %s task %s, leased by another worker", task.kind, task.url)
+            await self.broker.publish(
+                task,
+                queue=CRAWL_DELAYED_TASKS_QUEUE,
+                persist=True,
+                expiration=self.frontier.lease_timeout,
+            )
+        else:
+            logger.info("Skip %s task %s, already done", task.kind, task.url)
+
+
+def create_crawl_router(
+    worker: CrawlWorker, prefetch: int = settings.parser_settings.worker_prefetch
+) -> RabbitRouter:
+    """Создаёт роутер, передающий задачи из очереди `crawl.tasks` воркеру.
+
+    Сообщение подтверждается только после успешного выполнения задачи.
+
+    :param worker: Воркер распределённого обхода.
+    :param prefetch: Количество задач, которые брокер отдаёт воркеру одновременно.
+    :return: Роутер с подписчиком на очередь задач.
+    """
+    router = RabbitRouter()
+
+    @router.subscriber(crawl_tasks_queue, channel=Channel(prefetch_count=prefetch))
+    async def crawl(task: CrawlTaskSchema) -> None:
+        await worker.handle(task)
+
+    return router
+
+
+async def produce_crawl_tasks() -> int:
+    """Публикует в очередь `crawl.tasks` задачи университетов и незаконченных
+    направлений подготовки текущего обхода.
+
+    Задачи публикуются без взятия в работу, их берут воркеры. Повторный запуск
+    продолжает незаконченный обход: задачи, не выполненные воркерами, публикуются
+    заново, пока у них остаются попытки, а дубли ещё ждущих в очереди задач
+    воркеры пропускают.
+
+    :return: Количество опубликованных задач.
+    """
+    broker = await container.get(RabbitBroker)
+    frontier = CrawlFrontier()
+    is_resumed = await frontier.start(await select_university_urls(RefreshScheduler()))
+    logger.info("%s crawl", "Resume" if is_resumed else "Start new")
+    tasks = [
+        CrawlTaskSchema(kind=kind, url=url, parent_url=parent_url)
+        for kind in (CrawlKind.UNIVERSITY, CrawlKind.DIRECTION)
+        for url, parent_url in (await frontier.pending(kind)).items()
+    ]
+    await asyncio.gather(*(
+        broker.publish(task, queue=CRAWL_TASKS_QUEUE, persist=True) for task in tasks
+    ))
+    logger.info("Published %s crawl tasks", len(tasks))
+    return len(tasks)
+
+
+async def replay_dead_letters() -> int:
+    """Возвращает в очередь обхода все задачи из очереди `crawl.dead_letters`.
+
+    Задачи получают новые попытки и выполняются при следующем запуске парсера
+    или публикации задач, сообщения подтверждаются после сохранения в очереди обхода.
+
+    :return: Количество возвращённых задач.
+    """
+    broker = await container.get(RabbitBroker)
+    queue = await broker.declare_queue(crawl_dead_letters_queue)
+    messages = []
+    while (message := await queue.get(fail=False)) is not None:
+        messages.append(message)
+    letters = [DeadLetterSchema.model_validate_json(message.body) for message in messages]
+    await CrawlFrontier().retry(letters)
+    for message in messages:
+        await message.ack()
+    logger.info("Replayed %s dead letters", len(letters))
+    return len(letters)
+
+
+async def run_crawl_worker(prefetch: int = settings.parser_settings.worker_prefetch) -> None:
+    """Запускает воркер со своим браузером, выполняющий задачи из очереди `crawl.tasks`,
+    пока процесс не будет остановлен.
+
+    :param prefetch: Количество задач, которые воркер выполняет одновременно.
+    """
+    async with async_playwright() as playwright:
+        profile = ScrapeProfile.from_settings(settings.browser_settings)
+        browser = await playwright.chromium.launch(**profile.launch_options)
+        async with (
+            PagePool(browser, max_size=prefetch, warm_size=prefetch, profile=profile) as pool,
+            AdmissionListFetcher() as fetcher,
+            GosuslugiApi() as api,
+        ):
+            fingerprints = FingerprintStore() if settings.parser_settings.incremental else None
+            worker = CrawlWorker(
+                await container.get(RabbitBroker),
+                pool,
+                CrawlFrontier(),
+                fetcher,
+                fingerprints,
+                api if settings.parser_settings.json_api else None,
+                UniversityIndex(),
+            )
+            async with start_broker(create_crawl_router(worker, prefetch)):
+                logger.info("Crawl worker started")
+                await asyncio.Event().wait()
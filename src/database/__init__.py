@@ -1,13 +1,38 @@
 __all__ = [
     "ApplicantsModel",
     "Base",
+    "BatchWriter",
+    "CrawlFrontier",
     "DirectionsModel",
+    "FingerprintStore",
+    "FingerprintsModel",
+    "FrontierModel",
+    "PendingFingerprintsModel",
+    "RefreshScheduler",
     "UniversitiesModel",
+    "UniversityIndex",
+    "UniversityIndexModel",
+    "WrittenPartsModel",
     "add_all_applicants",
     "add_directions",
     "add_universities",
+    "delete_applicants",
 ]
 
+from .batching import BatchWriter
 from .database_configs import Base
-from .models import ApplicantsModel, DirectionsModel, UniversitiesModel
-from .session import add_all_applicants, add_directions, add_universities
+from .fingerprints import FingerprintStore
+from .frontier import CrawlFrontier
+from .models import (
+    ApplicantsModel,
+    DirectionsModel,
+    FingerprintsModel,
+    FrontierModel,
+    PendingFingerprintsModel,
+    UniversitiesModel,
+    UniversityIndexModel,
+    WrittenPartsModel,
+)
+from .scheduler import RefreshScheduler
+from .session import add_all_applicants, add_directions, add_universities, delete_applicants
+from .university_index import UniversityIndex
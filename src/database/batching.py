@@ -0,0 +1,89 @@
+from typing import Any
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Миллисекунд в секунде
+MILLISECONDS = 1000
+
+
+class BatchWriter[T]:
+    """Копит элементы и записывает их в базу данных одной транзакцией.
+
+    Пачка записывается, когда в ней набралось `max_size` элементов или с момента
+    появления первого элемента прошло `max_delay` миллисекунд. `put` завершается
+    только после коммита пачки, поэтому сообщение брокера подтверждается после записи,
+    а при ошибке записи исключение получает каждое сообщение пачки.
+
+    :param write: Асинхронная функция, записывающая пачку элементов в одной транзакции.
+    :param max_size: Максимальное количество элементов в пачке.
+    :param max_delay: Максимальное время ожидания пачки в миллисекундах.
+    :param name: Название пачки для логов.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[T]], Awaitable[None]],
+        max_size: int,
+        max_delay: int,
+        name: str = "batch",
+    ) -> None:
+        self.write = write
+        self.max_size = max(1, max_size)
+        self.max_delay = max_delay / MILLISECONDS
+        self.name = name
+        self._items: list[T] = []
+        self._waiters: list[asyncio.Future[None]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # Пачки одной таблицы пишутся по очереди, чтобы не нарушать порядок сообщений
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    async def put(self, item: T) -> None:
+        """Добавляет элемент в пачку и ждёт, пока пачка будет записана.
+
+        :param item: Элемент для записи.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._items.append(item)
+        self._waiters.append(waiter)
+        if len(self._items) >= self.max_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._schedule_flush)
+        await waiter
+
+    async def close(self) -> None:
+        """Записывает накопленные элементы и дожидается всех начатых записей."""
+        if self._items:
+            self._schedule_flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _schedule_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, waiters = self._items, self._waiters
+        self._items, self._waiters = [], []
+        task = asyncio.create_task(self._flush(items, waiters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, items: list[T], waiters: list[asyncio.Future[None]]) -> None:
+        async with self._lock:
+            try:
+                await self.write(items)
+            except Exception as e:
+                logger.exception("---FAILED TO WRITE %s OF %s ITEMS---", self.name, len(items))
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            else:
+                logger.info("---WRITTEN %s OF %s ITEMS---", self.name, len(items))
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
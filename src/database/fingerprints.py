@@ -0,0 +1,254 @@
+import uuid
+from collections.abc import Iterable, Sequence
+from datetime import timedelta
+
+from sqlalchemy import ColumnElement, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as upsert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import FingerprintSchema, PublishPartSchema
+from ..settings import settings
+from .models import FingerprintsModel, PendingFingerprintsModel, WrittenPartsModel
+from .session import get_session
+
+SECONDS_PER_HOUR = 60 * 60
+# Априорная частота изменений списка: одно изменение в сутки, пока наблюдений мало
+PRIOR_CHANGES = 1
+PRIOR_HOURS = 24
+# Сколько хранятся отметки записанных сообщений публикации, отпечатки которой не отложены
+WRITTEN_PARTS_TTL = timedelta(days=1)
+
+
+def hours_since_seen() -> ColumnElement[float]:
+    """Сколько часов прошло с последнего скачивания конкурсного списка."""
+    return func.extract("epoch", func.now() - FingerprintsModel.last_seen) / SECONDS_PER_HOUR
+
+
+def expected_changes() -> ColumnElement[float]:
+    """Ожидаемое количество изменений конкурсного списка с последнего скачивания:
+    оценка частоты изменений в час, умноженная на время с последнего скачивания."""
+    change_rate = (FingerprintsModel.change_count + PRIOR_CHANGES) / (
+        FingerprintsModel.observed_hours + PRIOR_HOURS
+    )
+    return change_rate * hours_since_seen()
+
+
+def _observe(
+    is_changed: bool, half_life: float = settings.scheduler_settings.half_life
+) -> dict[str, ColumnElement[float]]:
+    """Добавляет скачивание списка в оценку частоты его изменений, старые наблюдения
+    затухают, чтобы оценка успевала за началом и концом приёмной кампании."""
+    hours = hours_since_seen()
+    decay = func.power(0.5, hours / half_life)
+    return {
+        "change_count": FingerprintsModel.change_count * decay + int(is_changed),
+        "observed_hours": FingerprintsModel.observed_hours * decay + hours,
+    }
+
+
+async def _lock(session: AsyncSession, publish_ids: Iterable[uuid.UUID]) -> None:
+    """Блокирует публикации до конца транзакции.
+
+    Без блокировки транзакция последнего сообщения и транзакция отложенных отпечатков
+    могут не увидеть друг друга, и отпечатки не сохранятся никогда. Блокировки берутся
+    по порядку ID, чтобы пачки с несколькими публикациями не ждали друг друга по кругу.
+    """
+    for publish_id in sorted(publish_ids):
+        await session.execute(
+            select(func.pg_advisory_xact_lock(func.hashtextextended(str(publish_id), 0)))
+        )
+
+
+async def _promote(session: AsyncSession, publish_ids: Iterable[uuid.UUID]) -> None:
+    """Сохраняет отложенные отпечатки публикаций, все сообщения которых записаны."""
+    written = (
+        select(func.count())
+        .where(WrittenPartsModel.publish_id == PendingFingerprintsModel.publish_id)
+        .scalar_subquery()
+    )
+    pending = await session.scalars(
+        select(PendingFingerprintsModel).where(
+            PendingFingerprintsModel.publish_id.in_(list(publish_ids)),
+            PendingFingerprintsModel.parts <= written,
+        )
+    )
+    for model in pending.all():
+        await _save(
+            session,
+            model.university_id,
+            model.direction_code,
+            [FingerprintSchema.model_validate(fingerprint) for fingerprint in model.fingerprints],
+            model.seen_receptions,
+        )
+        await session.execute(
+            delete(WrittenPartsModel).where(WrittenPartsModel.publish_id == model.publish_id)
+        )
+        await session.execute(
+            delete(PendingFingerprintsModel).where(
+                PendingFingerprintsModel.publish_id == model.publish_id
+            )
+        )
+
+
+async def _save(
+    session: AsyncSession,
+    university_id: int,
+    direction_code: str,
+    fingerprints: list[FingerprintSchema],
+    seen_receptions: list[str],
+) -> None:
+    """Сохраняет отпечатки направления подготовки в транзакции сессии.
+
+    Отпечатки изменившихся списков перезаписываются, у неизменившихся обновляется
+    только время последнего скачивания, а отпечатки пропавших списков удаляются.
+    Каждое скачивание учитывается в оценке частоты изменений списка.
+    """
+    direction = (
+        FingerprintsModel.university_id == university_id,
+        FingerprintsModel.direction_code == direction_code,
+    )
+    if fingerprints:
+        stmt = upsert(FingerprintsModel).values([
+            fingerprint.model_dump() for fingerprint in fingerprints
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint="fingerprint_pk",
+            set_={
+                "content_hash": stmt.excluded.content_hash,
+                "row_count": stmt.excluded.row_count,
+                "row_hashes": stmt.excluded.row_hashes,
+                "last_seen": func.now(),
+                **_observe(is_changed=True),
+            },
+        )
+        await session.execute(stmt)
+    if seen_receptions:
+        await session.execute(
+            update(FingerprintsModel)
+            .where(*direction, FingerprintsModel.reception.in_(seen_receptions))
+            .values(last_seen=func.now(), **_observe(is_changed=False))
+        )
+    receptions = [fingerprint.reception for fingerprint in fingerprints]
+    await session.execute(
+        delete(FingerprintsModel).where(
+            *direction, FingerprintsModel.reception.not_in(receptions + seen_receptions)
+        )
+    )
+
+
+class FingerprintStore:
+    """Хранилище отпечатков конкурсных списков.
+
+    По отпечаткам парсер узнаёт, изменился ли конкурсный список с прошлого запуска,
+    и какие абитуриенты в нём добавились, изменились или пропали. Отпечатки
+    сохраняются только после записи опубликованных изменений в базу данных.
+    """
+
+    @staticmethod
+    async def load(university_id: int, direction_code: str) -> dict[str, FingerprintSchema]:
+        """Загружает отпечатки всех конкурсных списков направления подготовки.
+
+        :param university_id: ID университета.
+        :param direction_code: Код направления подготовки.
+        :return: Отпечатки по видам приёма.
+        """
+        async with get_session() as session:
+            models = await session.scalars(
+                select(FingerprintsModel).where(
+                    FingerprintsModel.university_id == university_id,
+                    FingerprintsModel.direction_code == direction_code,
+                )
+            )
+            return {
+                model.reception: FingerprintSchema.model_validate(model) for model in models
+            }
+
+    @staticmethod
+    async def stage(  # noqa: PLR0913
+        publish_id: uuid.UUID,
+        university_id: int,
+        direction_code: str,
+        fingerprints: list[FingerprintSchema],
+        seen_receptions: list[str],
+        *,
+        parts: int,
+    ) -> None:
+        """Откладывает отпечатки направления подготовки до записи опубликованных изменений.
+
+        Отпечатки сохраняются в транзакции, которая записывает последнее из `parts`
+        сообщений публикации, а без сообщений сразу. Если запись изменений упадёт,
+        старые отпечатки останутся, и следующий запуск опубликует изменения заново.
+        Отложенные отпечатки прошлых публикаций направления удаляются: изменения
+        новой публикации посчитаны от сохранённых отпечатков и включают их изменения.
+
+        :param publish_id: ID публикации изменений направления подготовки.
+        :param university_id: ID университета.
+        :param direction_code: Код направления подготовки.
+        :param fingerprints: Отпечатки изменившихся конкурсных списков.
+        :param seen_receptions: Виды приёма, списки которых не изменились.
+        :param parts: Количество опубликованных сообщений с изменениями.
+        """
+        async with get_session() as session:
+            await _lock(session, [publish_id])
+            await session.execute(
+                delete(PendingFingerprintsModel).where(
+                    PendingFingerprintsModel.university_id == university_id,
+                    PendingFingerprintsModel.direction_code == direction_code,
+                )
+            )
+            await session.execute(
+                delete(WrittenPartsModel).where(
+                    WrittenPartsModel.written_at < func.now() - WRITTEN_PARTS_TTL
+                )
+            )
+            await session.execute(
+                insert(PendingFingerprintsModel).values(
+                    publish_id=publish_id,
+                    university_id=university_id,
+                    direction_code=direction_code,
+                    fingerprints=[
+                        fingerprint.model_dump(mode="json") for fingerprint in fingerprints
+                    ],
+                    seen_receptions=seen_receptions,
+                    parts=parts,
+                )
+            )
+            await _promote(session, [publish_id])
+            await session.commit()
+
+    @staticmethod
+    async def confirm(session: AsyncSession, parts: Sequence[PublishPartSchema]) -> None:
+        """Отмечает записанные сообщения с изменениями в транзакции их записи
+        и сохраняет отпечатки публикаций, все сообщения которых записаны.
+
+        Повторно доставленное сообщение отмечается один раз.
+
+        :param session: Сессия транзакции, записывающей изменения.
+        :param parts: Записанные сообщения.
+        """
+        if not parts:
+            return
+        publish_ids = {part.publish_id for part in parts}
+        await _lock(session, publish_ids)
+        await session.execute(
+            upsert(WrittenPartsModel)
+            .values([part.model_dump() for part in parts])
+            .on_conflict_do_nothing(constraint="written_part_pk")
+        )
+        await _promote(session, publish_ids)
+
+    @staticmethod
+    async def staleness(university_id: int) -> dict[str, float]:
+        """Оценивает, сколько изменений конкурсных списков пропущено по каждому
+        направлению подготовки университета с последнего скачивания.
+
+        :param university_id: ID университета.
+        :return: Ожидаемое количество изменений по кодам направлений подготовки.
+        """
+        async with get_session() as session:
+            rows = await session.execute(
+                select(FingerprintsModel.direction_code, func.sum(expected_changes()))
+                .where(FingerprintsModel.university_id == university_id)
+                .group_by(FingerprintsModel.direction_code)
+            )
+            return {direction_code: float(staleness) for direction_code, staleness in rows}
@@ -0,0 +1,274 @@
+from collections.abc import Iterable
+from datetime import timedelta
+
+from sqlalchemy import ColumnElement, and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as upsert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import CrawlKind, CrawlState, DeadLetterSchema
+from ..settings import settings
+from .models import FrontierModel
+from .session import get_session
+
+
+class CrawlFrontier:
+    """Очередь задач обхода, хранящаяся в Postgres.
+
+    Задачи университетов и направлений подготовки переходят из состояния `pending`
+    в `in_flight` при взятии в работу и затем в `done` или `failed`. Задачи берутся
+    атомарно через `FOR UPDATE SKIP LOCKED`, поэтому после падения процесса обход
+    продолжается с того места, где остановился.
+
+    :param max_attempts: Сколько раз задача может быть взята в работу.
+    :param lease_timeout: Через сколько секунд задача в работе считается брошенной.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = settings.parser_settings.max_attempts,
+        lease_timeout: int = settings.parser_settings.lease_timeout,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.lease_timeout = timedelta(seconds=lease_timeout)
+
+    @property
+    def _claimable(self) -> ColumnElement[bool]:
+        return or_(
+            FrontierModel.state == CrawlState.PENDING,
+            and_(
+                FrontierModel.state == CrawlState.IN_FLIGHT,
+                FrontierModel.updated_at < func.now() - self.lease_timeout,
+            ),
+            and_(
+                FrontierModel.state == CrawlState.FAILED,
+                FrontierModel.attempts < self.max_attempts,
+            ),
+        )
+
+    async def start(self, university_urls: Iterable[str]) -> bool:
+        """Начинает новый обход или продолжает незаконченный.
+
+        Если в очереди остались незавершённые задачи, обход продолжается: задачи в работе
+        не сбрасываются, так как их могут выполнять живые воркеры, а задачи упавшего
+        процесса берутся заново после истечения их аренды. Иначе очередь очищается
+        и заполняется университетами.
+
+        :param university_urls: URL адреса университетов для нового обхода.
+        :return: True если обход продолжен, False если начат заново.
+        """
+        async with get_session() as session:
+            unfinished = await session.scalar(
+                select(func.count())
+                .select_from(FrontierModel)
+                .where(
+                    or_(
+                        FrontierModel.state.in_([CrawlState.PENDING, CrawlState.IN_FLIGHT]),
+                        and_(
+                            FrontierModel.state == CrawlState.FAILED,
+                            FrontierModel.attempts < self.max_attempts,
+                        ),
+                    )
+                )
+            )
+            if not unfinished:
+                await session.execute(delete(FrontierModel))
+            await self._add(session, CrawlKind.UNIVERSITY, university_urls)
+            await session.commit()
+        return bool(unfinished)
+
+    async def add(
+        self, kind: CrawlKind, urls: Iterable[str], parent_url: str | None = None
+    ) -> None:
+        """Добавляет задачи в очередь, уже добавленные задачи пропускаются.
+
+        :param kind: Вид задач.
+        :param urls: URL адреса задач.
+        :param parent_url: URL адрес родительской задачи.
+        """
+        async with get_session() as session:
+            await self._add(session, kind, urls, parent_url)
+            await session.commit()
+
+    async def pending(
+        self, kind: CrawlKind, parent_url: str | None = None
+    ) -> dict[str, str | None]:
+        """Возвращает задачи, которые можно взять в работу, не беря их.
+
+        Так задачи публикуются в очередь брокера, а берёт их воркер, который их выполняет,
+        поэтому задача, долго ждущая в очереди брокера, не считается брошенной.
+
+        :param kind: Вид задач.
+        :param parent_url: URL адрес родительской задачи, чтобы вернуть только её подзадачи.
+        :return: URL адреса задач в порядке добавления и URL адреса их родительских задач.
+        """
+        filters = [FrontierModel.kind == kind, self._claimable]
+        if parent_url is not None:
+            filters.append(FrontierModel.parent_url == parent_url)
+        async with get_session() as session:
+            rows = await session.execute(
+                select(FrontierModel.url, FrontierModel.parent_url)
+                .where(*filters)
+                .order_by(FrontierModel.id)
+            )
+            return dict(rows.tuples().all())
+
+    async def claim(
+        self,
+        kind: CrawlKind,
+        parent_url: str | None = None,
+        limit: int | None = 1,
+        url: str | None = None,
+    ) -> list[str]:
+        """Атомарно берёт задачи в работу.
+
+        :param kind: Вид задач.
+        :param parent_url: URL адрес родительской задачи, чтобы брать только её подзадачи.
+        :param limit: Максимальное количество задач, None чтобы взять все доступные.
+        :param url: URL адрес задачи, чтобы взять только её.
+        :return: URL адреса взятых задач в порядке добавления, пустой список если задача
+        уже в работе у другого воркера или выполнена.
+        """
+        filters = [FrontierModel.kind == kind, self._claimable]
+        if parent_url is not None:
+            filters.append(FrontierModel.parent_url == parent_url)
+        if url is not None:
+            filters.append(FrontierModel.url == url)
+        ids = (
+            select(FrontierModel.id)
+            .where(*filters)
+            .order_by(FrontierModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with get_session() as session:
+            rows = await session.execute(
+                update(FrontierModel)
+                .where(FrontierModel.id.in_(ids.scalar_subquery()))
+                .values(
+                    state=CrawlState.IN_FLIGHT,
+                    attempts=FrontierModel.attempts + 1,
+                    updated_at=func.now(),
+                )
+                .returning(FrontierModel.id, FrontierModel.url)
+            )
+            claimed = sorted(rows.all())
+            await session.commit()
+        return [url for _, url in claimed]
+
+    @staticmethod
+    async def state(kind: CrawlKind, url: str) -> CrawlState | None:
+        """Возвращает состояние задачи.
+
+        :param kind: Вид задачи.
+        :param url: URL адрес задачи.
+        :return: Состояние задачи, None если задачи нет в очереди обхода.
+        """
+        async with get_session() as session:
+            return await session.scalar(
+                select(FrontierModel.state).where(
+                    FrontierModel.kind == kind, FrontierModel.url == url
+                )
+            )
+
+    async def complete(self, kind: CrawlKind, url: str) -> None:
+        """Отмечает задачу выполненной.
+
+        :param kind: Вид задачи.
+        :param url: URL адрес задачи.
+        """
+        await self._finish(kind, url, CrawlState.DONE, None)
+
+    async def fail(self, kind: CrawlKind, url: str, error: BaseException) -> bool:
+        """Отмечает задачу проваленной, она будет взята повторно, пока есть попытки.
+
+        :param kind: Вид задачи.
+        :param url: URL адрес задачи.
+        :param error: Исключение, из-за которого задача провалилась.
+        :return: True если попытки закончились и задача больше не будет взята.
+        """
+        attempts = await self._finish(kind, url, CrawlState.FAILED, repr(error))
+        return attempts is None or attempts >= self.max_attempts
+
+    async def retry(self, letters: Iterable[DeadLetterSchema]) -> None:
+        """Возвращает в очередь задачи, провалившиеся после всех попыток.
+
+        Вместе с направлениями подготовки в очередь возвращаются их университеты,
+        потому что направления берутся в работу при обходе университета.
+
+        :param letters: Задачи из очереди недоставленных задач.
+        """
+        async with get_session() as session:
+            parent_urls: set[str] = set()
+            for letter in letters:
+                parent_url = await session.scalar(
+                    self._reset(letter.kind, letter.url, letter.parent_url).returning(
+                        FrontierModel.parent_url
+                    )
+                )
+                if parent_url is not None:
+                    parent_urls.add(parent_url)
+            for parent_url in parent_urls:
+                await session.execute(self._reset(CrawlKind.UNIVERSITY, parent_url))
+            await session.commit()
+
+    @staticmethod
+    def _reset(kind: CrawlKind, url: str, parent_url: str | None = None) -> Insert:
+        row = {
+            "kind": kind,
+            "url": url,
+            "parent_url": parent_url,
+            "state": CrawlState.PENDING,
+            "attempts": 0,
+        }
+        return (
+            upsert(FrontierModel)
+            .values(row)
+            .on_conflict_do_update(
+                constraint="frontier_url_uniq",
+                set_={
+                    "state": CrawlState.PENDING,
+                    "attempts": 0,
+                    "error": None,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    @staticmethod
+    async def _finish(
+        kind: CrawlKind, url: str, state: CrawlState, error: str | None
+    ) -> int | None:
+        async with get_session() as session:
+            attempts = await session.scalar(
+                update(FrontierModel)
+                .where(FrontierModel.kind == kind, FrontierModel.url == url)
+                .values(state=state, error=error, updated_at=func.now())
+                .returning(FrontierModel.attempts)
+            )
+            await session.commit()
+        return attempts
+
+    @staticmethod
+    async def _add(
+        session: AsyncSession,
+        kind: CrawlKind,
+        urls: Iterable[str],
+        parent_url: str | None = None,
+    ) -> None:
+        rows = [
+            {
+                "kind": kind,
+                "url": url,
+                "parent_url": parent_url,
+                "state": CrawlState.PENDING,
+                "attempts": 0,
+            }
+            for url in urls
+        ]
+        if rows:
+            await session.execute(
+                upsert(FrontierModel)
+                .values(rows)
+                .on_conflict_do_nothing(constraint="frontier_url_uniq")
+            )
@@ -1,16 +1,27 @@
-from sqlalchemy import PrimaryKeyConstraint
-from sqlalchemy.orm import Mapped
+import uuid
+
+from sqlalchemy import Index, PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
 
 from .database_configs import (
     Base,
     bool_null,
+    created_at,
+    datetime_now,
+    datetime_null_true,
     float_null,
+    float_zero,
     int_null,
+    int_null_true,
     int_pk,
+    json_dict,
+    json_list,
     list_int,
     str_null,
     str_null_true,
     text_null_true,
+    uuid_pk,
 )
 
 
@@ -63,3 +74,88 @@ class ApplicantsModel(Base):
     __table_args__ = (
         PrimaryKeyConstraint("university_id", "id", "direction_code", name="applicant_pk"),
     )
+
+
+class FingerprintsModel(Base):
+    """Отпечаток конкурсного списка для инкрементального парсинга"""
+
+    __tablename__ = "fingerprints"
+
+    university_id: Mapped[int_null]  # ID университета
+    direction_code: Mapped[str_null]  # Код направления подготовки
+    reception: Mapped[str_null]  # Вид приёма и число мест
+    content_hash: Mapped[str_null]  # Хэш CSV файла
+    row_count: Mapped[int_null]  # Количество абитуриентов в списке
+    row_hashes: Mapped[json_dict]  # Хэши строк списка по ID абитуриентов
+    last_seen: Mapped[created_at]  # Когда список скачивался последний раз
+    change_count: Mapped[float_zero]  # Затухающее количество замеченных изменений
+    observed_hours: Mapped[float_zero]  # Затухающее время наблюдения за списком в часах
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "university_id", "direction_code", "reception", name="fingerprint_pk"
+        ),
+    )
+
+
+class PendingFingerprintsModel(Base):
+    """Отпечатки направления подготовки, ждущие записи опубликованных изменений"""
+
+    __tablename__ = "pending_fingerprints"
+
+    publish_id: Mapped[uuid_pk]  # ID публикации изменений направления подготовки
+    university_id: Mapped[int_null]  # ID университета
+    direction_code: Mapped[str_null]  # Код направления подготовки
+    fingerprints: Mapped[json_list]  # Отпечатки изменившихся конкурсных списков
+    seen_receptions: Mapped[json_list]  # Виды приёма, списки которых не изменились
+    parts: Mapped[int_null]  # Количество опубликованных сообщений с изменениями
+    created_at: Mapped[created_at]  # Когда публикация закончилась
+
+
+class WrittenPartsModel(Base):
+    """Сообщение с изменениями конкурсных списков, записанное в базу данных"""
+
+    __tablename__ = "written_parts"
+
+    publish_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))  # ID публикации
+    part: Mapped[int_null]  # Номер сообщения в публикации
+    written_at: Mapped[created_at]  # Когда сообщение записано
+
+    __table_args__ = (PrimaryKeyConstraint("publish_id", "part", name="written_part_pk"),)
+
+
+class FrontierModel(Base):
+    """Задача обхода: университет или направление подготовки"""
+
+    __tablename__ = "frontier"
+
+    id: Mapped[int_pk]  # Порядковый номер задачи
+    kind: Mapped[str_null]  # Вид задачи
+    url: Mapped[str_null]  # URL адрес университета или направления подготовки
+    parent_url: Mapped[str_null_true]  # URL адрес университета направления подготовки
+    state: Mapped[str_null]  # Состояние задачи
+    attempts: Mapped[int_null]  # Количество взятий задачи в работу
+    error: Mapped[text_null_true]  # Последняя ошибка
+    updated_at: Mapped[datetime_now]  # Время последнего изменения состояния
+
+    __table_args__ = (
+        UniqueConstraint("kind", "url", name="frontier_url_uniq"),
+        Index("frontier_state_idx", "kind", "state", "id"),
+    )
+
+
+class UniversityIndexModel(Base):
+    """Университет в индексе обнаруженных на Госуслугах университетов"""
+
+    __tablename__ = "university_index"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)  # ID с Госуслуг
+    url: Mapped[str_null]  # URL университета
+    is_alive: Mapped[bool_null]  # Открывается ли страница университета
+    direction_count: Mapped[int_null_true]  # Количество направлений подготовки
+    discovered_at: Mapped[created_at]  # Когда университет был найден
+    checked_at: Mapped[datetime_now]  # Когда университет проверялся последний раз
+    changed_at: Mapped[datetime_null_true]  # Когда изменилось количество направлений
+    parsed_at: Mapped[datetime_null_true]  # Когда университет успешно парсился
+
+    __table_args__ = (Index("university_index_staleness_idx", "is_alive", "parsed_at"),)
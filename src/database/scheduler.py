@@ -0,0 +1,90 @@
+from sqlalchemy import func, select
+
+from ..settings import settings
+from .fingerprints import PRIOR_CHANGES, PRIOR_HOURS, SECONDS_PER_HOUR, expected_changes
+from .models import FingerprintsModel, UniversityIndexModel
+from .session import get_session
+
+# Оценка загрузок страниц для университета, который ещё ни разу не парсился
+UNKNOWN_UNIVERSITY_PAGE_LOADS = 50
+
+
+class RefreshScheduler:
+    """Планировщик повторных обходов по частоте изменений конкурсных списков.
+
+    Университеты из индекса упорядочиваются по ожидаемому количеству изменений
+    их конкурсных списков с последнего скачивания: списки, которые меняются каждый
+    час, обходятся раньше списков, меняющихся раз в неделю. Ещё не распарсенные
+    университеты идут первыми, а распарсенные без отпечатков, например без конкурсных
+    списков, оцениваются как один список с априорной частотой изменений. В план
+    попадает столько университетов, сколько помещается в бюджет загрузок страниц на час.
+
+    :param page_loads_per_hour: Бюджет загрузок страниц на час обхода,
+    0 чтобы планировать все университеты.
+    """
+
+    def __init__(
+        self, page_loads_per_hour: int = settings.scheduler_settings.page_loads_per_hour
+    ) -> None:
+        self.page_loads_per_hour = page_loads_per_hour
+
+    async def plan(self, start: int, end: int) -> list[str]:
+        """Планирует университеты для следующего часа обхода.
+
+        :param start: Начало диапазона ID включительно.
+        :param end: Конец диапазона ID включительно.
+        :return: URL адреса живых университетов по убыванию ожидаемых изменений,
+        пустой список если индекс ещё не заполнен.
+        """
+        lists = (
+            select(
+                FingerprintsModel.university_id,
+                func.sum(expected_changes()).label("staleness"),
+                func.count().label("list_count"),
+            )
+            .group_by(FingerprintsModel.university_id)
+            .subquery()
+        )
+        # Распарсенный университет без отпечатков оценивается как один список с априорной
+        # частотой изменений, иначе он без оценки шёл бы первым в каждом плане
+        hours_since_parsed = (
+            func.extract("epoch", func.now() - UniversityIndexModel.parsed_at) / SECONDS_PER_HOUR
+        )
+        staleness = func.coalesce(
+            lists.c.staleness, PRIOR_CHANGES / PRIOR_HOURS * hours_since_parsed
+        )
+        async with get_session() as session:
+            rows = await session.execute(
+                select(
+                    UniversityIndexModel.url,
+                    UniversityIndexModel.direction_count,
+                    lists.c.list_count,
+                )
+                .outerjoin(lists, lists.c.university_id == UniversityIndexModel.id)
+                .where(UniversityIndexModel.is_alive, UniversityIndexModel.id.between(start, end))
+                .order_by(
+                    UniversityIndexModel.parsed_at.is_not(None),
+                    staleness.desc(),
+                    UniversityIndexModel.parsed_at,
+                    UniversityIndexModel.id,
+                )
+            )
+            rows = rows.all()
+        university_urls: list[str] = []
+        page_loads = 0
+        for url, direction_count, list_count in rows:
+            # Страница университета, страницы направлений и страницы конкурсных списков
+            cost = (
+                UNKNOWN_UNIVERSITY_PAGE_LOADS
+                if direction_count is None
+                else 1 + direction_count + (list_count or 0)
+            )
+            if (
+                self.page_loads_per_hour
+                and university_urls
+                and (page_loads + cost > self.page_loads_per_hour)
+            ):
+                break
+            university_urls.append(url)
+            page_loads += cost
+        return university_urls
@@ -1,14 +1,26 @@
-from collections.abc import AsyncIterator
+from typing import Any
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from contextlib import asynccontextmanager
+from itertools import batched
 
-from sqlalchemy import insert
+from pydantic import BaseModel
+from sqlalchemy import delete, or_, tuple_
 from sqlalchemy.dialects.postgresql import insert as upsert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from ..core import ApplicantSchema, DirectionSchema, UniversitySchema
+from ..core import ApplicantKeySchema, ApplicantSchema, DirectionSchema, UniversitySchema
+from ..metrics import DB_WRITE_DURATION
 from ..settings import settings
+from .database_configs import Base
 from .models import ApplicantsModel, DirectionsModel, UniversitiesModel
 
+# Максимальное количество параметров в одном запросе к Postgres
+MAX_BIND_PARAMS = 32767
+
+# Запись в той же транзакции перед коммитом
+BeforeCommit = Callable[[AsyncSession], Awaitable[None]]
+
 engine = create_async_engine(url=settings.sql_settings.get_db_url, echo=True)
 session_maker = async_sessionmaker(
     engine,
@@ -24,33 +36,115 @@ async def get_session() -> AsyncIterator[AsyncSession]:
         yield session
 
 
-async def add_universities(schema: UniversitySchema) -> None:
-    async with get_session() as session:
-        stmt = insert(UniversitiesModel).values(**schema.model_dump())
-        await session.execute(stmt)
-        await session.commit()
+def _deduplicate(
+    model: type[Base], schemas: Sequence[BaseModel | dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Убирает повторы строк по первичному ключу, оставляя последнюю запись.
 
+    Один запрос ON CONFLICT не может обновить одну и ту же строку дважды,
+    а, например, абитуриент может встретиться в нескольких конкурсных списках направления.
+    """
+    primary_key = [column.name for column in model.__table__.primary_key.columns]
+    rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for schema in schemas:
+        row = schema if isinstance(schema, dict) else schema.model_dump()
+        rows[tuple(row[name] for name in primary_key)] = row
+    return list(rows.values())
 
-async def add_directions(schema: DirectionSchema) -> None:
-    async with get_session() as session:
-        stmt = insert(DirectionsModel).values(**schema.model_dump())
-        await session.execute(stmt)
-        await session.commit()
 
+async def upsert_changed(
+    model: type[Base],
+    schemas: Sequence[BaseModel | dict[str, Any]],
+    chunk_size: int = settings.sql_settings.postgres_upsert_chunk_size,
+    before_commit: BeforeCommit | None = None,
+) -> None:
+    """Сохраняет строки многострочными upsert запросами в одной транзакции.
 
-async def add_all_applicants(applicants: list[ApplicantSchema]) -> None:
-    async with get_session() as session:
-        for applicant in applicants:
-            stmt = (
-                upsert(ApplicantsModel)
-                .values(**applicant.model_dump())
-                .on_conflict_do_update(
-                    constraint="applicant_pk",
-                    set_=applicant.model_dump()
+    Существующая строка обновляется только если её содержимое изменилось,
+    поэтому повторный парсинг не переписывает неизменившиеся строки.
+
+    :param model: Модель таблицы.
+    :param schemas: Строки для сохранения, схемы или уже готовые словари колонок.
+    :param chunk_size: Количество строк в одном запросе.
+    :param before_commit: Запись, которая должна закоммититься вместе со строками.
+    """
+    table = model.__table__
+    primary_key = list(table.primary_key.columns)
+    updatable = [column for column in table.columns if column not in primary_key]
+    chunk_size = max(1, min(chunk_size, MAX_BIND_PARAMS // len(table.columns)))
+    with DB_WRITE_DURATION.labels(table.name, "upsert").time():
+        async with get_session() as session:
+            for chunk in batched(_deduplicate(model, schemas), chunk_size, strict=False):
+                stmt = upsert(model).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=primary_key,
+                    set_={column.name: stmt.excluded[column.name] for column in updatable},
+                    where=or_(*(
+                        column.is_distinct_from(stmt.excluded[column.name])
+                        for column in updatable
+                    )),
+                )
+                await session.execute(stmt)
+            if before_commit is not None:
+                await before_commit(session)
+            await session.commit()
+
+
+async def add_universities(schemas: list[UniversitySchema]) -> None:
+    """Сохраняет университеты, обновляя только изменившиеся.
+
+    :param schemas: Университеты.
+    """
+    await upsert_changed(UniversitiesModel, schemas)
+
+
+async def add_directions(schemas: list[DirectionSchema]) -> None:
+    """Сохраняет направления подготовки, обновляя только изменившиеся.
+
+    :param schemas: Направления подготовки.
+    """
+    await upsert_changed(DirectionsModel, schemas)
+
+
+async def add_all_applicants(
+    applicants: Sequence[ApplicantSchema | dict[str, Any]],
+    chunk_size: int = settings.sql_settings.postgres_upsert_chunk_size,
+    before_commit: BeforeCommit | None = None,
+) -> None:
+    """Сохраняет абитуриентов многострочными upsert запросами, по одному на пачку.
+
+    :param applicants: Абитуриенты из конкурсных списков или строки таблицы абитуриентов.
+    :param chunk_size: Количество абитуриентов в одном запросе.
+    :param before_commit: Запись, которая должна закоммититься вместе с абитуриентами.
+    """
+    await upsert_changed(ApplicantsModel, applicants, chunk_size, before_commit)
+
+
+async def delete_applicants(
+    keys: list[ApplicantKeySchema],
+    chunk_size: int = settings.sql_settings.postgres_upsert_chunk_size,
+    before_commit: BeforeCommit | None = None,
+) -> None:
+    """Удаляет абитуриентов, пропавших из конкурсных списков.
+
+    :param keys: Первичные ключи абитуриентов.
+    :param chunk_size: Количество абитуриентов в одном запросе.
+    :param before_commit: Запись, которая должна закоммититься вместе с удалением.
+    """
+    columns = (ApplicantsModel.university_id, ApplicantsModel.direction_code, ApplicantsModel.id)
+    with DB_WRITE_DURATION.labels(ApplicantsModel.__tablename__, "delete").time():
+        async with get_session() as session:
+            for chunk in batched(keys, chunk_size, strict=False):
+                await session.execute(
+                    delete(ApplicantsModel).where(
+                        tuple_(*columns).in_([
+                            (key.university_id, key.direction_code, key.id) for key in chunk
+                        ])
+                    )
                 )
-            )
-            await session.execute(stmt)
-        await session.commit()
+            if before_commit is not None:
+                await before_commit(session)
+            await session.commit()
 
 
 """async def add_all_applicants(data: list[ApplicantSchema]) -> None:
@@ -0,0 +1,106 @@
+from collections.abc import Iterable
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert as upsert
+
+from ..gosuslugi.helpers import extract_university_id
+from .models import UniversityIndexModel
+from .session import get_session
+
+
+class UniversityIndex:
+    """Индекс университетов, которые действительно есть на Госуслугах.
+
+    Индекс заполняется этапом обнаружения по списку университетов с Госуслуг
+    и результатами обхода: успешно распарсенный университет отмечается живым
+    вместе с количеством направлений подготовки, а университет, страницы которого
+    по ответу Госуслуг не существует, отмечается мёртвым и больше не обходится.
+    """
+
+    @staticmethod
+    async def discover(university_urls: Iterable[str]) -> int:
+        """Сохраняет университеты, найденные этапом обнаружения.
+
+        Найденные университеты отмечаются живыми. Пропавшие из списка университеты
+        не трогаются: неполный список, например обрезанный при прокрутке, не значит,
+        что университета нет, поэтому мёртвым университет отмечает только ответ
+        Госуслуг о том, что его страницы не существует.
+
+        :param university_urls: URL адреса найденных университетов.
+        :return: Количество найденных университетов.
+        """
+        rows = {
+            int(extract_university_id(url)): {"id": int(extract_university_id(url)), "url": url}
+            for url in university_urls
+        }
+        if not rows:
+            return 0
+        stmt = upsert(UniversityIndexModel).values([
+            {**row, "is_alive": True} for row in rows.values()
+        ])
+        async with get_session() as session:
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[UniversityIndexModel.id],
+                    set_={"url": stmt.excluded.url, "is_alive": True, "checked_at": func.now()},
+                )
+            )
+            await session.commit()
+        return len(rows)
+
+    @staticmethod
+    async def record(university_url: str, direction_count: int) -> None:
+        """Отмечает университет успешно распарсенным.
+
+        :param university_url: URL адрес университета.
+        :param direction_count: Количество найденных направлений подготовки.
+        """
+        stmt = upsert(UniversityIndexModel).values(
+            id=int(extract_university_id(university_url)),
+            url=university_url,
+            is_alive=True,
+            direction_count=direction_count,
+            changed_at=func.now(),
+            parsed_at=func.now(),
+        )
+        async with get_session() as session:
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[UniversityIndexModel.id],
+                    set_={
+                        "is_alive": True,
+                        "direction_count": direction_count,
+                        "checked_at": func.now(),
+                        "parsed_at": func.now(),
+                        # Время изменения двигается только при изменении направлений
+                        "changed_at": case(
+                            (
+                                UniversityIndexModel.direction_count.is_distinct_from(
+                                    direction_count
+                                ),
+                                func.now(),
+                            ),
+                            else_=UniversityIndexModel.changed_at,
+                        ),
+                    },
+                )
+            )
+            await session.commit()
+
+    @staticmethod
+    async def mark_dead(university_url: str) -> None:
+        """Отмечает университет, которого по ответу Госуслуг не существует.
+
+        :param university_url: URL адрес университета.
+        """
+        stmt = upsert(UniversityIndexModel).values(
+            id=int(extract_university_id(university_url)), url=university_url, is_alive=False
+        )
+        async with get_session() as session:
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[UniversityIndexModel.id],
+                    set_={"is_alive": False, "checked_at": func.now()},
+                )
+            )
+            await session.commit()
@@ -0,0 +1,34 @@
+import logging
+
+from playwright.async_api import async_playwright
+
+from .browser.pool import PagePool
+from .browser.profile import ScrapeProfile
+from .database import UniversityIndex
+from .gosuslugi.utils import search_university_urls
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def discover_universities() -> int:
+    """Этап обнаружения: находит все университеты в общем списке Госуслуг
+    и сохраняет их в индекс университетов.
+
+    Следующие обходы берут университеты из индекса, поэтому не тратят время
+    на страницы несуществующих ID.
+
+    :return: Количество найденных университетов.
+    """
+    async with async_playwright() as playwright:
+        profile = ScrapeProfile.from_settings(settings.browser_settings)
+        browser = await playwright.chromium.launch(**profile.launch_options)
+        async with (
+            PagePool(browser, max_size=1, warm_size=1, profile=profile) as pool,
+            pool.lease() as page,
+        ):
+            # Пустой запрос показывает все университеты
+            university_urls = await search_university_urls(page, "")
+    count = await UniversityIndex.discover(university_urls)
+    logger.info("Discovered %s universities", count)
+    return count
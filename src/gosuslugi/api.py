@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page as AsyncPage
+    from playwright.async_api import Response as AsyncResponse
+
+import asyncio
+import logging
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import httpx
+from pydantic import ValidationError
+
+from ..core.enums import Source
+from ..core.exceptions import TooManyRequestsError
+from ..core.schemas import DirectionSchema, UniversitySchema
+from .constants import HTTP_MAX_CONNECTIONS, HTTP_TIMEOUT, ZERO_VALUE
+from .fetchers import EndpointTemplate, raise_for_status
+from .helpers import extract_direction_code, extract_university_id
+from .limiter import AdaptiveRateLimiter, gosuslugi_limiter
+from .validators import DirectionValidator
+
+logger = logging.getLogger(__name__)
+
+# Путь до значения в JSON ответе, `*` обозначает любой элемент списка
+type JsonPath = tuple[str | int, ...]
+WILDCARD = "*"
+# Типы запросов, которыми SPA Госуслуг получает данные
+API_RESOURCE_TYPES: frozenset[str] = frozenset({"xhr", "fetch"})
+# Максимальное количество страниц списка направлений подготовки одного вуза
+MAX_LIST_PAGES = 100
+# Поля направления подготовки, которые ищутся в JSON ответе
+DIRECTION_FIELDS: tuple[str, ...] = (
+    "title",
+    "education_form",
+    "institute",
+    "budget_places",
+    "total_places",
+    "education_price",
+)
+
+
+def _is_equal(leaf: Any, value: Any) -> bool:
+    """Сравнивает значение из JSON со значением, распарсенным со страницы."""
+    if leaf is None or isinstance(leaf, (bool, dict, list)):
+        return False
+    if isinstance(value, (int, float)) and isinstance(leaf, (int, float)):
+        return leaf == value
+    return str(leaf).strip() == str(value)
+
+
+def iter_leaves(payload: Any, path: JsonPath = ()) -> Any:
+    """Обходит все скалярные значения JSON ответа вместе с путями до них."""
+    if isinstance(payload, dict):
+        for key, value in payload.items():
+            yield from iter_leaves(value, (*path, key))
+    elif isinstance(payload, list):
+        for index, value in enumerate(payload):
+            yield from iter_leaves(value, (*path, index))
+    else:
+        yield path, payload
+
+
+def find_path(payload: Any, value: Any) -> JsonPath | None:
+    """Находит путь до первого значения в JSON ответе, равного искомому.
+
+    :param payload: JSON ответ.
+    :param value: Значение, распарсенное со страницы.
+    :return: Путь до значения или None, если значение не найдено.
+    """
+    return next((path for path, leaf in iter_leaves(payload) if _is_equal(leaf, value)), None)
+
+
+def find_list_path(payload: Any, values: list[str]) -> tuple[JsonPath | None, int]:
+    """Находит общий путь до списка значений в JSON ответе, индексы списков
+    в пути заменяются на `*`.
+
+    :param payload: JSON ответ.
+    :param values: Значения, распарсенные со страницы.
+    :return: Путь, по которому найдено больше всего значений, и количество этих значений.
+    """
+    values_set = set(values)
+    paths2values: dict[JsonPath, set[str]] = {}
+    for path, leaf in iter_leaves(payload):
+        if isinstance(leaf, str) and leaf.strip() in values_set:
+            list_path = tuple(WILDCARD if isinstance(key, int) else key for key in path)
+            paths2values.setdefault(list_path, set()).add(leaf.strip())
+    if not paths2values:
+        return None, 0
+    path, found = max(paths2values.items(), key=lambda item: len(item[1]))
+    return path, len(found)
+
+
+def extract(payload: Any, path: JsonPath) -> Any:
+    """Достаёт значение из JSON ответа по пути, путь с `*` возвращает список значений.
+
+    :param payload: JSON ответ.
+    :param path: Путь до значения.
+    :return: Значение или None, если пути нет в ответе.
+    """
+    for i, key in enumerate(path):
+        if key == WILDCARD:
+            if not isinstance(payload, list):
+                return None
+            items = (extract(item, path[i + 1 :]) for item in payload)
+            return [item for item in items if item is not None]
+        try:
+            payload = payload[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return payload
+
+
+def _to_text(value: Any) -> str | None:
+    """Приводит значение из JSON к тексту, как если бы оно было распарсено со страницы."""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+class ApiCapture:
+    """Запись JSON ответов, которые SPA Госуслуг получает во время работы со страницей.
+
+    :param page: Асинхронная Playwright страница.
+    :param enabled: Записывать ли ответы, выключенная запись ничего не делает.
+    """
+
+    def __init__(self, page: AsyncPage, enabled: bool = True) -> None:
+        self.page = page
+        self.enabled = enabled
+        self.responses: list[tuple[str, Any]] = []
+        self._tasks: list[asyncio.Task[Any]] = []
+
+    def _on_response(self, response: AsyncResponse) -> None:
+        if response.request.resource_type not in API_RESOURCE_TYPES:
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        self._tasks.append(asyncio.create_task(self._read(response)))
+
+    @staticmethod
+    async def _read(response: AsyncResponse) -> tuple[str, Any]:
+        return response.url, await response.json()
+
+    async def __aenter__(self) -> Self:
+        if self.enabled:
+            self.page.on("response", self._on_response)
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        if not self.enabled:
+            return
+        self.page.remove_listener("response", self._on_response)
+        results = await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Тело ответа может быть недоступно, если страница ушла с адреса раньше
+        self.responses = [result for result in results if not isinstance(result, BaseException)]
+
+
+class JsonEndpoint:
+    """Эндпоинт JSON API с путями до полей в его ответе.
+
+    :param page_url: URL адрес страницы, на которой был записан ответ.
+    :param response_url: URL адрес JSON ответа.
+    :param fields: Пути до полей в JSON ответе, None если поле на странице было пустым.
+    """
+
+    def __init__(
+        self, page_url: str, response_url: str, fields: dict[str, JsonPath | None]
+    ) -> None:
+        self.page_url = page_url
+        self.template = EndpointTemplate(page_url, response_url)
+        self.fields = fields
+
+    @property
+    def key(self) -> tuple[Any, ...]:
+        """Форма эндпоинта без конкретных значений, одинаковая для всех страниц."""
+        return (
+            tuple(self.template.path),
+            tuple(self.template.query),
+            tuple(self.fields.items()),
+        )
+
+    def resolve(self, page_url: str) -> str | None:
+        """URL адрес JSON ответа для другой страницы того же вида."""
+        return self.template.resolve(page_url)
+
+    def extract(self, payload: Any) -> dict[str, Any]:
+        """Достаёт все поля из JSON ответа."""
+        return {
+            name: None if path is None else extract(payload, path)
+            for name, path in self.fields.items()
+        }
+
+    @classmethod
+    def learn(
+        cls, page_url: str, responses: list[tuple[str, Any]], values: dict[str, Any]
+    ) -> Self | None:
+        """Ищет среди записанных ответов тот, в котором есть все непустые значения,
+        распарсенные со страницы.
+
+        :param page_url: URL адрес страницы.
+        :param responses: Записанные JSON ответы.
+        :param values: Значения полей, распарсенные со страницы.
+        :return: Эндпоинт или None, если подходящего ответа нет.
+        """
+        for response_url, payload in responses:
+            fields = {
+                name: None if value is None else find_path(payload, value)
+                for name, value in values.items()
+            }
+            if any(fields[name] is None for name, value in values.items() if value is not None):
+                continue
+            endpoint = cls(page_url, response_url, fields)
+            if endpoint.template.is_resolvable:
+                return endpoint
+        return None
+
+
+class JsonListEndpoint:
+    """Постраничный эндпоинт JSON API со списком значений в ответе.
+
+    :param page_url: URL адрес страницы, на которой были записаны ответы.
+    :param response_urls: URL адреса JSON ответов со страницами списка по порядку.
+    :param path: Путь до значений списка в JSON ответе.
+    """
+
+    def __init__(self, page_url: str, response_urls: list[str], path: JsonPath) -> None:
+        self.page_url = page_url
+        self.template = EndpointTemplate(page_url, response_urls[0])
+        self.path = path
+        self.page_param, self.page_start, self.page_step = self._find_pagination(response_urls)
+
+    @staticmethod
+    def _find_pagination(response_urls: list[str]) -> tuple[str | None, int, int]:
+        """Находит query параметр с номером страницы или смещением по первым двум ответам."""
+        if len(response_urls) < 2:  # noqa: PLR2004
+            return None, 0, 0
+        first, second = (dict(parse_qsl(urlparse(url).query)) for url in response_urls[:2])
+        for name, value in first.items():
+            next_value = second.get(name, "")
+            if value.isdigit() and next_value.isdigit() and int(next_value) > int(value):
+                return name, int(value), int(next_value) - int(value)
+        return None, 0, 0
+
+    @property
+    def key(self) -> tuple[Any, ...]:
+        """Форма эндпоинта без конкретных значений, одинаковая для всех страниц."""
+        return (
+            tuple(self.template.path),
+            tuple(self.template.query),
+            self.path,
+            self.page_param,
+            self.page_step,
+        )
+
+    def resolve(self, page_url: str, page_number: int) -> str | None:
+        """URL адрес JSON ответа со страницей списка для другой страницы того же вида.
+
+        :param page_url: URL адрес страницы.
+        :param page_number: Номер страницы списка, начиная с нуля.
+        :return: URL адрес или None, если адрес страницы имеет другую структуру.
+        """
+        url = self.template.resolve(page_url)
+        if url is None or self.page_param is None:
+            return url
+        parsed_url = urlparse(url)
+        query = dict(parse_qsl(parsed_url.query))
+        query[self.page_param] = str(self.page_start + page_number * self.page_step)
+        return urlunparse(parsed_url._replace(query=urlencode(query)))
+
+    @classmethod
+    def learn(
+        cls, page_url: str, responses: list[tuple[str, Any]], values: list[str]
+    ) -> Self | None:
+        """Ищет среди записанных ответов страницы списка, в которых вместе есть
+        все значения, распарсенные со страницы.
+
+        :param page_url: URL адрес страницы.
+        :param responses: Записанные JSON ответы в порядке получения.
+        :param values: Значения списка, распарсенные со страницы.
+        :return: Эндпоинт или None, если подходящих ответов нет.
+        """
+        if not values:
+            return None
+        paths2urls: dict[JsonPath, list[str]] = {}
+        paths2found: dict[JsonPath, int] = {}
+        for response_url, payload in responses:
+            path, found = find_list_path(payload, values)
+            if path is not None:
+                paths2urls.setdefault(path, []).append(response_url)
+                paths2found[path] = paths2found.get(path, 0) + found
+        for path, response_urls in paths2urls.items():
+            if paths2found[path] < len(values):
+                continue
+            endpoint = cls(page_url, response_urls, path)
+            if endpoint.template.is_resolvable:
+                return endpoint
+        return None
+
+
+class GosuslugiApi:
+    """Парсинг университетов и направлений подготовки через JSON API Госуслуг
+    в обход браузера.
+
+    Эндпоинты API не документированы, поэтому они определяются по ответам, которые
+    SPA получает при парсинге через браузер: ответ, в котором нашлись все значения
+    со страницы, становится кандидатом, а кандидат подтверждается, если на другой
+    странице того же вида нашёлся эндпоинт той же формы. Фильтры списка направлений
+    подготовки запоминаются из записанного запроса. После подтверждения страница
+    парсится несколькими HTTP запросами, а если ответ не удалось получить или
+    провалидировать, узел графа парсит её через браузер.
+
+    :param client: Асинхронный HTTP клиент, по умолчанию создаётся свой.
+    :param limiter: Ограничитель частоты запросов к Госуслугам, общий с браузером.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        limiter: AdaptiveRateLimiter = gosuslugi_limiter,
+    ) -> None:
+        self.limiter = limiter
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS),
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+        )
+        self.university: JsonEndpoint | None = None
+        self.direction_list: JsonListEndpoint | None = None
+        self.direction: JsonEndpoint | None = None
+        self._candidates: dict[str, JsonEndpoint | JsonListEndpoint | None] = {}
+        # URL адрес направления подготовки без ID вуза и код направления в нём
+        self._direction_url: tuple[str, str] | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.client.aclose()
+
+    def _confirm[T: (JsonEndpoint, JsonListEndpoint)](
+        self, name: str, endpoint: T | None
+    ) -> T | None:
+        """Возвращает эндпоинт, если он совпал с кандидатом с другой страницы,
+        иначе запоминает его кандидатом."""
+        candidate = self._candidates.get(name)
+        if (
+            endpoint is not None
+            and candidate is not None
+            and candidate.page_url != endpoint.page_url
+            and candidate.key == endpoint.key
+        ):
+            logger.info("---FOUND %s API ENDPOINT---", name.upper())
+            return endpoint
+        self._candidates[name] = endpoint
+        return None
+
+    def learn_university(
+        self, university_url: str, responses: list[tuple[str, Any]], university: UniversitySchema
+    ) -> None:
+        """Ищет эндпоинт университета по ответам, записанным на его странице."""
+        if self.university is None:
+            endpoint = JsonEndpoint.learn(university_url, responses, {"title": university.title})
+            self.university = self._confirm("university", endpoint)
+
+    def learn_direction_urls(
+        self, university_url: str, responses: list[tuple[str, Any]], direction_urls: list[str]
+    ) -> None:
+        """Ищет эндпоинт списка направлений подготовки по ответам, записанным
+        при фильтрации направлений на странице университета.
+
+        Эндпоинт подтверждается, только когда видно, как листается список: если
+        список вуза поместился на одну страницу, по API у больших вузов прочиталась бы
+        только первая страница. Такой эндпоинт не заменяет кандидата с пагинацией.
+        """
+        if self.direction_list is not None or not direction_urls:
+            return
+        codes = [extract_direction_code(url) for url in direction_urls]
+        endpoint = JsonListEndpoint.learn(university_url, responses, codes)
+        if endpoint is not None and endpoint.page_param is None:
+            logger.info("---DIRECTION LIST API PAGINATION NOT SEEN ON %s---", university_url)
+            return
+        self.direction_list = self._confirm("direction_list", endpoint)
+        if self.direction_list is not None:
+            self._direction_url = (direction_urls[0].rsplit("/", 1)[0], codes[0])
+
+    def learn_direction(
+        self, direction_url: str, responses: list[tuple[str, Any]], direction: DirectionSchema
+    ) -> None:
+        """Ищет эндпоинт направления подготовки по ответам, записанным на его странице."""
+        values = {field: getattr(direction, field) for field in DIRECTION_FIELDS}
+        # Пустые и нулевые поля нельзя надёжно найти в ответе, поэтому эндпоинт
+        # ищется только по полностью заполненным направлениям
+        if self.direction is None and all(values.values()):
+            endpoint = JsonEndpoint.learn(direction_url, responses, values)
+            self.direction = self._confirm("direction", endpoint)
+
+    async def _get_json(self, url: str, referer: str) -> Any | None:
+        try:
+            async with self.limiter.throttle():
+                response = await self.client.get(url, headers={"Referer": referer})
+                raise_for_status(response)
+            return response.json()
+        except (httpx.HTTPError, TooManyRequestsError, ValueError) as e:
+            logger.warning("---FAILED TO FETCH API %s: %s---", url, e)
+            return None
+
+    async def parse_university(self, university_url: str) -> UniversitySchema | None:
+        """Парсит университет через API.
+
+        :param university_url: URL адрес университета на Госуслугах.
+        :return: Pydantic схема университета или None, если нужно парсить через браузер.
+        """
+        url = self.university.resolve(university_url) if self.university else None
+        payload = None if url is None else await self._get_json(url, university_url)
+        if payload is None:
+            return None
+        title = self.university.extract(payload)["title"]
+        if title is None:
+            return None
+        return UniversitySchema(
+            id=extract_university_id(university_url),
+            title=str(title).strip(),
+            source=Source.GOSUSLUGI,
+            url=university_url,
+        )
+
+    async def parse_direction_urls(self, university_url: str) -> list[str] | None:
+        """Получает URL адреса направлений подготовки университета через API,
+        проходя по всем страницам списка.
+
+        :param university_url: URL адрес университета на Госуслугах.
+        :return: URL адреса направлений или None, если нужно парсить через браузер.
+        """
+        if self.direction_list is None or self._direction_url is None:
+            return None
+        direction_prefix, prefix_code = self._direction_url
+        university_id = extract_university_id(university_url)
+        codes: list[str] = []
+        for page_number in range(MAX_LIST_PAGES):
+            url = self.direction_list.resolve(university_url, page_number)
+            payload = None if url is None else await self._get_json(url, university_url)
+            if payload is None:
+                return None
+            page_codes = [
+                code
+                for code in extract(payload, self.direction_list.path) or []
+                if code not in codes
+            ]
+            if not page_codes:
+                break
+            codes.extend(page_codes)
+            if self.direction_list.page_param is None:
+                break
+        return [
+            f"{direction_prefix.replace(prefix_code, str(code).strip())}/{university_id}"
+            for code in codes
+        ]
+
+    async def parse_direction(self, direction_url: str) -> DirectionSchema | None:
+        """Парсит направление подготовки через API.
+
+        :param direction_url: URL адрес направления подготовки.
+        :return: Pydantic схема направления или None, если нужно парсить через браузер.
+        """
+        url = self.direction.resolve(direction_url) if self.direction else None
+        payload = None if url is None else await self._get_json(url, direction_url)
+        if payload is None:
+            return None
+        fields = {
+            field: _to_text(value) for field, value in self.direction.extract(payload).items()
+        }
+        if fields["budget_places"] is None:
+            fields["budget_places"] = ZERO_VALUE
+        try:
+            return DirectionValidator(
+                university_id=extract_university_id(direction_url),
+                code=extract_direction_code(direction_url),
+                **fields,
+            )
+        except ValidationError as e:
+            logger.warning("---INVALID API DIRECTION %s: %s---", url, e)
+            return None
@@ -2,6 +2,12 @@ from typing import Literal
 
 # Задержка по времени в мс
 TIMEOUT = 1000
+# Максимальное время ожидания новых карточек после нажатия `Посмотреть ещё` в мс
+SEE_MORE_TIMEOUT = TIMEOUT * 10
+# Максимальное время ожидания отрисовки раскрытой программы обучения в мс
+DIRECTION_RENDER_TIMEOUT = TIMEOUT * 5
+# Максимальное время ожидания содержимого или технической ошибки после перехода в мс
+PAGE_READY_TIMEOUT = TIMEOUT * 3
 
 # Базовый URL адрес Госуслуг.
 GOSUSLUGI_URL = "https://www.gosuslugi.ru"
@@ -15,10 +21,23 @@ EDUCATION_LEVEL = Literal["Бакалавриат", "Специалитет", "
 
 # Сообщения об технической ошибке на странице
 TECHNICAL_ERROR = "Техническая ошибка"
+# Сообщение о несуществующей странице
+NOT_FOUND = "Страница не найдена"
 
 # Нет баллов за ВИ
 NO_POINTS = "Без вступительных испытаний"
 ZERO_VALUE = 0
+# Пустое значение в конкурсном списке
+NO_VALUE = "—"
 
 # Поступление по БВИ
 WITHOUT_ENTRANCE_EXAMS = "Да"
+
+# Колонка, с которой начинается CSV файл конкурсного списка
+ADMISSION_LIST_HEADER = "ID участника"
+# Максимальное количество HTTP соединений для скачивания конкурсных списков
+HTTP_MAX_CONNECTIONS = 20
+# Таймаут HTTP запросов в секундах
+HTTP_TIMEOUT = 30
+# Размер хэша строки конкурсного списка в байтах
+ROW_HASH_SIZE = 8
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page as AsyncPage
+
+import asyncio
+import logging
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import httpx
+
+from ..core.exceptions import TooManyRequestsError
+from ..metrics import ADMISSION_LIST_BYTES
+from .constants import ADMISSION_LIST_HEADER, HTTP_MAX_CONNECTIONS, HTTP_TIMEOUT
+from .helpers import create_admission_list_buffer
+from .limiter import AdaptiveRateLimiter, gosuslugi_limiter
+
+logger = logging.getLogger(__name__)
+
+PROTOCOLS: tuple[str, str] = ("http", "https")
+
+
+def split_url(url: str) -> list[str]:
+    """Разбивает URL на значимые части: сегменты пути и значения query параметров.
+
+    :param url: URL адрес, например: https://www.gosuslugi.ru/vuznavigator/lists/12?page=1
+    :return: Части URL адреса, например: ['vuznavigator', 'lists', '12', '1']
+    """
+    parsed_url = urlparse(url)
+    segments = [segment for segment in parsed_url.path.split("/") if segment]
+    return segments + [value for _, value in parse_qsl(parsed_url.query)]
+
+
+def raise_for_status(response: httpx.Response) -> None:
+    """Проверяет статус ответа Госуслуг.
+
+    :param response: HTTP ответ.
+    :raises TooManyRequestsError: Если Госуслуги ответили 429.
+    :raises httpx.HTTPStatusError: Если ответ с другим кодом ошибки.
+    """
+    if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+        raise TooManyRequestsError(str(response.url))
+    response.raise_for_status()
+
+
+class EndpointTemplate:
+    """Шаблон адреса CSV файла конкурсного списка.
+
+    Строится по одной паре (URL страницы конкурсного списка, URL скачанного файла):
+    части адреса файла с идентификаторами, совпадающие с частями адреса страницы,
+    запоминаются по позиции, чтобы потом подставить на их место части адреса
+    другого конкурсного списка.
+
+    :param reception_url: URL адрес страницы конкурсного списка.
+    :param download_url: URL адрес, по которому браузер скачал CSV файл.
+    """
+
+    def __init__(self, reception_url: str, download_url: str) -> None:
+        reception_parts = split_url(reception_url)
+        self.reception_url = reception_url
+        self.reception_parts_count = len(reception_parts)
+        self.download_url = urlparse(download_url)
+        self.path = [
+            self._find_part(segment, reception_parts)
+            for segment in self.download_url.path.split("/")
+        ]
+        self.query = [
+            (key, self._find_part(value, reception_parts))
+            for key, value in parse_qsl(self.download_url.query)
+        ]
+
+    @staticmethod
+    def _find_part(part: str, reception_parts: list[str]) -> int | str:
+        if any(char.isdigit() for char in part) and part in reception_parts:
+            return reception_parts.index(part)
+        return part
+
+    @property
+    def is_resolvable(self) -> bool:
+        """True если адрес файла зависит от адреса страницы конкурсного списка."""
+        return any(isinstance(part, int) for part in self.path) or any(
+            isinstance(value, int) for _, value in self.query
+        )
+
+    def resolve(self, reception_url: str) -> str | None:
+        """Подставляет части адреса конкурсного списка в шаблон.
+
+        :param reception_url: URL адрес страницы конкурсного списка.
+        :return: URL адрес CSV файла или None, если адрес имеет другую структуру.
+        """
+        reception_parts = split_url(reception_url)
+        if len(reception_parts) != self.reception_parts_count:
+            return None
+        path = "/".join(
+            reception_parts[part] if isinstance(part, int) else part for part in self.path
+        )
+        query = urlencode([
+            (key, reception_parts[value] if isinstance(value, int) else value)
+            for key, value in self.query
+        ])
+        return urlunparse(self.download_url._replace(path=path, query=query))
+
+
+class AdmissionListFetcher:
+    """Скачивание конкурсных списков напрямую по HTTP в обход браузера.
+
+    Адрес CSV файла определяется один раз по скачиваниям через браузер: шаблон, построенный
+    по первому скачиванию, должен подтвердиться вторым скачиванием другого списка.
+    После этого остальные списки загружаются через пул HTTP соединений с cookies браузера.
+
+    :param client: Асинхронный HTTP клиент, по умолчанию создаётся свой.
+    :param limiter: Ограничитель частоты запросов к Госуслугам, общий с браузером.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        limiter: AdaptiveRateLimiter = gosuslugi_limiter,
+    ) -> None:
+        self.limiter = limiter
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS),
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+        )
+        self.template: EndpointTemplate | None = None
+        self._candidate: EndpointTemplate | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.client.aclose()
+
+    @property
+    def is_ready(self) -> bool:
+        """True если адрес CSV файлов уже известен."""
+        return self.template is not None
+
+    def learn_endpoint(self, reception_url: str, download_url: str) -> None:
+        """Запоминает адрес CSV файла по скачиванию через браузер.
+
+        :param reception_url: URL адрес страницы конкурсного списка.
+        :param download_url: URL адрес, по которому браузер скачал файл.
+        """
+        if self.template is not None or urlparse(download_url).scheme not in PROTOCOLS:
+            return
+        candidate = self._candidate
+        if (
+            candidate is not None
+            and candidate.reception_url != reception_url
+            and candidate.resolve(reception_url) == download_url
+        ):
+            self.template = candidate
+            logger.info("---FOUND ADMISSION LISTS ENDPOINT %s---", download_url)
+            return
+        template = EndpointTemplate(reception_url, download_url)
+        self._candidate = template if template.is_resolvable else None
+
+    async def fetch(self, page: AsyncPage, reception_url: str) -> IO[bytes] | None:
+        """Скачивает CSV файл конкурсного списка по HTTP.
+
+        :param page: Страница, cookies контекста которой используются для запроса.
+        :param reception_url: URL адрес страницы конкурсного списка.
+        :return: Буфер с CSV файлом или None, если список нужно скачать через браузер.
+        """
+        if self.template is None:
+            return None
+        url = self.template.resolve(reception_url)
+        if url is None:
+            return None
+        cookies = await page.context.cookies(url)
+        headers = {
+            "Cookie": "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in cookies),
+            "Referer": reception_url,
+        }
+        buffer = create_admission_list_buffer()
+        try:
+            async with (
+                self.limiter.throttle(),
+                self.client.stream("GET", url, headers=headers) as response,
+            ):
+                raise_for_status(response)
+                async for chunk in response.aiter_bytes():
+                    buffer.write(chunk)
+        except (httpx.HTTPError, TooManyRequestsError) as e:
+            logger.warning("---FAILED TO FETCH ADMISSION LIST %s: %s---", url, e)
+            buffer.close()
+            return None
+        except BaseException:
+            buffer.close()
+            raise
+        ADMISSION_LIST_BYTES.labels("http").inc(buffer.tell())
+        buffer.seek(0)
+        if ADMISSION_LIST_HEADER.encode() not in buffer.read(1024):
+            logger.warning("---UNEXPECTED ADMISSION LIST CONTENT %s---", url)
+            buffer.close()
+            return None
+        buffer.seek(0)
+        return buffer
+
+    async def fetch_all(
+        self, page: AsyncPage, receptions2urls: dict[str, str]
+    ) -> dict[str, IO[bytes]]:
+        """Параллельно скачивает конкурсные списки по HTTP.
+
+        :param page: Страница, cookies контекста которой используются для запросов.
+        :param receptions2urls: URL адреса страниц конкурсных списков по видам приёма.
+        :return: Буферы успешно скачанных CSV файлов по видам приёма.
+        """
+        contents = await asyncio.gather(
+            *(self.fetch(page, url) for url in receptions2urls.values()),
+            return_exceptions=True,
+        )
+        errors = [content for content in contents if isinstance(content, BaseException)]
+        if errors:
+            # Буферы успешных загрузок никто не прочитает, поэтому закрываются сразу
+            for content in contents:
+                if content is not None and not isinstance(content, BaseException):
+                    content.close()
+            raise errors[0]
+        return {
+            reception: content
+            for reception, content in zip(receptions2urls, contents, strict=True)
+            if content is not None
+        }
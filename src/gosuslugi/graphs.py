@@ -3,7 +3,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from playwright.async_api import Browser as AsyncBrowser
+    from ..browser.pool import PagePool
+    from ..database import CrawlFrontier, FingerprintStore
+    from .api import GosuslugiApi
+    from .fetchers import AdmissionListFetcher
 
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
@@ -11,23 +14,42 @@ from langgraph.graph.state import CompiledStateGraph
 from ..core.base import Broker
 from .nodes import (
     DownloadApplicants,
+    EnqueueDirections,
     FilterDirectionURLs,
     ParseAdmissionLists,
     ParseApplicants,
     ParseDirection,
     ParseUniversity,
+    PublishAdmissionList,
 )
+from .retry import GOSUSLUGI_RETRY_POLICY
 from .states import AdmissionListState, UniversityState
 
 
-def build_university_graph(
-    broker: Broker, browser: AsyncBrowser
+def build_university_graph(  # noqa: PLR0913, PLR0917
+    broker: Broker,
+    pool: PagePool,
+    fetcher: AdmissionListFetcher | None = None,
+    fingerprints: FingerprintStore | None = None,
+    frontier: CrawlFrontier | None = None,
+    api: GosuslugiApi | None = None,
 ) -> CompiledStateGraph[UniversityState]:
     graph = StateGraph(UniversityState)
     # Добавления узлов (вершин) графа
-    graph.add_node("parse_university", ParseUniversity(browser))
-    graph.add_node("filter_direction_urls", FilterDirectionURLs(browser))
-    graph.add_node("parse_admission_lists", ParseAdmissionLists(broker, browser))
+    graph.add_node(
+        "parse_university", ParseUniversity(pool, api), retry_policy=GOSUSLUGI_RETRY_POLICY
+    )
+    graph.add_node(
+        "filter_direction_urls",
+        FilterDirectionURLs(pool, api),
+        retry_policy=GOSUSLUGI_RETRY_POLICY,
+    )
+    graph.add_node(
+        "parse_admission_lists",
+        ParseAdmissionLists(
+            broker, pool, fetcher=fetcher, fingerprints=fingerprints, frontier=frontier, api=api
+        ),
+    )
     # Добавление ребёр графа
     graph.add_edge(START, "parse_university")
     graph.add_edge("parse_university", "filter_direction_urls")
@@ -37,12 +59,24 @@ def build_university_graph(
     return graph.compile()
 
 
-def build_admission_list_graph(browser: AsyncBrowser) -> CompiledStateGraph[AdmissionListState]:
+def build_admission_list_graph(
+    pool: PagePool,
+    fetcher: AdmissionListFetcher | None = None,
+    fingerprints: FingerprintStore | None = None,
+    api: GosuslugiApi | None = None,
+    broker: Broker | None = None,
+) -> CompiledStateGraph[AdmissionListState]:
     graph = StateGraph(AdmissionListState)
     # Добавление узлов (вершин) графа
-    graph.add_node("parse_direction", ParseDirection(browser))
-    graph.add_node("download_applicants", DownloadApplicants(browser))
-    graph.add_node("parse_applicants", ParseApplicants(browser))
+    graph.add_node(
+        "parse_direction", ParseDirection(pool, api), retry_policy=GOSUSLUGI_RETRY_POLICY
+    )
+    graph.add_node(
+        "download_applicants",
+        DownloadApplicants(pool, fetcher),
+        retry_policy=GOSUSLUGI_RETRY_POLICY,
+    )
+    graph.add_node("parse_applicants", ParseApplicants(pool, fingerprints, broker))
     # Добавление рёбер графа
     graph.add_edge(START, "parse_direction")
     graph.add_edge("parse_direction", "download_applicants")
@@ -50,3 +84,61 @@ def build_admission_list_graph(browser: AsyncBrowser) -> CompiledStateGraph[Admi
     graph.add_edge("parse_applicants", END)
     # Компиляция графа
     return graph.compile()
+
+
+def build_discovery_graph(
+    broker: Broker,
+    pool: PagePool,
+    frontier: CrawlFrontier,
+    api: GosuslugiApi | None = None,
+    fingerprints: FingerprintStore | None = None,
+) -> CompiledStateGraph[UniversityState]:
+    graph = StateGraph(UniversityState)
+    # Добавление узлов (вершин) графа
+    graph.add_node(
+        "parse_university", ParseUniversity(pool, api), retry_policy=GOSUSLUGI_RETRY_POLICY
+    )
+    graph.add_node(
+        "filter_direction_urls",
+        FilterDirectionURLs(pool, api),
+        retry_policy=GOSUSLUGI_RETRY_POLICY,
+    )
+    graph.add_node(
+        "enqueue_directions", EnqueueDirections(broker, pool, frontier, fingerprints)
+    )
+    # Добавление рёбер графа
+    graph.add_edge(START, "parse_university")
+    graph.add_edge("parse_university", "filter_direction_urls")
+    graph.add_edge("filter_direction_urls", "enqueue_directions")
+    graph.add_edge("enqueue_directions", END)
+    # Компиляция графа
+    return graph.compile()
+
+
+def build_direction_graph(
+    broker: Broker,
+    pool: PagePool,
+    fetcher: AdmissionListFetcher | None = None,
+    fingerprints: FingerprintStore | None = None,
+    api: GosuslugiApi | None = None,
+) -> CompiledStateGraph[AdmissionListState]:
+    graph = StateGraph(AdmissionListState)
+    # Добавление узлов (вершин) графа
+    graph.add_node(
+        "parse_direction", ParseDirection(pool, api), retry_policy=GOSUSLUGI_RETRY_POLICY
+    )
+    graph.add_node(
+        "download_applicants",
+        DownloadApplicants(pool, fetcher),
+        retry_policy=GOSUSLUGI_RETRY_POLICY,
+    )
+    graph.add_node("parse_applicants", ParseApplicants(pool, fingerprints, broker))
+    graph.add_node("publish_admission_list", PublishAdmissionList(broker, pool, fingerprints))
+    # Добавление рёбер графа
+    graph.add_edge(START, "parse_direction")
+    graph.add_edge("parse_direction", "download_applicants")
+    graph.add_edge("download_applicants", "parse_applicants")
+    graph.add_edge("parse_applicants", "publish_admission_list")
+    graph.add_edge("publish_admission_list", END)
+    # Компиляция графа
+    return graph.compile()
@@ -1,7 +1,29 @@
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page as AsyncPage
+
+import hashlib
+import shutil
 from collections.abc import Iterator
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+import polars as pl
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from ..constants import UNIVERSITIES_COUNT
-from .constants import GOSUSLUGI_UNIVERSITY_URL
+from ..core.exceptions import TechnicalError
+from ..settings import settings
+from .constants import (
+    GOSUSLUGI_UNIVERSITY_URL,
+    PAGE_READY_TIMEOUT,
+    ROW_HASH_SIZE,
+    TECHNICAL_ERROR,
+)
+from .selectors import TECHNICAL_ERROR_SELECTOR
 
 START = 1
 
@@ -46,4 +68,78 @@ def generate_university_urls(start: int = START, end: int = UNIVERSITIES_COUNT)
         yield f"{GOSUSLUGI_UNIVERSITY_URL}{id}"
 
 
-def handle_technical_error() -> ...: ...
+def create_admission_list_buffer(
+    max_size: int = settings.parser_settings.spool_max_size,
+) -> IO[bytes]:
+    """Создаёт буфер для содержимого конкурсного списка.
+
+    :param max_size: Размер в байтах, после которого буфер сбрасывается во временный файл,
+    0 чтобы всегда держать список в памяти.
+    :return: Буфер, который удаляется при закрытии.
+    """
+    return SpooledTemporaryFile(max_size=max_size)
+
+
+def copy_to_buffer(path: str | Path, buffer: IO[bytes]) -> None:
+    """Копирует файл в буфер конкурсного списка.
+
+    :param path: Путь до файла.
+    :param buffer: Буфер конкурсного списка.
+    """
+    with open(path, "rb") as file:
+        shutil.copyfileobj(file, buffer)
+
+
+def hash_admission_list(buffer: IO[bytes]) -> str:
+    """Считает хэш содержимого конкурсного списка, не сдвигая позицию буфера.
+
+    :param buffer: Буфер конкурсного списка.
+    :return: Хэш CSV файла.
+    """
+    position = buffer.tell()
+    buffer.seek(0)
+    digest = hashlib.file_digest(buffer, "blake2b")
+    buffer.seek(position)
+    return digest.hexdigest()
+
+
+def hash_applicants(applicants: pl.DataFrame) -> list[str]:
+    """Считает хэш каждой строки провалидированного конкурсного списка.
+
+    Хэши хранятся между запусками, поэтому считаются через hashlib,
+    а не через `DataFrame.hash_rows`, результат которого зависит от версии polars.
+
+    :param applicants: Таблица абитуриентов со схемой `APPLICANTS_SCHEMA`.
+    :return: Хэши строк в порядке строк таблицы.
+    """
+    return [
+        hashlib.blake2b(repr(row).encode(), digest_size=ROW_HASH_SIZE).hexdigest()
+        for row in applicants.iter_rows()
+    ]
+
+
+async def handle_technical_error(
+    page: AsyncPage, ready_selector: str | None = None, timeout: float = PAGE_READY_TIMEOUT
+) -> None:
+    """Проверяет, не открылась ли вместо страницы `Техническая ошибка` Госуслуг.
+
+    SPA отрисовывает сообщение об ошибке уже после загрузки страницы, поэтому
+    сначала ждёт, пока появится сообщение или содержимое страницы. Если за время
+    ожидания не появилось ни то, ни другое, страница считается открывшейся.
+
+    :param page: Асинхронная Playwright страница после перехода.
+    :param ready_selector: CSS селектор содержимого открывшейся страницы, без него
+    ожидается только сообщение об ошибке.
+    :param timeout: Максимальное время ожидания в мс.
+    :raises TechnicalError: Если на странице сообщение о технической ошибке.
+    """
+    error_locator = page.locator(TECHNICAL_ERROR_SELECTOR, has_text=TECHNICAL_ERROR)
+    locator = error_locator
+    if ready_selector is not None:
+        locator = error_locator.or_(page.locator(ready_selector))
+    try:
+        await locator.first.wait_for(timeout=timeout)
+    except PlaywrightTimeoutError:
+        return
+    if await error_locator.count():
+        raise TechnicalError(page.url)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from playwright.async_api import Page as AsyncPage
+
+    from ..settings import LimiterSettings
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+import httpx
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from ..core.exceptions import PageNotFoundError, TechnicalError, TooManyRequestsError
+from ..metrics import PAGES_NAVIGATED, RATE_LIMIT
+from ..settings import settings
+from .helpers import handle_technical_error
+
+logger = logging.getLogger(__name__)
+
+# Ошибки, по которым видно, что Госуслуги не справляются с частотой запросов
+OVERLOAD_ERRORS: tuple[type[Exception], ...] = (
+    TechnicalError,
+    TooManyRequestsError,
+    PlaywrightTimeoutError,
+    httpx.TimeoutException,
+)
+
+
+class AdaptiveRateLimiter:
+    """Общий для всех страниц и HTTP запросов ограничитель частоты запросов к Госуслугам.
+
+    Токены корзины пополняются с текущей частотой, которая подстраивается по AIMD:
+    пока запросы проходят без ошибок, частота линейно растёт, а после технической
+    ошибки, 429 или таймаута падает в несколько раз. Так парсер держится у реального
+    предела сайта и не попадает под блокировку.
+
+    :param rate: Начальная частота запросов в секунду.
+    :param min_rate: Минимальная частота запросов в секунду.
+    :param max_rate: Максимальная частота запросов в секунду.
+    :param burst: Ёмкость корзины токенов.
+    :param increase: Прирост частоты за каждую секунду запросов без ошибок.
+    :param decrease: Множитель частоты после ошибки.
+    :param cooldown: Сколько секунд после снижения частоты ошибки не снижают её повторно,
+    чтобы одна волна ошибок параллельных запросов не обрушила частоту до минимума.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        rate: float = 2,
+        min_rate: float = 0.2,
+        max_rate: float = 20,
+        burst: int = 4,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        cooldown: float = 5,
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._decreased_at = float("-inf")
+        self._lock = asyncio.Lock()
+        RATE_LIMIT.set(rate)
+
+    @classmethod
+    def from_settings(cls, limiter_settings: LimiterSettings) -> Self:
+        """Создаёт ограничитель из настроек.
+
+        :param limiter_settings: Настройки ограничителя частоты запросов.
+        :return: Ограничитель частоты запросов.
+        """
+        return cls(
+            rate=limiter_settings.rate,
+            min_rate=limiter_settings.min_rate,
+            max_rate=limiter_settings.max_rate,
+            burst=limiter_settings.burst,
+            increase=limiter_settings.increase,
+            decrease=limiter_settings.decrease,
+            cooldown=limiter_settings.cooldown,
+        )
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def acquire(self) -> None:
+        """Ждёт токен на один запрос, ожидающие получают токены в порядке очереди."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def record_success(self) -> None:
+        """Аддитивно увеличивает частоту после успешного запроса."""
+        self._refill()
+        # Каждый запрос добавляет долю прироста, поэтому за секунду частота растёт на increase
+        self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+        RATE_LIMIT.set(self.rate)
+
+    def record_failure(self) -> None:
+        """Мультипликативно уменьшает частоту после признака перегрузки сайта."""
+        now = time.monotonic()
+        if now - self._decreased_at < self.cooldown:
+            return
+        self._refill()
+        self._decreased_at = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        RATE_LIMIT.set(self.rate)
+        logger.warning("---RATE LIMIT DECREASED TO %.2f REQUESTS PER SECOND---", self.rate)
+
+    @asynccontextmanager
+    async def throttle(self) -> AsyncIterator[None]:
+        """Выполняет запрос внутри блока с ограничением частоты и учитывает его результат.
+
+        Техническая ошибка, 429 и таймауты уменьшают частоту, успешный запрос увеличивает.
+        """
+        await self.acquire()
+        try:
+            yield
+        except OVERLOAD_ERRORS:
+            self.record_failure()
+            raise
+        else:
+            self.record_success()
+
+
+gosuslugi_limiter = AdaptiveRateLimiter.from_settings(settings.limiter_settings)
+
+
+async def navigate(
+    page: AsyncPage,
+    url: str,
+    limiter: AdaptiveRateLimiter = gosuslugi_limiter,
+    *,
+    ready_selector: str | None = None,
+) -> None:
+    """Переходит на страницу Госуслуг с ограничением частоты запросов.
+
+    :param page: Асинхронная Playwright страница.
+    :param url: URL адрес страницы.
+    :param limiter: Ограничитель частоты запросов.
+    :param ready_selector: CSS селектор содержимого страницы, с его появлением
+    проверка технической ошибки заканчивается без ожидания.
+    :raises TooManyRequestsError: Если Госуслуги ответили 429.
+    :raises PageNotFoundError: Если Госуслуги ответили 404.
+    :raises TechnicalError: Если вместо страницы открылась техническая ошибка.
+    """
+    async with limiter.throttle():
+        PAGES_NAVIGATED.inc()
+        response = await page.goto(url)
+        if response is not None and response.status == HTTPStatus.TOO_MANY_REQUESTS:
+            raise TooManyRequestsError(url)
+        if response is not None and response.status == HTTPStatus.NOT_FOUND:
+            raise PageNotFoundError(url)
+        await handle_technical_error(page, ready_selector)
@@ -1,232 +1,838 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import IO, TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from playwright.async_api import Browser as AsyncBrowser
+    from collections.abc import Awaitable, Callable
+
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.graph.state import CompiledStateGraph
+    from playwright.async_api import Page as AsyncPage
+
+    from ..browser.pool import PagePool
+    from ..database import CrawlFrontier, FingerprintStore
+    from .api import GosuslugiApi
+    from .fetchers import AdmissionListFetcher
+
+    NodeCall = Callable[[Any, Any, RunnableConfig], Awaitable[Any]]
 
 import asyncio
+import functools
 import logging
-import os
+import uuid
 from abc import ABC, abstractmethod
-from pathlib import Path
-from uuid import uuid4
+from urllib.parse import urljoin
 
 import polars as pl
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-from ..browser.utils import aget_current_page
+from ..browser.pool import get_leased_page, page_config
+from ..constants import CRAWL_DEAD_LETTERS_QUEUE, CRAWL_TASKS_QUEUE
 from ..core.base import Broker
-from ..core.enums import Source
-from ..core.schemas import ApplicantSchema, UniversitySchema
-from ..settings import ADMISSION_LISTS_DIR
-from .constants import GOSUSLUGI_URL, TECHNICAL_ERROR, TIMEOUT, ZERO_VALUE
-from .helpers import extract_direction_code, extract_university_id
+from ..core.enums import CrawlKind, Source
+from ..core.exceptions import PageNotFoundError
+from ..core.schemas import (
+    CrawlTaskSchema,
+    DeadLetterSchema,
+    FingerprintSchema,
+    PublishPartSchema,
+    UniversitySchema,
+)
+from ..metrics import (
+    ADMISSION_LIST_BYTES,
+    APPLICANTS_PARSED,
+    NODE_DURATION,
+    NODE_ERRORS,
+    PUBLISH_DURATION,
+)
+from ..settings import settings
+from ..wire import ARROW_CONTENT_TYPE, encode_applicants
+from .api import ApiCapture
+from .constants import NOT_FOUND, TIMEOUT
+from .helpers import (
+    copy_to_buffer,
+    create_admission_list_buffer,
+    extract_direction_code,
+    extract_university_id,
+    hash_admission_list,
+    hash_applicants,
+)
+from .limiter import navigate
 from .selectors import (
-    BUDGET_PLACES_XPATH,
     DOWNLOAD_AS_TABLE_SELECTOR,
     EDUCATION_FORM_FILTER_SELECTOR,
-    EDUCATION_FORM_SELECTOR,
     EDUCATION_LEVEL_FILTER_SELECTOR,
-    EDUCATION_PRICE_SELECTOR,
-    FETCH_PROFILE_SCRIPT,
+    EDUCATION_PROGRAM_TITLE_SELECTOR,
     FILTER_BUTTON_SELECTOR,
-    INSTITUTE_SELECTOR,
     LIST_OF_APPLICANTS_SELECTOR,
+    NOT_FOUND_SELECTOR,
     ORGANIZATION_TITLE_SELECTOR,
+    RECEPTION_LINKS_SCRIPT,
+    RECEPTION_SELECTOR,
     RECEPTIONS_SELECTOR,
-    TOTAL_PLACES_SELECTOR,
 )
 from .states import AdmissionListState, UniversityState
-from .utils import parse_direction_urls
-from .validators import ApplicantValidator, DirectionValidator
+from .utils import expand_education_program, extract_direction_fields, parse_direction_urls
+from .validators import (
+    APPLICANTS_SCHEMA,
+    DirectionValidator,
+    read_admission_list,
+    validate_admission_list,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _instrument(node: str, call: NodeCall) -> NodeCall:
+    @functools.wraps(call)
+    async def wrapper(self: BaseNode, state: Any, config: RunnableConfig) -> Any:
+        try:
+            with NODE_DURATION.labels(node).time():
+                return await call(self, state, config)
+        except Exception:
+            NODE_ERRORS.labels(node).inc()
+            raise
+
+    return wrapper
+
+
+def _part_header(publish_id: uuid.UUID | None, part: int) -> dict[str, Any]:
+    """Заголовки сообщения с изменениями, по которым потребитель подтверждает их запись.
+
+    :param publish_id: ID публикации изменений направления подготовки,
+    без него подтверждение не нужно.
+    :param part: Номер сообщения в публикации.
+    """
+    if publish_id is None:
+        return {}
+    return PublishPartSchema(publish_id=publish_id, part=part).model_dump(mode="json")
+
+
+async def schedule_direction_urls(
+    fingerprints: FingerprintStore | None,
+    university_url: str,
+    direction_urls: list[str],
+    min_staleness: float = settings.scheduler_settings.min_staleness,
+) -> list[str]:
+    """Упорядочивает направления подготовки по ожидаемому количеству пропущенных
+    изменений их конкурсных списков и отбрасывает те, что вряд ли изменились.
+
+    Направления без отпечатков ещё не скачивались и идут первыми.
+
+    :param fingerprints: Хранилище отпечатков конкурсных списков, без него
+    порядок не меняется.
+    :param university_url: URL адрес университета.
+    :param direction_urls: URL адреса направлений подготовки.
+    :param min_staleness: Минимальное ожидаемое количество изменений, с которого
+    направление подготовки парсится повторно.
+    :return: URL адреса направлений подготовки в порядке парсинга.
+    """
+    if fingerprints is None or not direction_urls:
+        return direction_urls
+    staleness = await fingerprints.staleness(extract_university_id(university_url))
+    scored = [
+        (staleness.get(extract_direction_code(direction_url), float("inf")), direction_url)
+        for direction_url in direction_urls
+    ]
+    scheduled_urls = [
+        direction_url
+        for score, direction_url in sorted(scored, reverse=True)
+        if score >= min_staleness
+    ]
+    logger.info(
+        "---SKIP %s FRESH DIRECTIONS---", len(direction_urls) - len(scheduled_urls)
+    )
+    return scheduled_urls
+
+
 class BaseNode(ABC):
-    """Базовый класс для создания узла (вершины графа)."""
+    """Базовый класс для создания узла (вершины графа).
 
-    def __init__(self, browser: AsyncBrowser) -> None:
-        self.browser = browser
+    Время выполнения и ошибки каждого узла записываются в метрики
+    с именем класса узла в качестве метки.
+    """
+
+    def __init__(self, pool: PagePool) -> None:
+        self.pool = pool
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "__call__" in cls.__dict__:
+            cls.__call__ = _instrument(cls.__name__, cls.__call__)
 
     @abstractmethod
-    async def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+    async def __call__(self, state: dict[str, Any], config: RunnableConfig) -> dict[str, Any]:
         pass
 
 
 class ParseUniversity(BaseNode):
-    """Парсинг информации об университете по его URL с Госуслуг."""
+    """Парсинг информации об университете по его URL с Госуслуг.
+
+    Если вместо университета открылась страница `Страница не найдена`,
+    поднимается `PageNotFoundError`, по которому университет считается несуществующим.
 
-    async def __call__(self, state: UniversityState) -> UniversityState:
+    :param pool: Пул страниц браузера.
+    :param api: JSON API Госуслуг, пока его эндпоинт неизвестен, университет
+    парсится через браузер, а ответы SPA записываются для поиска эндпоинта.
+    """
+
+    def __init__(self, pool: PagePool, api: GosuslugiApi | None = None) -> None:
+        super().__init__(pool)
+        self.api = api
+
+    async def __call__(self, state: UniversityState, config: RunnableConfig) -> UniversityState:
         logger.info("---SELECT UNIVERSITY---")
         url = state["university_url"]
-        page = await aget_current_page(self.browser)
-        await page.goto(url)
-        title = await page.locator(ORGANIZATION_TITLE_SELECTOR).text_content()
+        if self.api is not None and self.api.university is not None:
+            university = await self.api.parse_university(url)
+            if university is not None:
+                return {"university": university}
+        page = get_leased_page(config)
+        async with ApiCapture(page, enabled=self.api is not None) as capture:
+            await navigate(page, url, ready_selector=ORGANIZATION_TITLE_SELECTOR)
+            title_locator = page.locator(ORGANIZATION_TITLE_SELECTOR)
+            not_found_locator = page.locator(NOT_FOUND_SELECTOR, has_text=NOT_FOUND)
+            await title_locator.or_(not_found_locator).first.wait_for()
+            if await not_found_locator.count():
+                raise PageNotFoundError(url)
+            title = await title_locator.text_content()
         university = UniversitySchema(
             id=extract_university_id(url), title=title.strip(), source=Source.GOSUSLUGI, url=url
         )
+        if self.api is not None:
+            self.api.learn_university(url, capture.responses, university)
         return {"university": university}
 
 
 class FilterDirectionURLs(BaseNode):
-    """Фильтрация направлений подготовки на странице."""
+    """Фильтрация направлений подготовки на странице.
+
+    :param pool: Пул страниц браузера.
+    :param api: JSON API Госуслуг, пока его эндпоинт неизвестен, направления
+    фильтруются через браузер, а ответы SPA записываются для поиска эндпоинта.
+    """
+
+    def __init__(self, pool: PagePool, api: GosuslugiApi | None = None) -> None:
+        super().__init__(pool)
+        self.api = api
 
-    async def __call__(self, state: UniversityState) -> UniversityState:
+    async def __call__(self, state: UniversityState, config: RunnableConfig) -> UniversityState:
         logger.info("---FILTER DIRECTIONS---")
-        page = await aget_current_page(self.browser)
-        button = await page.wait_for_selector(FILTER_BUTTON_SELECTOR, timeout=TIMEOUT)
-        await button.click()
-        for education_form in state.get("education_forms", []):
-            await page.click(EDUCATION_FORM_FILTER_SELECTOR.format(education_form=education_form))
-            logger.info("---CHOSEN EDUCATION FORM `%s`---", education_form.upper())
-        for education_level in state.get("education_levels", []):
-            await page.click(
-                EDUCATION_LEVEL_FILTER_SELECTOR.format(education_level=education_level)
-            )
-            logger.info("---CHOSEN EDUCATION LEVEL `%s`", education_level.upper())
-        await page.click("button:has-text('Применить')")
-        logger.info("---SUBMIT FILTERS---")
-        direction_urls = await parse_direction_urls(self.browser)
+        university_url = state["university_url"]
+        if self.api is not None and self.api.direction_list is not None:
+            direction_urls = await self.api.parse_direction_urls(university_url)
+            if direction_urls is not None:
+                logger.info("---PARSED %s DIRECTIONS URLS OVER API---", len(direction_urls))
+                return {"direction_urls": direction_urls}
+        page = get_leased_page(config)
+        if page.url != university_url:
+            # Повторная попытка после сбоя начинается со страницы университета
+            await navigate(page, university_url, ready_selector=FILTER_BUTTON_SELECTOR)
+        # Записываются только ответы на отфильтрованные запросы, без загрузки страницы
+        async with ApiCapture(page, enabled=self.api is not None) as capture:
+            button = await page.wait_for_selector(FILTER_BUTTON_SELECTOR, timeout=TIMEOUT)
+            await button.click()
+            for education_form in state.get("education_forms", []):
+                await page.click(
+                    EDUCATION_FORM_FILTER_SELECTOR.format(education_form=education_form)
+                )
+                logger.info("---CHOSEN EDUCATION FORM `%s`---", education_form.upper())
+            for education_level in state.get("education_levels", []):
+                await page.click(
+                    EDUCATION_LEVEL_FILTER_SELECTOR.format(education_level=education_level)
+                )
+                logger.info("---CHOSEN EDUCATION LEVEL `%s`", education_level.upper())
+            await page.click("button:has-text('Применить')")
+            logger.info("---SUBMIT FILTERS---")
+            direction_urls = await parse_direction_urls(page)
+        if self.api is not None:
+            self.api.learn_direction_urls(university_url, capture.responses, direction_urls)
         return {"direction_urls": direction_urls}
 
 
 class ParseDirection(BaseNode):
-    """Парсинг конкретного направления подготовки."""
+    """Парсинг конкретного направления подготовки.
+
+    :param pool: Пул страниц браузера.
+    :param api: JSON API Госуслуг, пока его эндпоинт неизвестен, направление
+    парсится через браузер, а ответы SPA записываются для поиска эндпоинта.
+    """
+
+    def __init__(self, pool: PagePool, api: GosuslugiApi | None = None) -> None:
+        super().__init__(pool)
+        self.api = api
 
-    async def __call__(self, state: AdmissionListState) -> AdmissionListState:
+    async def __call__(
+        self, state: AdmissionListState, config: RunnableConfig
+    ) -> AdmissionListState:
         url = state["direction_url"]
         logger.info("---PARSE DIRECTION %s---", url)
-        direction_kwargs: dict[str, Any] = {}
-        page = await aget_current_page(self.browser)
-        await page.goto(url)
-        element = await page.query_selector("div.text-center")
-        if element is not None and element.inner_text() == TECHNICAL_ERROR:
-            await page.go_back()
-            return None
-        await page.wait_for_selector("h4.title-h4")
-        direction_kwargs["university_id"] = url.split("/")[-1]
-        direction_kwargs["code"] = extract_direction_code(url)
-        profiles = await page.evaluate(FETCH_PROFILE_SCRIPT)
-        direction_kwargs["title"] = profiles[0]
-        await page.click("h4.title-h4")
-        education_form = await page.query_selector(EDUCATION_FORM_SELECTOR)
-        if education_form:
-            direction_kwargs["education_form"] = await education_form.text_content()
-        institute = await page.query_selector(INSTITUTE_SELECTOR)
-        if institute:
-            direction_kwargs["institute"] = (await institute.text_content()).strip()
-        try:
-            direction_kwargs["budget_places"] = await page.text_content(
-                BUDGET_PLACES_XPATH, timeout=TIMEOUT * 5
-            )
-        except PlaywrightTimeoutError:
-            direction_kwargs["budget_places"] = ZERO_VALUE
-        direction_kwargs["total_places"] = await page.text_content(TOTAL_PLACES_SELECTOR)
-        direction_kwargs["education_price"] = await page.text_content(EDUCATION_PRICE_SELECTOR)
-        direction = DirectionValidator(**direction_kwargs)
+        if self.api is not None and self.api.direction is not None:
+            direction = await self.api.parse_direction(url)
+            if direction is not None:
+                return {"direction": direction}
+        page = get_leased_page(config)
+        async with ApiCapture(page, enabled=self.api is not None) as capture:
+            # Техническая ошибка поднимает исключение, и направление будет взято повторно
+            await navigate(page, url, ready_selector=EDUCATION_PROGRAM_TITLE_SELECTOR)
+            fields = await extract_direction_fields(page)
+        direction = DirectionValidator(
+            university_id=url.split("/")[-1],
+            code=extract_direction_code(url),
+            **fields,
+        )
+        if self.api is not None:
+            self.api.learn_direction(url, capture.responses, direction)
         return {"direction": direction}
 
 
 class DownloadApplicants(BaseNode):
-    """Скачивание файлов с конкурсными списками."""
+    """Скачивание файлов с конкурсными списками.
+
+    :param pool: Пул страниц браузера.
+    :param fetcher: Загрузчик конкурсных списков по HTTP, без него списки
+    скачиваются только через браузер.
+    """
+
+    def __init__(self, pool: PagePool, fetcher: AdmissionListFetcher | None = None) -> None:
+        super().__init__(pool)
+        self.fetcher = fetcher
 
     async def __call__(
         self,
-        state: AdmissionListState,  # noqa: ARG002
+        state: AdmissionListState,
+        config: RunnableConfig,
     ) -> AdmissionListState:
         logger.info("---DOWNLOAD APPLICANTS LISTS---")
-        page = await aget_current_page(self.browser)
+        page = get_leased_page(config)
+        if page.url != state["direction_url"]:
+            # Повторная попытка после сбоя начинается со страницы направления подготовки
+            await navigate(
+                page, state["direction_url"], ready_selector=EDUCATION_PROGRAM_TITLE_SELECTOR
+            )
+            await expand_education_program(page)
         await page.wait_for_selector(LIST_OF_APPLICANTS_SELECTOR, timeout=TIMEOUT)
         list_of_applicants = await page.query_selector(LIST_OF_APPLICANTS_SELECTOR)
         await list_of_applicants.click()
         await page.wait_for_selector(RECEPTIONS_SELECTOR, timeout=TIMEOUT)
-        receptions = await page.query_selector_all(f"{RECEPTIONS_SELECTOR} li.list-divider")
-        # applicant_list_urls: list[str] = []
-        receptions2applicant_list_urls: dict[str, str] = {}
-        for reception in receptions:
-            reception_text = await reception.inner_text()
-            link = await reception.query_selector("a.link-plain")
-            if link:
-                link_href = await link.get_attribute("href")
-                # applicant_list_urls.append(f"{GOSUSLUGI_URL}{link_href}")
-                receptions2applicant_list_urls[reception_text] = f"{GOSUSLUGI_URL}{link_href}"
+        receptions2hrefs = await page.eval_on_selector_all(
+            RECEPTION_SELECTOR, RECEPTION_LINKS_SCRIPT
+        )
+        receptions2applicant_list_urls: dict[str, str] = {
+            reception: urljoin(page.url, href) for reception, href in receptions2hrefs
+        }
         logger.info("---FOUND %s APPLICANT LISTS---", len(receptions2applicant_list_urls))
-        # admission_list_files: list[str] = []
-        receptions2admission_list_files: dict[str, str | Path] = {}
+        receptions2admission_lists: dict[str, IO[bytes]] = {}
+        try:
+            await self._download_all(
+                page, receptions2applicant_list_urls, receptions2admission_lists
+            )
+        except BaseException:
+            # Буферы закрываются только после парсинга, поэтому при ошибке, в том числе
+            # перед повторной попыткой узла, уже скачанные списки закрываются здесь
+            for buffer in receptions2admission_lists.values():
+                buffer.close()
+            raise
+        return {
+            "receptions2admission_lists": {
+                reception: receptions2admission_lists[reception]
+                for reception in receptions2applicant_list_urls
+            }
+        }
+
+    async def _download_all(
+        self,
+        page: AsyncPage,
+        receptions2applicant_list_urls: dict[str, str],
+        receptions2admission_lists: dict[str, IO[bytes]],
+    ) -> None:
+        """Скачивает конкурсные списки, складывая буферы в `receptions2admission_lists`."""
+        is_fetched = False
         for reception, applicant_list_url in receptions2applicant_list_urls.items():
-            await page.goto(applicant_list_url)
-            await page.wait_for_selector(DOWNLOAD_AS_TABLE_SELECTOR, timeout=TIMEOUT * 10)
-            async with page.expect_download() as download:
-                await page.click(DOWNLOAD_AS_TABLE_SELECTOR)
-            download_value = await download.value
-            # admission_list_file = f"{ADMISSION_LISTS_DIR}/{download_value.suggested_filename}"
-            admission_list_file = rf"{ADMISSION_LISTS_DIR}\\{uuid4()}.csv"
-            await download_value.save_as(admission_list_file)
-            # admission_list_files.append(admission_list_file)
-            receptions2admission_list_files[reception] = admission_list_file
-            logger.info("---SUCCESSFULLY SAVED APPLICANTS LIST---")
+            if reception in receptions2admission_lists:
+                continue
+            if not is_fetched and self.fetcher is not None and self.fetcher.is_ready:
+                # Как только адрес CSV файлов известен, все оставшиеся списки скачиваются
+                # по HTTP, а через браузер только те, что скачать не удалось
+                fetched = await self.fetcher.fetch_all(page, {
+                    reception: url
+                    for reception, url in receptions2applicant_list_urls.items()
+                    if reception not in receptions2admission_lists
+                })
+                logger.info("---FETCHED %s APPLICANTS LISTS OVER HTTP---", len(fetched))
+                receptions2admission_lists.update(fetched)
+                is_fetched = True
+                if reception in receptions2admission_lists:
+                    continue
+            receptions2admission_lists[reception] = await self._download(
+                page, applicant_list_url
+            )
+
+    async def _download(self, page: AsyncPage, applicant_list_url: str) -> IO[bytes]:
+        """Скачивает конкурсный список через браузер."""
+        await navigate(page, applicant_list_url, ready_selector=DOWNLOAD_AS_TABLE_SELECTOR)
+        await page.wait_for_selector(DOWNLOAD_AS_TABLE_SELECTOR, timeout=TIMEOUT * 10)
+        async with page.expect_download() as download:
+            await page.click(DOWNLOAD_AS_TABLE_SELECTOR)
+        download_value = await download.value
+        if self.fetcher is not None:
+            self.fetcher.learn_endpoint(applicant_list_url, download_value.url)
+        buffer = create_admission_list_buffer()
+        try:
+            await asyncio.to_thread(copy_to_buffer, await download_value.path(), buffer)
+            await download_value.delete()
+            ADMISSION_LIST_BYTES.labels("browser").inc(buffer.tell())
+            buffer.seek(0)
+            logger.info("---SUCCESSFULLY DOWNLOADED APPLICANTS LIST---")
             await page.go_back()
-        # return {"admission_list_files": admission_list_files}
-        return {"receptions2admission_list_files": receptions2admission_list_files}
+        except BaseException:
+            buffer.close()
+            raise
+        return buffer
 
 
 class ParseApplicants(BaseNode):
-    """Парсинг абитуриентов из файлов с конкурсными списками."""
+    """Парсинг абитуриентов из скачанных конкурсных списков.
+
+    Списки, хэш которых совпал с сохранённым отпечатком, не парсятся. В состояние
+    попадают только новые и изменившиеся абитуриенты, а также ID пропавших из всех
+    конкурсных списков направления подготовки.
 
-    async def __call__(self, state: AdmissionListState) -> AdmissionListState:
+    С брокером и размером части изменения каждого списка публикуются частями
+    с порядковыми номерами сразу после его парсинга и не копятся в состоянии.
+    С хранилищем отпечатков сообщения нумеруются в публикации направления подготовки,
+    чтобы отпечатки сохранились только после записи всех сообщений.
+
+    :param pool: Пул страниц браузера.
+    :param fingerprints: Хранилище отпечатков конкурсных списков, без него
+    все абитуриенты считаются новыми.
+    :param broker: Брокер сообщений для публикации абитуриентов частями.
+    :param chunk_size: Количество абитуриентов в одной части, 0 чтобы не публиковать частями.
+    :param binary: Публиковать части в Arrow IPC вместо JSON.
+    """
+
+    def __init__(
+        self,
+        pool: PagePool,
+        fingerprints: FingerprintStore | None = None,
+        broker: Broker | None = None,
+        *,
+        chunk_size: int = settings.parser_settings.applicants_chunk_size,
+        binary: bool = settings.parser_settings.binary_applicants,
+    ) -> None:
+        super().__init__(pool)
+        self.fingerprints = fingerprints
+        self.broker = broker
+        self.chunk_size = chunk_size
+        self.binary = binary
+
+    async def __call__(  # noqa: PLR0914
+        self,
+        state: AdmissionListState,
+        config: RunnableConfig,  # noqa: ARG002
+    ) -> AdmissionListState:
         logger.info("---PARSE APPLICANTS---")
-        applicants: list[ApplicantSchema] = []
-        # for admission_list_file in state.get("admission_list_files", []):
-        receptions2admission_list_files = state.get("receptions2admission_list_files", {})
-        for reception, admission_list_file in receptions2admission_list_files.items():
+        university_id = state["university_id"]
+        direction_code = extract_direction_code(state["direction_url"])
+        previous: dict[str, FingerprintSchema] = (
+            await self.fingerprints.load(university_id, direction_code)
+            if self.fingerprints is not None
+            else {}
+        )
+        publish_id = uuid.uuid4() if self.fingerprints is not None else None
+        published_parts = 0
+        frames: list[pl.DataFrame] = []
+        streamed_applicants = 0
+        fingerprints: list[FingerprintSchema] = []
+        seen_receptions: list[str] = []
+        applicant_ids: set[int] = set()
+        receptions2admission_lists = state.get("receptions2admission_lists", {})
+        for reception, admission_list in receptions2admission_lists.items():
+            previous_fingerprint = previous.get(reception)
             try:
-                df = pl.read_csv(admission_list_file, separator=";")
-                reception_applicants = [
-                    ApplicantValidator.from_csv_row(
-                        row,
-                        university_id=state["university_id"],
-                        direction_code=state["direction_url"],
-                        reception=reception,
+                content_hash = hash_admission_list(admission_list)
+                if (
+                    previous_fingerprint is not None
+                    and previous_fingerprint.content_hash == content_hash
+                ):
+                    logger.info("---ADMISSION LIST NOT CHANGED %s---", reception)
+                    seen_receptions.append(reception)
+                    applicant_ids.update(previous_fingerprint.row_hashes)
+                    continue
+                df = read_admission_list(admission_list)
+                applicants = validate_admission_list(df, university_id, direction_code, reception)
+                APPLICANTS_PARSED.inc(applicants.height)
+                fingerprint = FingerprintSchema(
+                    university_id=university_id,
+                    direction_code=direction_code,
+                    reception=reception,
+                    content_hash=content_hash,
+                    row_count=applicants.height,
+                    row_hashes=dict(
+                        zip(applicants["id"], hash_applicants(applicants), strict=True)
+                    ),
+                )
+                changed = self._filter_changed(applicants, fingerprint, previous_fingerprint)
+                if self.broker is not None and self.chunk_size > 0:
+                    published_parts = await self._publish_chunks(
+                        changed, fingerprint, publish_id, published_parts
                     )
-                    for row in df.to_dicts()
-                ]
-                applicants.extend(reception_applicants)
-                logger.info("---SUCCESSFULLY PARSED %s APPLICANTS---", len(applicants))
+                    streamed_applicants += changed.height
+                else:
+                    frames.append(changed)
+                fingerprints.append(fingerprint)
+                applicant_ids.update(fingerprint.row_hashes)
+                logger.info(
+                    "---SUCCESSFULLY PARSED %s APPLICANTS, CHANGED %s---",
+                    applicants.height,
+                    changed.height,
+                )
             except Exception as e:
                 logger.exception("---ERROR OCCURRED %s---", e)  # noqa: TRY401
+                # Абитуриенты нераспарсенного списка не должны считаться удалёнными
+                if previous_fingerprint is not None:
+                    seen_receptions.append(reception)
+                    applicant_ids.update(previous_fingerprint.row_hashes)
             finally:
-                os.remove(admission_list_file)
-        return {"applicants": applicants}
+                admission_list.close()
+        previous_ids = set().union(*(fingerprint.row_hashes for fingerprint in previous.values()))
+        return {
+            "applicants": pl.concat(frames) if frames else pl.DataFrame(schema=APPLICANTS_SCHEMA),
+            "streamed_applicants": streamed_applicants,
+            "deleted_applicant_ids": sorted(previous_ids - applicant_ids),
+            "fingerprints": fingerprints,
+            "seen_receptions": seen_receptions,
+            "publish_id": publish_id,
+            "published_parts": published_parts,
+        }
+
+    async def _publish_chunks(
+        self,
+        applicants: pl.DataFrame,
+        fingerprint: FingerprintSchema,
+        publish_id: uuid.UUID | None,
+        part: int,
+    ) -> int:
+        """Публикует абитуриентов конкурсного списка частями по порядку.
+
+        В бинарном формате ключ списка и номер части передаются в заголовках сообщения.
+
+        :param publish_id: ID публикации изменений направления подготовки.
+        :param part: Номер первого сообщения в публикации.
+        :return: Номер следующего сообщения в публикации.
+        """
+        chunks = list(applicants.iter_slices(self.chunk_size))
+        for sequence, chunk in enumerate(chunks):
+            header = {
+                "university_id": fingerprint.university_id,
+                "direction_code": fingerprint.direction_code,
+                "reception": fingerprint.reception,
+                "sequence": sequence,
+                "is_last": sequence == len(chunks) - 1,
+            }
+            part_header = _part_header(publish_id, part)
+            with PUBLISH_DURATION.labels("applicants_chunk").time():
+                if self.binary:
+                    await self.broker.publish(
+                        encode_applicants(chunk),
+                        queue="applicants.chunks",
+                        content_type=ARROW_CONTENT_TYPE,
+                        headers={**header, **part_header},
+                    )
+                else:
+                    await self.broker.publish(
+                        {**header, "applicants": chunk.to_dicts()},
+                        queue="applicants.chunks",
+                        headers=part_header,
+                    )
+            part += 1
+        return part
+
+    @staticmethod
+    def _filter_changed(
+        applicants: pl.DataFrame,
+        fingerprint: FingerprintSchema,
+        previous_fingerprint: FingerprintSchema | None,
+    ) -> pl.DataFrame:
+        """Оставляет абитуриентов, которых не было в прошлом списке или чья строка изменилась."""
+        if previous_fingerprint is None:
+            return applicants
+        return applicants.filter(pl.Series([
+            previous_fingerprint.row_hashes.get(id_) != fingerprint.row_hashes[id_]
+            for id_ in applicants["id"]
+        ]))
+
+
+class PublishAdmissionList(BaseNode):
+    """Публикация направления подготовки и изменений его конкурсных списков
+    в брокер сообщений.
+
+    :param broker: Брокер сообщений.
+    :param pool: Пул страниц браузера.
+    :param fingerprints: Хранилище отпечатков конкурсных списков, отпечатки
+    откладываются в нём до записи опубликованных изменений потребителем.
+    :param binary: Публиковать абитуриентов в Arrow IPC вместо JSON.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        pool: PagePool,
+        fingerprints: FingerprintStore | None = None,
+        *,
+        binary: bool = settings.parser_settings.binary_applicants,
+    ) -> None:
+        super().__init__(pool)
+        self.broker = broker
+        self.fingerprints = fingerprints
+        self.binary = binary
+
+    async def __call__(
+        self,
+        state: AdmissionListState,
+        config: RunnableConfig,  # noqa: ARG002
+    ) -> AdmissionListState:
+        university_id = state["university_id"]
+        direction_code = extract_direction_code(state["direction_url"])
+        applicants = state["applicants"]
+        deleted_applicant_ids = state.get("deleted_applicant_ids", [])
+        publish_id = state.get("publish_id") or (
+            uuid.uuid4() if self.fingerprints is not None else None
+        )
+        part = state.get("published_parts", 0)
+        publications = [self.broker.publish(state.get("direction"), queue="directions")]
+        if not applicants.is_empty() and self.binary:
+            publications.append(self.broker.publish(
+                encode_applicants(applicants),
+                queue="applicants",
+                content_type=ARROW_CONTENT_TYPE,
+                headers=_part_header(publish_id, part),
+            ))
+            part += 1
+        elif not applicants.is_empty():
+            publications.append(self.broker.publish(
+                applicants.to_dicts(), queue="applicants", headers=_part_header(publish_id, part)
+            ))
+            part += 1
+        if deleted_applicant_ids:
+            publications.append(self.broker.publish(
+                [
+                    {"university_id": university_id, "direction_code": direction_code, "id": id_}
+                    for id_ in deleted_applicant_ids
+                ],
+                queue="applicants.deleted",
+                headers=_part_header(publish_id, part),
+            ))
+            part += 1
+        with PUBLISH_DURATION.labels("admission_list").time():
+            await asyncio.gather(*publications)
+        logger.info(
+            "---PUBLISHED %s CHANGED AND %s DELETED APPLICANTS---",
+            applicants.height + state.get("streamed_applicants", 0),
+            len(deleted_applicant_ids),
+        )
+        if self.fingerprints is not None:
+            await self.fingerprints.stage(
+                publish_id,
+                university_id,
+                direction_code,
+                state.get("fingerprints", []),
+                state.get("seen_receptions", []),
+                parts=part,
+            )
+        return {}
 
 
 class ParseAdmissionLists(BaseNode):
     """Парсинг всей информации об университете и конкурсных списков
     с отправкой в брокер сообщений.
+
+    Направления подготовки парсятся параллельно, каждое на своей арендованной странице,
+    а результаты публикуются в исходном порядке направлений.
+
+    :param broker: Брокер сообщений.
+    :param pool: Пул страниц браузера.
+    :param concurrency: Максимальное количество одновременно парсящихся направлений.
+    :param fetcher: Загрузчик конкурсных списков по HTTP.
+    :param fingerprints: Хранилище отпечатков конкурсных списков, отпечатки
+    сохраняются после успешной публикации изменений.
+    :param frontier: Очередь задач обхода, в которой отмечаются обработанные
+    направления подготовки, чтобы не парсить их повторно после перезапуска.
+    :param api: JSON API Госуслуг для парсинга направлений подготовки без браузера.
     """
 
-    def __init__(self, broker: Broker, browser: AsyncBrowser) -> None:
-        super().__init__(browser)
+    def __init__(  # noqa: PLR0913
+        self,
+        broker: Broker,
+        pool: PagePool,
+        *,
+        concurrency: int = settings.parser_settings.direction_concurrency,
+        fetcher: AdmissionListFetcher | None = None,
+        fingerprints: FingerprintStore | None = None,
+        frontier: CrawlFrontier | None = None,
+        api: GosuslugiApi | None = None,
+    ) -> None:
+        super().__init__(pool)
         self.broker = broker
+        self.concurrency = concurrency
+        self.fetcher = fetcher
+        self.fingerprints = fingerprints
+        self.frontier = frontier
+        self.api = api
+        self.publish = PublishAdmissionList(broker, pool, fingerprints)
 
-    async def __call__(self, state: UniversityState) -> UniversityState:
+    async def _parse_direction(
+        self,
+        graph: CompiledStateGraph[AdmissionListState],
+        semaphore: asyncio.Semaphore,
+        university_url: str,
+        direction_url: str,
+    ) -> AdmissionListState | None:
+        async with semaphore, self.pool.lease() as page:
+            try:
+                return await graph.ainvoke(
+                    {
+                        "university_id": extract_university_id(university_url),
+                        "direction_url": direction_url,
+                    },
+                    config=page_config(page),
+                )
+            except Exception as e:
+                logger.exception("---ERROR OCCURRED %s---", e)  # noqa: TRY401
+                await self._fail_direction(university_url, direction_url, e)
+                return None
+
+    async def _fail_direction(
+        self, university_url: str, direction_url: str, error: Exception
+    ) -> None:
+        """Отмечает направление подготовки проваленным, а после всех попыток
+        отправляет его в очередь недоставленных задач."""
+        is_exhausted = self.frontier is None or await self.frontier.fail(
+            CrawlKind.DIRECTION, direction_url, error
+        )
+        if is_exhausted:
+            await self.broker.publish(
+                DeadLetterSchema(
+                    kind=CrawlKind.DIRECTION,
+                    url=direction_url,
+                    parent_url=university_url,
+                    error=repr(error),
+                ),
+                queue=CRAWL_DEAD_LETTERS_QUEUE,
+                persist=True,
+            )
+
+    async def _claim_direction_urls(
+        self, university_url: str, direction_urls: list[str]
+    ) -> list[str]:
+        """Оставляет направления подготовки, которые ещё не обработаны в текущем обходе."""
+        if self.frontier is None:
+            return direction_urls
+        await self.frontier.add(CrawlKind.DIRECTION, direction_urls, parent_url=university_url)
+        claimed_urls = await self.frontier.claim(
+            CrawlKind.DIRECTION, parent_url=university_url, limit=len(direction_urls)
+        )
+        # Очередь обхода не хранит порядок планировщика
+        claimed = set(claimed_urls)
+        claimed_urls = [url for url in direction_urls if url in claimed]
+        logger.info(
+            "---SKIP %s ALREADY PARSED DIRECTIONS---", len(direction_urls) - len(claimed_urls)
+        )
+        return claimed_urls
+
+    async def __call__(
+        self,
+        state: UniversityState,
+        config: RunnableConfig,
+    ) -> UniversityState:
         from .graphs import build_admission_list_graph  # noqa: PLC0415
 
         logger.info("---START PARSE UNIVERSITY ADMISSION LISTS---")
-        graph = build_admission_list_graph(self.browser)
-        university_id = extract_university_id(state["university_url"])
+        graph = build_admission_list_graph(
+            self.pool, self.fetcher, self.fingerprints, self.api, self.broker
+        )
         await self.broker.publish(state["university"], queue="universities")
-        for direction_url in state.get("direction_urls", []):
-            try:
-                response = await graph.ainvoke({
-                    "university_id": university_id,
-                    "direction_url": direction_url,
-                })
-                await asyncio.gather(
-                    self.broker.publish(response.get("direction"), queue="directions"),
-                    self.broker.publish(response.get("applicants"), queue="applicants"),
+        direction_urls = await schedule_direction_urls(
+            self.fingerprints, state["university_url"], state.get("direction_urls", [])
+        )
+        direction_urls = await self._claim_direction_urls(state["university_url"], direction_urls)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        failed = 0
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(
+                    self._parse_direction(
+                        graph, semaphore, state["university_url"], direction_url
+                    )
                 )
-            except Exception as e:
-                logger.exception("---ERROR OCCURRED %s---", e)  # noqa: TRY401
+                for direction_url in direction_urls
+            ]
+            for direction_url, task in zip(direction_urls, tasks, strict=True):
+                response = await task
+                if response is None:
+                    failed += 1
+                    continue
+                try:
+                    await self.publish(response, config)
+                except Exception as e:
+                    logger.exception("---ERROR OCCURRED %s---", e)  # noqa: TRY401
+                    failed += 1
+                    await self._fail_direction(state["university_url"], direction_url, e)
+                else:
+                    if self.frontier is not None:
+                        await self.frontier.complete(CrawlKind.DIRECTION, direction_url)
+        # Университет с непройденными направлениями будет взят в работу повторно
+        return {"message": "ERROR" if failed else "FINISH"}
+
+
+class EnqueueDirections(BaseNode):
+    """Публикация университета и постановка его направлений подготовки
+    в очередь задач распределённого обхода.
+
+    Направления подготовки, уже обработанные в текущем обходе, пропускаются.
+
+    :param broker: Брокер сообщений.
+    :param pool: Пул страниц браузера.
+    :param frontier: Очередь задач обхода.
+    :param fingerprints: Хранилище отпечатков конкурсных списков, по которому
+    направления подготовки ставятся в очередь по убыванию ожидаемых изменений.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        pool: PagePool,
+        frontier: CrawlFrontier,
+        fingerprints: FingerprintStore | None = None,
+    ) -> None:
+        super().__init__(pool)
+        self.broker = broker
+        self.frontier = frontier
+        self.fingerprints = fingerprints
+
+    async def __call__(
+        self,
+        state: UniversityState,
+        config: RunnableConfig,  # noqa: ARG002
+    ) -> UniversityState:
+        university_url = state["university_url"]
+        await self.broker.publish(state["university"], queue="universities")
+        direction_urls = await schedule_direction_urls(
+            self.fingerprints, university_url, state.get("direction_urls", [])
+        )
+        await self.frontier.add(CrawlKind.DIRECTION, direction_urls, parent_url=university_url)
+        direction_urls = list(
+            await self.frontier.pending(CrawlKind.DIRECTION, parent_url=university_url)
+        )
+        with PUBLISH_DURATION.labels("crawl_tasks").time():
+            await asyncio.gather(*(
+                self.broker.publish(
+                    CrawlTaskSchema(
+                        kind=CrawlKind.DIRECTION, url=direction_url, parent_url=university_url
+                    ),
+                    queue=CRAWL_TASKS_QUEUE,
+                    persist=True,
+                )
+                for direction_url in direction_urls
+            ))
+        logger.info("---ENQUEUED %s DIRECTIONS---", len(direction_urls))
         return {"message": "FINISH"}
@@ -0,0 +1,40 @@
+import httpx
+from langgraph.types import RetryPolicy
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from ..core.exceptions import TechnicalError, TooManyRequestsError
+from ..settings import settings
+
+# Временные ошибки, после которых узел графа стоит выполнить повторно
+RETRYABLE_ERRORS: tuple[type[Exception], ...] = (
+    TechnicalError,
+    TooManyRequestsError,
+    PlaywrightTimeoutError,
+    httpx.TransportError,
+)
+# Признак сетевой ошибки Chromium в сообщении исключения Playwright
+NETWORK_ERROR_MARKER = "net::ERR_"
+
+
+def is_retryable(error: Exception) -> bool:
+    """Проверяет, временная ли ошибка: таймауты, сетевые ошибки, 429 и технические
+    ошибки Госуслуг проходят сами, а ошибки валидации и вёрстки повторятся снова.
+
+    :param error: Исключение, поднятое узлом графа.
+    :return: True если узел стоит выполнить повторно.
+    """
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return isinstance(error, PlaywrightError) and NETWORK_ERROR_MARKER in error.message
+
+
+# Политика повторов узлов, работающих со страницами Госуслуг
+GOSUSLUGI_RETRY_POLICY = RetryPolicy(
+    initial_interval=settings.retry_settings.initial_interval,
+    backoff_factor=settings.retry_settings.backoff_factor,
+    max_interval=settings.retry_settings.max_interval,
+    max_attempts=settings.retry_settings.max_attempts,
+    jitter=True,
+    retry_on=is_retryable,
+)
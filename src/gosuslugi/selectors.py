@@ -5,6 +5,10 @@ ORGANIZATION_CARD_SELECTOR = "app-organization-card"
 # CSS селектор для получения названия университета
 # ORGANIZATION_TITLE_SELECTOR = "xpath=//span[@class='title-h3']"  # noqa: ERA001
 ORGANIZATION_TITLE_SELECTOR = "span.title-h3.flex-1"
+# CSS селектор сообщения о технической ошибке на странице
+TECHNICAL_ERROR_SELECTOR = "div.text-center"
+# CSS селектор сообщения о несуществующей странице
+NOT_FOUND_SELECTOR = "div.text-center, h1"
 # CSS селектор кнопки для открытия окна фильтрации университетов
 FILTER_BUTTON_SELECTOR = "button.filter-button"
 # CSS селектор для фильтрации направлений подготовки по форме образования
@@ -15,10 +19,18 @@ EDUCATION_FORM_FILTER_SELECTOR = (
 EDUCATION_LEVEL_FILTER_SELECTOR = (
     "form[formgroupname='educationLevels'] div.text-plain:has-text('{education_level}')"
 )
+# CSS селектор названия программы обучения на странице направления подготовки
+EDUCATION_PROGRAM_TITLE_SELECTOR = "h4.title-h4"
 # CSS селектор для получения программы обучения на направление подготовки
 EDUCATION_PROGRAM_SELECTOR = "app-education-program-card"
+# CSS селектор ссылок на направления подготовки в карточках программ обучения
+DIRECTION_LINK_SELECTOR = f"{EDUCATION_PROGRAM_SELECTOR} a.education-program-card[href]"
 # CSS селектор кнопки для показа ещё некоторого количества направлений подготовки
 SEE_MORE_BUTTON_SELECTOR = "button.white.button:has-text('Посмотреть ещё')"
+# JS скрипт, проверяющий что карточек на странице стало больше, чем было до нажатия кнопки
+CARDS_COUNT_INCREASED_SCRIPT = """([selector, count]) => {
+        return document.querySelectorAll(selector).length > count;
+    }"""
 # JS скрипт для извлечения названия профиля обучения
 FETCH_PROFILE_SCRIPT = """() => {
         return Array.from(document.querySelectorAll('lib-expansion-panel'))
@@ -42,10 +54,61 @@ BUDGET_PLACES_XPATH = (
 TOTAL_PLACES_SELECTOR = "div.header-places div.small-text"
 # CSS селектор для получения цены образования
 EDUCATION_PRICE_SELECTOR = "div.title-h3.mb-8"
+# JS скрипт, который дожидается отрисовки раскрытой программы обучения и за один вызов
+# извлекает все поля направления подготовки, ненайденные поля возвращаются как null
+DIRECTION_SNAPSHOT_SCRIPT = """async ([selectors, timeout]) => {
+        const findEducationFormLabel = () => Array.from(
+            document.querySelectorAll(selectors.educationFormLabel)
+        ).find(el => el.textContent.includes(selectors.educationFormText));
+        const deadline = performance.now() + timeout;
+        while (
+            !(findEducationFormLabel() && document.querySelector(selectors.totalPlaces))
+            && performance.now() < deadline
+        ) {
+            await new Promise(resolve => setTimeout(resolve, 16));
+        }
+        const text = (selector) => document.querySelector(selector)?.textContent ?? null;
+        const title = Array.from(document.querySelectorAll('lib-expansion-panel'))
+            .map(el => (el.shadowRoot || el).querySelector('h4.title-h4')?.textContent.trim())
+            .find(Boolean) ?? null;
+        const educationForm = findEducationFormLabel()?.nextElementSibling;
+        const budgetPlaces = document.evaluate(
+            selectors.budgetPlaces, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        return {
+            title: title,
+            education_form: educationForm?.matches(selectors.educationForm)
+                ? educationForm.textContent
+                : null,
+            institute: text(selectors.institute)?.trim() ?? null,
+            budget_places: budgetPlaces?.textContent ?? null,
+            total_places: text(selectors.totalPlaces),
+            education_price: text(selectors.educationPrice),
+        };
+    }"""
+# Селекторы для DIRECTION_SNAPSHOT_SCRIPT, запросы Playwright заменены на чистый CSS и XPath
+DIRECTION_SNAPSHOT_SELECTORS = {
+    "educationFormLabel": "div.small-text.gray",
+    "educationFormText": "Форма обучения",
+    "educationForm": "div.text-plain",
+    "institute": INSTITUTE_SELECTOR,
+    "budgetPlaces": BUDGET_PLACES_XPATH.removeprefix("xpath="),
+    "totalPlaces": TOTAL_PLACES_SELECTOR,
+    "educationPrice": EDUCATION_PRICE_SELECTOR,
+}
 # CSS селектор для перехода на страницу с конкурсными списками
 # LIST_OF_APPLICANTS_SELECTOR = "a:has-text('Списки подавших документы')"
 LIST_OF_APPLICANTS_SELECTOR = "a:has-text('Конкурсные списки')"
 # CSS селектор для открытия таблицы с определёнными цифрами приёма
 RECEPTIONS_SELECTOR = "ul.shadow-block"
+# CSS селектор вида приёма в таблице с цифрами приёма
+RECEPTION_SELECTOR = f"{RECEPTIONS_SELECTOR} li.list-divider"
+# JS скрипт для извлечения пар (вид приёма, ссылка на конкурсный список) за один вызов
+RECEPTION_LINKS_SCRIPT = """(receptions) => receptions
+    .map(reception => [
+        reception.innerText,
+        reception.querySelector('a.link-plain')?.getAttribute('href'),
+    ])
+    .filter(([, href]) => href)"""
 # CSS селектор кнопки для скачивания рейтинга
 DOWNLOAD_AS_TABLE_SELECTOR = "button:has-text('Скачать в виде таблицы')"
@@ -1,8 +1,10 @@
-from typing import Literal, TypedDict
+from typing import IO, Literal, TypedDict
 
-from pathlib import Path
+import uuid
 
-from ..core import ApplicantSchema, DirectionSchema, UniversitySchema
+import polars as pl
+
+from ..core import DirectionSchema, FingerprintSchema, UniversitySchema
 from ..core.enums import EducationForm
 from .constants import EDUCATION_LEVEL
 
@@ -34,13 +36,28 @@ class AdmissionListState(TypedDict):
     :param university_id: ID университета с Госуслуг.
     :param direction_url: URL адрес направления подготовки.
     :param direction: Полученное направление подготовки.
-    :param receptions2admission_list_files: Скаченные файлы с конкурсными списками.
-    :param applicants: Полученные абитуриенты.
+    :param receptions2admission_lists: Буферы со скачанными конкурсными списками.
+    :param applicants: Провалидированная таблица новых и изменившихся абитуриентов
+    со схемой `APPLICANTS_SCHEMA`.
+    :param streamed_applicants: Количество новых и изменившихся абитуриентов,
+    уже опубликованных частями при парсинге.
+    :param deleted_applicant_ids: ID абитуриентов, пропавших из конкурсных списков.
+    :param fingerprints: Отпечатки изменившихся конкурсных списков.
+    :param seen_receptions: Виды приёма, конкурсные списки которых не изменились.
+    :param publish_id: ID публикации изменений, по которому потребитель подтверждает
+    их запись, чтобы отпечатки сохранились только после неё.
+    :param published_parts: Количество сообщений с изменениями, уже опубликованных
+    частями при парсинге.
     """
 
     university_id: int
     direction_url: str
     direction: DirectionSchema
-    # admission_list_files: list[str | Path]
-    receptions2admission_list_files: dict[str, str | Path]
-    applicants: list[ApplicantSchema]
+    receptions2admission_lists: dict[str, IO[bytes]]
+    applicants: pl.DataFrame
+    streamed_applicants: int
+    deleted_applicant_ids: list[int]
+    fingerprints: list[FingerprintSchema]
+    seen_receptions: list[str]
+    publish_id: uuid.UUID
+    published_parts: int
@@ -1,10 +1,42 @@
 from __future__ import annotations
 
+from typing import IO
+
+import polars as pl
 from pydantic import field_validator
 
+from ..core.enums import Submit
 from ..core.schemas import ApplicantSchema, DirectionSchema
-from .constants import NO_POINTS, WITHOUT_ENTRANCE_EXAMS, ZERO_VALUE
-from .utils import extract_direction_code
+from .constants import NO_POINTS, NO_VALUE, WITHOUT_ENTRANCE_EXAMS, ZERO_VALUE
+from .helpers import extract_direction_code
+
+# Колонки CSV файла конкурсного списка и соответствующие им поля абитуриента
+ADMISSION_LIST_COLUMNS: dict[str, str] = {
+    "ID участника": "id",
+    "Место в конкурсе": "place",
+    "Приоритет конкурса": "priority",
+    "Подано согласие": "submit",
+    "Сумма баллов": "total_points",
+    "Баллы за ВИ": "entrance_exam_points",
+    "Баллы за ИД": "additional_points",
+    "БВИ": "without_entrance_exams",
+    "Преимущественное право": "advantage",
+}
+# Схема таблицы с провалидированными абитуриентами
+APPLICANTS_SCHEMA: dict[str, pl.DataType] = {
+    "university_id": pl.Int64(),
+    "direction_code": pl.String(),
+    "reception": pl.String(),
+    "id": pl.Int64(),
+    "place": pl.Int64(),
+    "priority": pl.Int64(),
+    "submit": pl.String(),
+    "total_points": pl.Int64(),
+    "entrance_exam_points": pl.List(pl.Int64()),
+    "additional_points": pl.Int64(),
+    "without_entrance_exams": pl.Boolean(),
+    "advantage": pl.String(),
+}
 
 
 class ApplicantValidator(ApplicantSchema):
@@ -31,7 +63,7 @@ class ApplicantValidator(ApplicantSchema):
 
     @field_validator("total_points", mode="before")
     def validate_total_points(cls, total_points: str | int) -> int:
-        if isinstance(total_points, str) and total_points == "—":
+        if isinstance(total_points, str) and total_points == NO_VALUE:
             return ZERO_VALUE
         return int(total_points)
 
@@ -49,14 +81,16 @@ class ApplicantValidator(ApplicantSchema):
 
     @field_validator("advantage", mode="before")
     def validate_advantage(cls, advantage: str) -> str | None:
-        if advantage == "—":
+        if advantage == NO_VALUE:
             return None
         return advantage
 
 
 class DirectionValidator(DirectionSchema):
     @field_validator("total_places", mode="before")
-    def validate_total_places(cls, total_places: str) -> int:
+    def validate_total_places(cls, total_places: str | None) -> int:
+        if total_places is None:
+            raise ValueError("Total places not found on direction page!")
         return int(
             "".join(
                 filter(str.isdigit, total_places.replace(" ", "").replace("&nbsp;", "").strip())
@@ -64,5 +98,67 @@ class DirectionValidator(DirectionSchema):
         )
 
     @field_validator("education_price", mode="before")
-    def validate_education_price(cls, education_price: str) -> float:
+    def validate_education_price(cls, education_price: str | None) -> float:
+        if education_price is None:
+            raise ValueError("Education price not found on direction page!")
         return float("".join(filter(str.isdigit, education_price.strip())))
+
+
+def _text(column: str) -> pl.Expr:
+    return pl.col(column).cast(pl.String).str.strip_chars()
+
+
+def read_admission_list(admission_list: bytes | IO[bytes]) -> pl.DataFrame:
+    """Читает CSV файл конкурсного списка, все колонки как строки.
+
+    Типы колонок приводит `validate_admission_list`. Если бы polars выводил типы
+    по первым строкам, то прочерк в сумме баллов ниже них ломал бы чтение всего списка.
+
+    :param admission_list: Содержимое CSV файла конкурсного списка.
+    :return: Таблица конкурсного списка.
+    """
+    return pl.read_csv(admission_list, separator=";", infer_schema=False)
+
+
+def validate_admission_list(
+    df: pl.DataFrame, university_id: int, direction_code: str, reception: str
+) -> pl.DataFrame:
+    """Векторно валидирует конкурсный список, аналогично `ApplicantValidator`,
+    но без создания pydantic модели на каждую строку.
+
+    :param df: Таблица, прочитанная из CSV файла конкурсного списка.
+    :param university_id: ID университета с Госуслуг.
+    :param direction_code: Код направления подготовки.
+    :param reception: Вид приёма и число мест.
+    :return: Таблица абитуриентов со схемой `APPLICANTS_SCHEMA`.
+    """
+    applicants = df.select(
+        pl.lit(int(university_id), pl.Int64).alias("university_id"),
+        pl.lit(direction_code, pl.String).alias("direction_code"),
+        pl.lit(reception, pl.String).alias("reception"),
+        pl.col("ID участника").cast(pl.Int64).alias("id"),
+        pl.col("Место в конкурсе").cast(pl.Int64).alias("place"),
+        pl.col("Приоритет конкурса").cast(pl.Int64).alias("priority"),
+        _text("Подано согласие").alias("submit"),
+        _text("Сумма баллов")
+        .replace(NO_VALUE, str(ZERO_VALUE))
+        .cast(pl.Int64)
+        .alias("total_points"),
+        _text("Баллы за ВИ")
+        .replace(NO_POINTS, str(ZERO_VALUE))
+        .str.split(" ")
+        .list.eval(pl.element().cast(pl.Int64))
+        .alias("entrance_exam_points"),
+        pl.col("Баллы за ИД").cast(pl.Int64).alias("additional_points"),
+        (_text("БВИ") == WITHOUT_ENTRANCE_EXAMS).fill_null(False).alias("without_entrance_exams"),
+        pl.when(_text("Преимущественное право") != NO_VALUE)
+        .then(_text("Преимущественное право"))
+        .alias("advantage"),
+    )
+    required = applicants.drop("advantage")
+    if required.null_count().sum_horizontal().item():
+        raise ValueError(f"Admission list has empty required values: {required.null_count()}")
+    invalid_submits = applicants.filter(~pl.col("submit").is_in(list(Submit)))
+    if not invalid_submits.is_empty():
+        raise ValueError(f"Unknown submit values: {invalid_submits['submit'].unique().to_list()}")
+    return applicants
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from faststream.rabbit import RabbitBroker
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
+from faststream.rabbit import RabbitQueue
+from prometheus_client import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    start_http_server,
+    write_to_textfile,
+)
+
+from .constants import CRAWL_DEAD_LETTERS_QUEUE, CRAWL_DELAYED_TASKS_QUEUE, CRAWL_TASKS_QUEUE
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Очереди RabbitMQ, глубина которых отслеживается
+WATCHED_QUEUES: tuple[str, ...] = (
+    CRAWL_TASKS_QUEUE,
+    CRAWL_DELAYED_TASKS_QUEUE,
+    CRAWL_DEAD_LETTERS_QUEUE,
+    "universities",
+    "directions",
+    "applicants",
+    "applicants.chunks",
+    "applicants.deleted",
+)
+
+NODE_DURATION = Histogram(
+    "parser_node_duration_seconds",
+    "Время выполнения узла графа",
+    ["node"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+NODE_ERRORS = Counter(
+    "parser_node_errors_total", "Количество упавших вызовов узла графа", ["node"]
+)
+PAGES_NAVIGATED = Counter("parser_pages_navigated_total", "Количество переходов на страницы")
+ADMISSION_LIST_BYTES = Counter(
+    "parser_admission_list_bytes_total",
+    "Объём скачанных CSV файлов конкурсных списков",
+    ["source"],
+)
+APPLICANTS_PARSED = Counter(
+    "parser_applicants_parsed_total", "Количество распарсенных абитуриентов"
+)
+PUBLISH_DURATION = Histogram(
+    "parser_publish_duration_seconds", "Время публикации сообщений в брокер", ["message"]
+)
+DB_WRITE_DURATION = Histogram(
+    "parser_db_write_duration_seconds",
+    "Время записи пачки в базу данных",
+    ["table", "operation"],
+)
+QUEUE_DEPTH = Gauge("parser_queue_depth", "Количество сообщений в очереди RabbitMQ", ["queue"])
+RATE_LIMIT = Gauge(
+    "parser_rate_limit_requests_per_second", "Текущая частота запросов к Госуслугам"
+)
+
+
+def dump_metrics(path: str = settings.metrics_settings.file) -> None:
+    """Сохраняет все метрики в файл в текстовом формате Prometheus.
+
+    :param path: Путь до файла, пустая строка чтобы ничего не сохранять.
+    """
+    if path:
+        write_to_textfile(path, REGISTRY)
+
+
+async def watch_queue_depth(
+    broker: RabbitBroker, interval: float = settings.metrics_settings.interval
+) -> None:
+    """Периодически обновляет глубину очередей и сохраняет метрики в файл.
+
+    :param broker: Подключённый брокер сообщений.
+    :param interval: Интервал обновления в секундах.
+    """
+    try:
+        # Пассивное объявление не создаёт очередь и не меняет её параметры
+        queues = {
+            name: await broker.declare_queue(RabbitQueue(name, passive=True))
+            for name in WATCHED_QUEUES
+        }
+        while True:
+            for name, queue in queues.items():
+                declaration = await queue.declare()
+                QUEUE_DEPTH.labels(name).set(declaration.message_count)
+            dump_metrics()
+            await asyncio.sleep(interval)
+    except Exception as e:
+        logger.exception("Queue depth watcher stopped, error: %s", e)  # noqa: TRY401
+
+
+@asynccontextmanager
+async def expose_metrics(
+    broker: RabbitBroker, port: int = settings.metrics_settings.port
+) -> AsyncIterator[None]:
+    """Отдаёт метрики на HTTP эндпоинте `/metrics` и следит за глубиной очередей,
+    при завершении сохраняет метрики в файл.
+
+    :param broker: Подключённый брокер сообщений.
+    :param port: Порт HTTP эндпоинта, 0 чтобы не поднимать эндпоинт.
+    """
+    server = None
+    if port:
+        try:
+            server, _ = start_http_server(port)
+        except OSError as e:
+            # Несколько воркеров на одной машине должны слушать разные порты
+            logger.warning("Failed to expose metrics on port %s, error: %s", port, e)
+        else:
+            logger.info("Metrics exposed on port %s", port)
+    watcher = asyncio.create_task(watch_queue_depth(broker))
+    try:
+        yield
+    finally:
+        watcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await watcher
+        dump_metrics()
+        if server is not None:
+            server.shutdown()
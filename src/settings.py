@@ -3,6 +3,9 @@ from pathlib import Path
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .browser.profile import BLOCK_RESOURCE_TYPES, TRACKER_DOMAINS
+from .constants import UNIVERSITIES_COUNT
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 ENV_PATH = BASE_DIR / ".env"
 ENV_PATH_EXAMPLE = BASE_DIR / ".env.example"
@@ -25,6 +28,8 @@ class SqlSettings(BaseSettings):
     postgres_password: str = ""
     postgres_user: str = ""
     postgres_db: str = ""
+    # Количество абитуриентов в одном многострочном upsert запросе
+    postgres_upsert_chunk_size: int = 1000
 
     @property
     def get_db_url(self) -> str:
@@ -40,10 +45,126 @@ class RabbitSettings(BaseSettings):
         return f"amqp://guest:guest@{self.rabbit_host}:{self.rabbit_port}/"
 
 
+class BatchSettings(BaseSettings):
+    # Количество сообщений, которые записываются в базу данных одной транзакцией
+    max_size: int = 100
+    # Максимальное время ожидания пачки сообщений в миллисекундах
+    max_delay: int = 200
+
+    model_config = SettingsConfigDict(env_prefix="BATCH_")
+
+
+class LimiterSettings(BaseSettings):
+    # Начальная частота запросов к Госуслугам в запросах в секунду
+    rate: float = 2
+    # Минимальная и максимальная частота запросов в запросах в секунду
+    min_rate: float = 0.2
+    max_rate: float = 20
+    # Сколько запросов можно отправить разом после простоя
+    burst: int = 4
+    # На сколько запросов в секунду частота растёт за каждую секунду без ошибок
+    increase: float = 0.1
+    # Во сколько раз частота падает после технической ошибки, 429 или таймаута
+    decrease: float = 0.5
+    # Сколько секунд после снижения частоты новые ошибки не снижают её повторно
+    cooldown: float = 5
+
+    model_config = SettingsConfigDict(env_prefix="LIMITER_")
+
+
+class RetrySettings(BaseSettings):
+    # Сколько раз узел графа выполняется, пока не упадёт окончательно
+    max_attempts: int = 3
+    # Задержка перед первой повторной попыткой в секундах
+    initial_interval: float = 1
+    # Во сколько раз растёт задержка с каждой попыткой
+    backoff_factor: float = 2
+    # Максимальная задержка между попытками в секундах
+    max_interval: float = 30
+
+    model_config = SettingsConfigDict(env_prefix="RETRY_")
+
+
+class MetricsSettings(BaseSettings):
+    # Порт HTTP эндпоинта с метриками в формате Prometheus, 0 чтобы не поднимать эндпоинт
+    port: int = 9100
+    # Файл, в который периодически сохраняются метрики, пустая строка чтобы не сохранять
+    file: str = ""
+    # Интервал обновления глубины очередей и сохранения метрик в файл в секундах
+    interval: float = 15
+
+    model_config = SettingsConfigDict(env_prefix="METRICS_")
+
+
+class SchedulerSettings(BaseSettings):
+    # Бюджет загрузок страниц на час обхода, 0 чтобы обходить все университеты
+    page_loads_per_hour: int = 0
+    # Направления подготовки, у которых ожидается меньше изменений, не обходятся
+    min_staleness: float = 0
+    # Через сколько часов старое наблюдение за конкурсным списком весит вдвое меньше
+    half_life: float = 24 * 7
+
+    model_config = SettingsConfigDict(env_prefix="SCHEDULER_")
+
+
+class BrowserSettings(BaseSettings):
+    # Запускать ли браузер в headless режиме
+    headless: bool = True
+    # Типы ресурсов, запросы которых отменяются
+    block_resource_types: list[str] = list(BLOCK_RESOURCE_TYPES)
+    # Домены счётчиков и аналитики, запросы к которым отменяются
+    block_domains: list[str] = list(TRACKER_DOMAINS)
+    # Отключать ли GPU и фоновые службы Chromium
+    disable_gpu: bool = True
+    # Отключать ли анимации на страницах
+    disable_animations: bool = True
+
+    model_config = SettingsConfigDict(env_prefix="BROWSER_")
+
+
+class ParserSettings(BaseSettings):
+    # Количество университетов, которые парсятся одновременно
+    concurrency: int = 1
+    # Количество направлений подготовки одного университета, которые парсятся одновременно
+    direction_concurrency: int = 4
+    # Размер конкурсного списка в байтах, после которого он сбрасывается из памяти на диск
+    spool_max_size: int = 16 * 1024 * 1024
+    # Публиковать только изменения конкурсных списков с прошлого запуска
+    incremental: bool = True
+    # Диапазон ID университетов на Госуслугах для обхода
+    university_start: int = 1
+    university_end: int = UNIVERSITIES_COUNT
+    # Сколько раз задача обхода может быть взята в работу
+    max_attempts: int = 3
+    # Через сколько секунд задача в работе считается брошенной
+    lease_timeout: int = 60 * 60
+    # Количество задач обхода, которые воркер берёт из очереди одновременно
+    worker_prefetch: int = 1
+    # Парсить вузы и направления подготовки через JSON API Госуслуг, найденное по ответам SPA
+    json_api: bool = False
+    # Обходить только живые университеты из индекса, пока индекс пуст, обходятся все ID
+    use_index: bool = True
+    # Количество абитуриентов в одном сообщении, которыми изменения конкурсного списка
+    # публикуются сразу после его парсинга, 0 чтобы публиковать направление одним сообщением
+    applicants_chunk_size: int = 0
+    # Публиковать абитуриентов в Arrow IPC со сжатием zstd вместо JSON,
+    # подписчики принимают оба формата по типу содержимого сообщения
+    binary_applicants: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="PARSER_")
+
+
 class Settings(BaseSettings):
     gigachat: GigaChatSettings = GigaChatSettings()
     sql_settings: SqlSettings = SqlSettings()
     rabbit_settings: RabbitSettings = RabbitSettings()
+    parser_settings: ParserSettings = ParserSettings()
+    browser_settings: BrowserSettings = BrowserSettings()
+    batch_settings: BatchSettings = BatchSettings()
+    limiter_settings: LimiterSettings = LimiterSettings()
+    retry_settings: RetrySettings = RetrySettings()
+    metrics_settings: MetricsSettings = MetricsSettings()
+    scheduler_settings: SchedulerSettings = SchedulerSettings()
 
 
 settings = Settings()
@@ -0,0 +1,49 @@
+from typing import Any
+
+import io
+
+import polars as pl
+from pydantic import TypeAdapter
+
+from .core import ApplicantSchema
+
+# Тип содержимого сообщений с абитуриентами в потоковом формате Arrow IPC
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+# Повторяющиеся в каждой строке значения, которые передаются словарём один раз на сообщение
+DICTIONARY_COLUMNS: tuple[str, ...] = ("direction_code", "reception", "submit")
+
+applicants_adapter = TypeAdapter(list[ApplicantSchema])
+
+
+def encode_applicants(applicants: pl.DataFrame) -> bytes:
+    """Кодирует таблицу абитуриентов в Arrow IPC со сжатием zstd.
+
+    :param applicants: Таблица абитуриентов со схемой `APPLICANTS_SCHEMA`.
+    :return: Тело сообщения.
+    """
+    buffer = io.BytesIO()
+    applicants.with_columns(pl.col(DICTIONARY_COLUMNS).cast(pl.Categorical)).write_ipc_stream(
+        buffer, compression="zstd"
+    )
+    return buffer.getvalue()
+
+
+def decode_applicants(
+    body: bytes, content_type: str | None
+) -> list[ApplicantSchema] | list[dict[str, Any]]:
+    """Декодирует тело сообщения с абитуриентами по его типу содержимого.
+
+    Arrow IPC сразу превращается в строки для upsert запроса без валидации каждой
+    строки, так как таблица уже провалидирована парсером, а JSON валидируется как раньше.
+
+    :param body: Тело сообщения.
+    :param content_type: Тип содержимого сообщения.
+    :return: Абитуриенты или строки таблицы абитуриентов.
+    """
+    if content_type == ARROW_CONTENT_TYPE:
+        return (
+            pl.read_ipc_stream(body)
+            .with_columns(pl.col(DICTIONARY_COLUMNS).cast(pl.String))
+            .to_dicts()
+        )
+    return applicants_adapter.validate_json(body)
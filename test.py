@@ -4,6 +4,7 @@ import logging
 from playwright.async_api import async_playwright
 from pydantic import BaseModel
 
+from src.browser.pool import PagePool, page_config
 from src.core.enums import EducationForm
 from src.gosuslugi.graphs import build_university_graph
 
@@ -24,12 +25,16 @@ async def main() -> None:
     broker = TestBroker()
     async with async_playwright() as playwright:
         browser = await playwright.chromium.launch(headless=False)
-        graph = build_university_graph(broker, browser)
-        response = await graph.ainvoke({
-            "university_url": tumgu_url,
-            "education_forms": [EducationForm.FULL_TIME],
-            "education_levels": ["Бакалавриат", "Специалитет"],
-        })
+        async with PagePool(browser) as pool, pool.lease() as page:
+            graph = build_university_graph(broker, pool)
+            response = await graph.ainvoke(
+                {
+                    "university_url": tumgu_url,
+                    "education_forms": [EducationForm.FULL_TIME],
+                    "education_levels": ["Бакалавриат", "Специалитет"],
+                },
+                config=page_config(page),
+            )
         print(response)
 
 
@@ -0,0 +1,85 @@
+"""Проверка определения постраничного эндпоинта списка направлений подготовки."""
+
+from typing import Any
+
+import httpx
+import pytest
+
+from src.gosuslugi.api import GosuslugiApi
+from src.gosuslugi.limiter import AdaptiveRateLimiter
+
+pytestmark = pytest.mark.anyio
+
+PAGE_SIZE = 2
+API_URL = "https://www.gosuslugi.ru/api/vuz/v1/universities/{}/specialties"
+UNIVERSITY_URL = "https://www.gosuslugi.ru/vuznavigator/universities/{}"
+DIRECTION_URL = "https://www.gosuslugi.ru/vuznavigator/specialties/{}/2/{}"
+
+
+def make_codes(university_id: int, count: int) -> list[str]:
+    return [f"{university_id}.03.{number:02}" for number in range(count)]
+
+
+def page_url(university_id: int, page: int) -> str:
+    return f"{API_URL.format(university_id)}?page={page}&size={PAGE_SIZE}"
+
+
+def page_payload(codes: list[str], page: int) -> dict[str, Any]:
+    return {"items": [{"code": code} for code in codes[page * PAGE_SIZE : (page + 1) * PAGE_SIZE]]}
+
+
+def captured(university_id: int, codes: list[str]) -> list[tuple[str, Any]]:
+    """Ответы, которые SPA получила, пока пролистывала список направлений вуза."""
+    pages = range((len(codes) + PAGE_SIZE - 1) // PAGE_SIZE)
+    return [(page_url(university_id, page), page_payload(codes, page)) for page in pages]
+
+
+def learn(api: GosuslugiApi, university_id: int, codes: list[str]) -> None:
+    api.learn_direction_urls(
+        UNIVERSITY_URL.format(university_id),
+        captured(university_id, codes),
+        [DIRECTION_URL.format(code, university_id) for code in codes],
+    )
+
+
+def make_api(universities2codes: dict[int, list[str]]) -> GosuslugiApi:
+    def handler(request: httpx.Request) -> httpx.Response:
+        university_id = int(request.url.path.split("/")[-2])
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json=page_payload(universities2codes[university_id], page))
+
+    limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=100)
+    return GosuslugiApi(httpx.AsyncClient(transport=httpx.MockTransport(handler)), limiter)
+
+
+async def test_multi_page_lists_confirm_endpoint() -> None:
+    universities2codes = {43: make_codes(43, 3), 52: make_codes(52, 4), 61: make_codes(61, 7)}
+    async with make_api(universities2codes) as api:
+        learn(api, 43, universities2codes[43])
+        learn(api, 52, universities2codes[52])
+
+        direction_urls = await api.parse_direction_urls(UNIVERSITY_URL.format(61))
+
+    assert direction_urls == [DIRECTION_URL.format(code, 61) for code in universities2codes[61]]
+
+
+async def test_single_page_lists_do_not_confirm_endpoint() -> None:
+    universities2codes = {43: make_codes(43, 2), 52: make_codes(52, 1), 61: make_codes(61, 7)}
+    async with make_api(universities2codes) as api:
+        learn(api, 43, universities2codes[43])
+        learn(api, 52, universities2codes[52])
+
+        # Без пагинации большой вуз парсится через браузер, а не обрезается до первой страницы
+        assert await api.parse_direction_urls(UNIVERSITY_URL.format(61)) is None
+
+
+async def test_single_page_list_keeps_paginated_candidate() -> None:
+    universities2codes = {43: make_codes(43, 3), 52: make_codes(52, 1), 61: make_codes(61, 5)}
+    async with make_api(universities2codes) as api:
+        learn(api, 43, universities2codes[43])
+        learn(api, 52, universities2codes[52])
+        learn(api, 61, universities2codes[61])
+
+        direction_urls = await api.parse_direction_urls(UNIVERSITY_URL.format(43))
+
+    assert direction_urls == [DIRECTION_URL.format(code, 43) for code in universities2codes[43]]
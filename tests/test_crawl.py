@@ -0,0 +1,206 @@
+"""Проверка распределённого обхода через очередь `crawl.tasks` на тестовом брокере FastStream."""
+
+from typing import Any
+
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+from faststream.rabbit import RabbitBroker, TestRabbitBroker
+
+from src.constants import CRAWL_DEAD_LETTERS_QUEUE, CRAWL_DELAYED_TASKS_QUEUE, CRAWL_TASKS_QUEUE
+from src.core import CrawlKind, CrawlState, CrawlTaskSchema, DeadLetterSchema
+from src.crawl import CrawlWorker, create_crawl_router
+
+pytestmark = pytest.mark.anyio
+
+UNIVERSITY_URL = "https://www.gosuslugi.ru/vuznavigator/universities/43"
+DIRECTION_URL = "https://www.gosuslugi.ru/vuznavigator/specialties/2.20.03.01/2/43"
+
+
+class MemoryFrontier:
+    """Очередь обхода в памяти с той же семантикой взятия задач, что и в Postgres."""
+
+    def __init__(self, max_attempts: int = 2, lease_timeout: int = 60) -> None:
+        self.max_attempts = max_attempts
+        self.lease_timeout = timedelta(seconds=lease_timeout)
+        self.states: dict[str, CrawlState] = {}
+        self.attempts: dict[str, int] = {}
+        self.leased_at: dict[str, float] = {}
+
+    def add(self, url: str) -> None:
+        self.states[url] = CrawlState.PENDING
+        self.attempts[url] = 0
+
+    async def claim(
+        self,
+        kind: CrawlKind,
+        parent_url: str | None = None,
+        limit: int | None = 1,
+        url: str | None = None,
+    ) -> list[str]:
+        state = self.states.get(url)
+        is_expired = (
+            state == CrawlState.IN_FLIGHT
+            and time.monotonic() - self.leased_at[url] > self.lease_timeout.total_seconds()
+        )
+        is_claimable = (
+            state == CrawlState.PENDING
+            or is_expired
+            or (state == CrawlState.FAILED and self.attempts[url] < self.max_attempts)
+        )
+        if not is_claimable:
+            return []
+        self.states[url] = CrawlState.IN_FLIGHT
+        self.attempts[url] += 1
+        self.leased_at[url] = time.monotonic()
+        return [url]
+
+    def expire(self, url: str) -> None:
+        self.leased_at[url] -= self.lease_timeout.total_seconds() + 1
+
+    async def state(self, kind: CrawlKind, url: str) -> CrawlState | None:
+        return self.states.get(url)
+
+    async def complete(self, kind: CrawlKind, url: str) -> None:
+        self.states[url] = CrawlState.DONE
+
+    async def fail(self, kind: CrawlKind, url: str, error: BaseException) -> bool:
+        self.states[url] = CrawlState.FAILED
+        return self.attempts[url] >= self.max_attempts
+
+
+class MemoryPool:
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[object]:
+        yield object()
+
+
+class CountingGraph:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.calls: list[dict[str, Any]] = []
+
+    async def ainvoke(self, state: dict[str, Any], config: dict[str, Any]) -> dict[str, Any]:
+        self.calls.append(state)
+        if self.error is not None:
+            raise self.error
+        return {"message": "FINISH", "direction_urls": [DIRECTION_URL]}
+
+
+@pytest.fixture
+def frontier() -> MemoryFrontier:
+    frontier = MemoryFrontier()
+    frontier.add(UNIVERSITY_URL)
+    frontier.add(DIRECTION_URL)
+    return frontier
+
+
+def create_worker(broker: RabbitBroker, frontier: MemoryFrontier) -> CrawlWorker:
+    worker = CrawlWorker(broker, MemoryPool(), frontier)
+    worker.discovery_graph = CountingGraph()
+    worker.direction_graph = CountingGraph()
+    return worker
+
+
+async def test_worker_completes_published_tasks(frontier: MemoryFrontier) -> None:
+    broker = RabbitBroker()
+    worker = create_worker(broker, frontier)
+    broker.include_router(create_crawl_router(worker, prefetch=1))
+    async with TestRabbitBroker(broker) as test_broker:
+        for kind, url in (
+            (CrawlKind.UNIVERSITY, UNIVERSITY_URL),
+            (CrawlKind.DIRECTION, DIRECTION_URL),
+        ):
+            await test_broker.publish(CrawlTaskSchema(kind=kind, url=url), queue=CRAWL_TASKS_QUEUE)
+    assert frontier.states == {UNIVERSITY_URL: CrawlState.DONE, DIRECTION_URL: CrawlState.DONE}
+    assert worker.discovery_graph.calls[0]["university_url"] == UNIVERSITY_URL
+    assert worker.direction_graph.calls[0]["direction_url"] == DIRECTION_URL
+
+
+async def test_duplicate_task_is_crawled_once(frontier: MemoryFrontier) -> None:
+    broker = RabbitBroker()
+    worker = create_worker(broker, frontier)
+    broker.include_router(create_crawl_router(worker, prefetch=1))
+    task = CrawlTaskSchema(kind=CrawlKind.UNIVERSITY, url=UNIVERSITY_URL)
+    async with TestRabbitBroker(broker) as test_broker:
+        # Повторный запуск продюсера публикует ещё не выполненную задачу второй раз
+        await test_broker.publish(task, queue=CRAWL_TASKS_QUEUE)
+        await test_broker.publish(task, queue=CRAWL_TASKS_QUEUE)
+    assert len(worker.discovery_graph.calls) == 1
+    assert frontier.attempts[UNIVERSITY_URL] == 1
+
+
+async def test_exhausted_task_goes_to_dead_letters(frontier: MemoryFrontier) -> None:
+    broker = RabbitBroker()
+    worker = create_worker(broker, frontier)
+    worker.direction_graph = CountingGraph(error=ConnectionError("direction page reset"))
+
+    # Ошибку задачи тестовый брокер сохраняет в обработчике, поэтому обработчик
+    # подписывается здесь, чтобы забрать её через `wait_call`
+    @broker.subscriber(CRAWL_TASKS_QUEUE)
+    async def crawl(task: CrawlTaskSchema) -> None:
+        await worker.handle(task)
+
+    @broker.subscriber(CRAWL_DEAD_LETTERS_QUEUE)
+    async def dead_letters(letter: DeadLetterSchema) -> None:
+        pass
+
+    task = CrawlTaskSchema(kind=CrawlKind.DIRECTION, url=DIRECTION_URL, parent_url=UNIVERSITY_URL)
+    async with TestRabbitBroker(broker) as test_broker:
+        for _ in range(frontier.max_attempts):
+            with pytest.raises(ConnectionError):
+                await test_broker.publish(task, queue=CRAWL_TASKS_QUEUE)
+            with pytest.raises(ConnectionError):
+                await crawl.wait_call(timeout=1)
+        dead_letters.mock.assert_called_once()
+        letter = dead_letters.mock.call_args.args[0]
+        assert (letter["url"], letter["parent_url"]) == (DIRECTION_URL, UNIVERSITY_URL)
+        # Сообщение, которое брокер вернёт после последней попытки, только подтверждается
+        await test_broker.publish(task, queue=CRAWL_TASKS_QUEUE)
+    assert len(worker.direction_graph.calls) == frontier.max_attempts
+    assert frontier.states[DIRECTION_URL] == CrawlState.FAILED
+
+
+async def test_leased_task_is_delayed(frontier: MemoryFrontier) -> None:
+    broker = RabbitBroker()
+    worker = create_worker(broker, frontier)
+    broker.include_router(create_crawl_router(worker, prefetch=1))
+
+    @broker.subscriber(CRAWL_DELAYED_TASKS_QUEUE)
+    async def delayed_tasks(task: CrawlTaskSchema) -> None:
+        pass
+
+    # Задачу выполняет другой воркер, а брокер отдал её сообщение повторно
+    await frontier.claim(CrawlKind.UNIVERSITY, url=UNIVERSITY_URL)
+    task = CrawlTaskSchema(kind=CrawlKind.UNIVERSITY, url=UNIVERSITY_URL)
+    async with TestRabbitBroker(broker) as test_broker:
+        await test_broker.publish(task, queue=CRAWL_TASKS_QUEUE)
+        delayed_tasks.mock.assert_called_once_with(task.model_dump(mode="json"))
+    assert not worker.discovery_graph.calls
+    assert frontier.states[UNIVERSITY_URL] == CrawlState.IN_FLIGHT
+
+
+async def test_redelivered_task_with_expired_lease_is_processed(frontier: MemoryFrontier) -> None:
+    broker = RabbitBroker()
+    worker = create_worker(broker, frontier)
+    broker.include_router(create_crawl_router(worker, prefetch=1))
+
+    @broker.subscriber(CRAWL_DELAYED_TASKS_QUEUE)
+    async def delayed_tasks(task: CrawlTaskSchema) -> None:
+        pass
+
+    # Воркер упал посреди задачи, и её сообщение вернулось после истечения аренды
+    await frontier.claim(CrawlKind.UNIVERSITY, url=UNIVERSITY_URL)
+    frontier.expire(UNIVERSITY_URL)
+    async with TestRabbitBroker(broker) as test_broker:
+        await test_broker.publish(
+            CrawlTaskSchema(kind=CrawlKind.UNIVERSITY, url=UNIVERSITY_URL),
+            queue=CRAWL_TASKS_QUEUE,
+        )
+        delayed_tasks.mock.assert_not_called()
+    assert len(worker.discovery_graph.calls) == 1
+    assert frontier.states[UNIVERSITY_URL] == CrawlState.DONE
+    assert frontier.attempts[UNIVERSITY_URL] == 2
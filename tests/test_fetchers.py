@@ -0,0 +1,128 @@
+"""Проверка скачивания конкурсных списков по HTTP на подставном сервере Госуслуг."""
+
+from typing import IO, Any
+
+import io
+
+import httpx
+import pytest
+
+from src.gosuslugi.constants import ADMISSION_LIST_HEADER
+from src.gosuslugi.fetchers import AdmissionListFetcher
+from src.gosuslugi.limiter import AdaptiveRateLimiter
+from src.gosuslugi.nodes import DownloadApplicants
+
+pytestmark = pytest.mark.anyio
+
+DIRECTION_URL = "https://www.gosuslugi.ru/vuznavigator/specialties/2.20.03.01/2/43"
+COOKIES: list[dict[str, Any]] = [
+    {"name": "session", "value": "abc"},
+    {"name": "esia", "value": "42"},
+]
+CSV = f'"{ADMISSION_LIST_HEADER}";"Место"\n"1234567";"1"\n'.encode()
+
+
+def reception_url(list_id: int) -> str:
+    return f"{DIRECTION_URL}/receptions/{list_id}"
+
+
+def download_url(list_id: int) -> str:
+    return f"https://www.gosuslugi.ru/api/lists/{list_id}/csv"
+
+
+class FakeContext:
+    async def cookies(self, url: str) -> list[dict[str, Any]]:
+        return COOKIES
+
+
+class FakePage:
+    context = FakeContext()
+
+
+class GosuslugiStub:
+    """Подставной сервер: 101-103 отдают CSV, 500 падает, 600 отдаёт HTML вместо CSV."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        list_id = int(request.url.path.split("/")[-2])
+        if list_id == 500:
+            return httpx.Response(500)
+        if list_id == 600:
+            return httpx.Response(200, text="<html>Войдите через Госуслуги</html>")
+        return httpx.Response(200, content=CSV)
+
+
+@pytest.fixture
+def stub() -> GosuslugiStub:
+    return GosuslugiStub()
+
+
+@pytest.fixture
+async def fetcher(stub: GosuslugiStub) -> AdmissionListFetcher:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+    async with AdmissionListFetcher(client, AdaptiveRateLimiter(rate=1000, burst=1000)) as fetcher:
+        yield fetcher
+
+
+def confirm_endpoint(fetcher: AdmissionListFetcher) -> None:
+    fetcher.learn_endpoint(reception_url(101), download_url(101))
+    fetcher.learn_endpoint(reception_url(102), download_url(102))
+
+
+async def test_endpoint_is_learned_after_second_matching_download(
+    fetcher: AdmissionListFetcher, stub: GosuslugiStub
+) -> None:
+    fetcher.learn_endpoint(reception_url(101), download_url(101))
+    assert not fetcher.is_ready
+    assert await fetcher.fetch(FakePage(), reception_url(103)) is None
+    # Повтор того же списка не подтверждает шаблон
+    fetcher.learn_endpoint(reception_url(101), download_url(101))
+    assert not fetcher.is_ready
+    fetcher.learn_endpoint(reception_url(102), download_url(102))
+    assert fetcher.is_ready
+    assert not stub.requests
+
+
+async def test_mismatching_download_does_not_confirm_endpoint(
+    fetcher: AdmissionListFetcher,
+) -> None:
+    fetcher.learn_endpoint(reception_url(101), download_url(101))
+    fetcher.learn_endpoint(reception_url(102), "https://www.gosuslugi.ru/files/list.csv")
+    assert not fetcher.is_ready
+
+
+async def test_fetch_all_sends_browser_cookies(
+    fetcher: AdmissionListFetcher, stub: GosuslugiStub
+) -> None:
+    confirm_endpoint(fetcher)
+    fetched = await fetcher.fetch_all(FakePage(), {"Основные места": reception_url(103)})
+    assert fetched["Основные места"].read() == CSV
+    [request] = stub.requests
+    assert request.url == download_url(103)
+    assert request.headers["Cookie"] == "session=abc; esia=42"
+    assert request.headers["Referer"] == reception_url(103)
+
+
+async def test_bad_status_and_non_csv_fall_back_to_browser(
+    fetcher: AdmissionListFetcher,
+) -> None:
+    confirm_endpoint(fetcher)
+    node = DownloadApplicants(pool=None, fetcher=fetcher)
+    downloaded: list[str] = []
+
+    async def download_in_browser(page: FakePage, url: str) -> IO[bytes]:
+        downloaded.append(url)
+        return io.BytesIO(CSV)
+
+    node._download = download_in_browser
+    receptions2admission_lists: dict[str, IO[bytes]] = {}
+    await node._download_all(
+        FakePage(),
+        {"ok": reception_url(103), "error": reception_url(500), "html": reception_url(600)},
+        receptions2admission_lists,
+    )
+    assert downloaded == [reception_url(500), reception_url(600)]
+    assert set(receptions2admission_lists) == {"ok", "error", "html"}
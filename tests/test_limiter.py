@@ -0,0 +1,156 @@
+"""Проверка AIMD ограничителя частоты запросов и ошибок перехода на страницы Госуслуг."""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Self
+
+import asyncio
+import time
+from http import HTTPStatus
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from src.core.exceptions import PageNotFoundError, TechnicalError, TooManyRequestsError
+from src.gosuslugi.constants import PAGE_READY_TIMEOUT, TECHNICAL_ERROR
+from src.gosuslugi.limiter import AdaptiveRateLimiter, navigate
+from src.gosuslugi.selectors import ORGANIZATION_TITLE_SELECTOR, TECHNICAL_ERROR_SELECTOR
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://www.gosuslugi.ru/vuznavigator/universities/43"
+# Задержка отрисовки SPA после загрузки страницы в секундах
+RENDER_DELAY = 0.05
+
+
+class FakeLocator:
+    """Локатор, который ищет отрисованные элементы страницы по селектору и тексту."""
+
+    def __init__(self, page: FakePage, queries: list[tuple[str, str | None]]) -> None:
+        self.page = page
+        self.queries = queries
+
+    @property
+    def first(self) -> Self:
+        return self
+
+    def or_(self, other: FakeLocator) -> FakeLocator:
+        return FakeLocator(self.page, self.queries + other.queries)
+
+    async def count(self) -> int:
+        return sum(
+            selector == element and (has_text is None or has_text in text)
+            for selector, has_text in self.queries
+            for element, text in self.page.rendered
+        )
+
+    async def wait_for(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout / 1000
+        while not await self.count():
+            if time.monotonic() > deadline:
+                raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+            await asyncio.sleep(0.01)
+
+
+class FakeResponse(NamedTuple):
+    status: int
+
+
+class FakePage:
+    """Страница, которая отрисовывает элемент через `RENDER_DELAY` после загрузки."""
+
+    def __init__(
+        self, status: int = HTTPStatus.OK, element: tuple[str, str] | None = None
+    ) -> None:
+        self.status = status
+        self.element = element
+        self.url = "about:blank"
+        self.rendered: list[tuple[str, str]] = []
+        self._render: asyncio.Task[Any] | None = None
+
+    async def goto(self, url: str) -> FakeResponse:
+        self.url = url
+        if self.element is not None:
+            self._render = asyncio.create_task(self._render_later(self.element))
+        return FakeResponse(self.status)
+
+    async def _render_later(self, element: tuple[str, str]) -> None:
+        await asyncio.sleep(RENDER_DELAY)
+        self.rendered.append(element)
+
+    def locator(self, selector: str, has_text: str | None = None) -> FakeLocator:
+        return FakeLocator(self, [(selector, has_text)])
+
+
+def make_limiter(**kwargs: Any) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(**{"rate": 2, "burst": 10, "cooldown": 60, **kwargs})
+
+
+def test_success_increases_rate_additively() -> None:
+    limiter = make_limiter(increase=0.1)
+
+    limiter.record_success()
+
+    # Прирост делится на частоту, чтобы за секунду запросов частота выросла на increase
+    assert limiter.rate == pytest.approx(2 + 0.1 / 2)
+
+
+def test_failures_decrease_rate_once_per_cooldown() -> None:
+    limiter = make_limiter(rate=4, decrease=0.5)
+
+    limiter.record_failure()
+    limiter.record_failure()
+
+    assert limiter.rate == pytest.approx(2)
+
+
+def test_rate_stays_within_bounds() -> None:
+    limiter = make_limiter(min_rate=0.5, max_rate=3, increase=10, cooldown=0)
+
+    for _ in range(10):
+        limiter.record_success()
+    assert limiter.rate == pytest.approx(3)
+
+    for _ in range(10):
+        limiter.record_failure()
+    assert limiter.rate == pytest.approx(0.5)
+
+
+async def test_too_many_requests_decreases_rate() -> None:
+    limiter = make_limiter()
+
+    with pytest.raises(TooManyRequestsError):
+        await navigate(FakePage(HTTPStatus.TOO_MANY_REQUESTS), URL, limiter)
+
+    assert limiter.rate == pytest.approx(1)
+
+
+async def test_not_found_keeps_rate() -> None:
+    limiter = make_limiter()
+
+    with pytest.raises(PageNotFoundError):
+        await navigate(FakePage(HTTPStatus.NOT_FOUND), URL, limiter)
+
+    # Несуществующая страница не признак перегрузки сайта
+    assert limiter.rate == pytest.approx(2)
+
+
+async def test_technical_error_rendered_after_load_is_detected() -> None:
+    limiter = make_limiter()
+    page = FakePage(element=(TECHNICAL_ERROR_SELECTOR, TECHNICAL_ERROR))
+
+    with pytest.raises(TechnicalError):
+        await navigate(page, URL, limiter, ready_selector=ORGANIZATION_TITLE_SELECTOR)
+
+    assert limiter.rate == pytest.approx(1)
+
+
+async def test_rendered_content_ends_check_without_timeout() -> None:
+    limiter = make_limiter()
+    page = FakePage(element=(ORGANIZATION_TITLE_SELECTOR, "Тестовый университет"))
+
+    start = time.monotonic()
+    await navigate(page, URL, limiter, ready_selector=ORGANIZATION_TITLE_SELECTOR)
+
+    assert time.monotonic() - start < PAGE_READY_TIMEOUT / 1000
+    assert limiter.rate > 2
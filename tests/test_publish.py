@@ -0,0 +1,106 @@
+"""Проверка публикации изменений конкурсных списков с отложенным сохранением отпечатков."""
+
+from typing import Any
+
+import uuid
+
+import polars as pl
+import pytest
+
+from src.core import FingerprintSchema
+from src.gosuslugi.nodes import PublishAdmissionList
+
+pytestmark = pytest.mark.anyio
+
+UNIVERSITY_ID = 43
+DIRECTION_CODE = "2.20.03.01"
+DIRECTION_URL = f"https://www.gosuslugi.ru/vuznavigator/specialties/{DIRECTION_CODE}/2/43"
+RECEPTION = "Общий конкурс 10"
+
+
+class MemoryBroker:
+    """Брокер, который запоминает очереди и заголовки опубликованных сообщений."""
+
+    def __init__(self) -> None:
+        self.published: list[tuple[str, dict[str, Any]]] = []
+
+    async def publish(self, messages: object, **kwargs: Any) -> None:
+        self.published.append((kwargs["queue"], kwargs.get("headers") or {}))
+
+
+class MemoryFingerprintStore:
+    """Хранилище, которое запоминает отложенные отпечатки и сколько сообщений
+    было опубликовано к моменту их откладывания."""
+
+    def __init__(self, broker: MemoryBroker) -> None:
+        self.broker = broker
+        self.staged: list[dict[str, Any]] = []
+
+    async def stage(  # noqa: PLR0913
+        self,
+        publish_id: uuid.UUID,
+        university_id: int,
+        direction_code: str,
+        fingerprints: list[FingerprintSchema],
+        seen_receptions: list[str],
+        *,
+        parts: int,
+    ) -> None:
+        self.staged.append({
+            "publish_id": publish_id,
+            "parts": parts,
+            "published": len(self.broker.published),
+        })
+
+
+def make_state(**state: Any) -> dict[str, Any]:
+    applicants = pl.DataFrame([
+        {
+            "university_id": UNIVERSITY_ID,
+            "direction_code": DIRECTION_CODE,
+            "reception": RECEPTION,
+            "id": 1,
+            "place": 1,
+            "priority": 1,
+            "submit": "Да",
+            "total_points": 200,
+        }
+    ])
+    return {
+        "university_id": UNIVERSITY_ID,
+        "direction_url": DIRECTION_URL,
+        "direction": None,
+        "applicants": applicants,
+        "deleted_applicant_ids": [2, 3],
+        **state,
+    }
+
+
+async def test_fingerprints_wait_for_every_published_part() -> None:
+    broker = MemoryBroker()
+    fingerprints = MemoryFingerprintStore(broker)
+    publish_id = uuid.uuid4()
+    node = PublishAdmissionList(broker, None, fingerprints, binary=False)
+
+    # Две части уже опубликованы при парсинге, нумерация продолжается с них
+    await node(make_state(publish_id=publish_id, published_parts=2), {})
+
+    headers = dict(broker.published)
+    assert headers["directions"] == {}
+    assert headers["applicants"] == {"publish_id": str(publish_id), "part": 2}
+    assert headers["applicants.deleted"] == {"publish_id": str(publish_id), "part": 3}
+    assert fingerprints.staged == [{"publish_id": publish_id, "parts": 4, "published": 3}]
+
+
+async def test_without_fingerprints_parts_are_not_numbered() -> None:
+    broker = MemoryBroker()
+    node = PublishAdmissionList(broker, None, binary=False)
+
+    await node(make_state(), {})
+
+    assert [queue for queue, _ in broker.published] == [
+        "directions",
+        "applicants",
+        "applicants.deleted",
+    ]
+    assert all(headers == {} for _, headers in broker.published)
@@ -0,0 +1,34 @@
+"""Проверка чтения и валидации CSV файлов конкурсных списков."""
+
+from src.gosuslugi.constants import NO_VALUE
+from src.gosuslugi.helpers import extract_direction_code
+from src.gosuslugi.validators import (
+    ADMISSION_LIST_COLUMNS,
+    read_admission_list,
+    validate_admission_list,
+)
+
+UNIVERSITY_ID = 43
+DIRECTION_URL = "https://www.gosuslugi.ru/vuznavigator/specialties/2.20.03.01/2/43"
+RECEPTION = "Основные места 120"
+ROWS = 300
+
+
+def test_no_value_below_inferred_rows_is_parsed() -> None:
+    lines = [";".join(f'"{column}"' for column in ADMISSION_LIST_COLUMNS)]
+    for place in range(1, ROWS + 1):
+        # Прочерк в сумме баллов только у последнего абитуриента, ниже первых 100 строк
+        total_points = NO_VALUE if place == ROWS else 200
+        row = (1_000_000 + place, place, 1, "Да", total_points, "70 70 60", 0, "Нет", NO_VALUE)
+        lines.append(";".join(f'"{value}"' for value in row))
+
+    applicants = validate_admission_list(
+        read_admission_list("\n".join(lines).encode()),
+        UNIVERSITY_ID,
+        extract_direction_code(DIRECTION_URL),
+        RECEPTION,
+    )
+
+    assert applicants.height == ROWS
+    assert applicants["total_points"].to_list() == [200] * (ROWS - 1) + [0]
+    assert applicants["advantage"].null_count() == ROWS